@@ -24,12 +24,14 @@
 
 import logging
 import json
+import itertools
 import math
 import os
 import time
-import re
+import sqlite3
 import requests
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from requests.auth import HTTPBasicAuth
 
 from PyQt5 import *
@@ -39,9 +41,11 @@ from qgis.core import (
     QgsVectorLayer,
     QgsRasterLayer,
     QgsFeature,
-    QgsGeometry,
     QgsField,
+    QgsFeatureRequest,
+    QgsExpression,
     QgsMessageLog,
+    QgsApplication,
 )
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
@@ -50,12 +54,53 @@ from .afpolgis_dialog import AfpolGISDialog
 from datetime import datetime, timezone
 
 from .request_threads import (
+    fetch_data,
     OnaRequestThread,
     FetchOnaFormsThread,
     FetchOnaGeoFieldsThread,
 )
+from .http_client import cached_get, configure_cache, pooled_get, close_sessions
+from .async_engine import AsyncFetchEngine, run_blocking
+from .fetch_tasks import ConnectorFetchTask, FetchError, FetchJobManager
+from .json_stream import JsonRecordStream, iter_json_records
+from .geometry_builder import build_geometry
+from .geo_parser import parse_geo_geometries
+from .wkt_parser import parse_wkt_batch
+from .dataset import ColumnarDataset, as_dataset
+from .field_types import convert_value, schema_field_types
+from .dhis_aggregation import AGGREGATIONS, DEFAULT_AGGREGATION, aggregate_rows
+from .dhis_store import DHIS_STORE_FILE, ORG_UNITS_TTL, DhisStore, index_geo_features
+from .org_unit_hierarchy import (
+    OrgUnitHierarchy,
+    geo_feature,
+    geo_feature_geometry,
+    org_unit,
+)
+from .submission_store import (
+    SUBMISSION_STORE_FILE,
+    SUBMISSION_ID_KEYS,
+    SubmissionStore,
+    submission_keys,
+)
 
 
+# Number of features built and handed to the data provider per call
+LOAD_CHUNK_SIZE = 10000
+# Submission ids looked up per filter expression when upserting a delta
+KEY_FILTER_CHUNK_SIZE = 500
+# Org units requested per page, and pages fetched at once after the first
+DHIS_ORG_UNITS_PAGE_SIZE = 1000
+DHIS_MAX_CONCURRENT_PAGES = 4
+# Further attempts at an org unit page that failed in the concurrent pass
+DHIS_ORG_UNIT_PAGE_RETRIES = 3
+# Indicators combined in the dx dimension of one analytics call
+DHIS_ANALYTICS_DX_BATCH_SIZE = 50
+# Analytics requests in flight at once, attempts per request before it is
+# split, and org units per request once a query is split by org unit
+DHIS_MAX_CONCURRENT_ANALYTICS = 4
+DHIS_ANALYTICS_MAX_RETRIES = 2
+DHIS_ANALYTICS_OU_BATCH_SIZE = 250
+
 # Configure logging
 logging.basicConfig(
     filename="fetch_data.log",  # Log file name
@@ -85,12 +130,25 @@ class AfpolGIS(QObject):
 
         # Json data var
         self.json_data = list()
+        # (server, form, geo field) once an incremental Ona sync has merged
+        # a delta, the CSV is then read back from the store
+        self.ona_synced_form = None
+        # the layer a full Ona fetch is writing to, page by page
+        self.ona_page_load = None
         self.odk_json_data = list()
+        # (server, form, geo field, geometry field) once an incremental ODK
+        # sync has merged a delta, the CSV is then read back from the store
+        self.odk_synced_form = None
         self.kobo_json_data = list()
         self.gts_json_data = list()
         self.es_json_data = list()
         self.dhis_json_data = list()
 
+        # field types of the selected forms, {field path: QVariant type}
+        self.ona_field_types = dict()
+        self.odk_field_types = dict()
+        self.kobo_field_types = dict()
+
         self.new_features = []
         self.form_versions = None
         self.current_form_version = None
@@ -112,6 +170,9 @@ class AfpolGIS(QObject):
 
         self.dlg.ComboDhisCategory.addItems(["Programs", "DataSets"])
 
+        self.dlg.comboDhisAggregation.addItems(AGGREGATIONS)
+        self.dlg.comboDhisAggregation.setCurrentText(DEFAULT_AGGREGATION)
+
         self.dlg.comboDhisPeriod.addItems(
             [
                 "TODAY",
@@ -240,6 +301,14 @@ class AfpolGIS(QObject):
         # Connect the GTS Cancel button to handler
         self.dlg.gtsCancelButton.clicked.connect(self.handle_gts_cancel_btn)
 
+        # Connect the ES and DHIS Cancel buttons to their background jobs
+        self.dlg.esCancelButton.clicked.connect(
+            lambda: self.fetch_jobs.cancel("es")
+        )
+        self.dlg.dhisCancelButton.clicked.connect(
+            lambda: self.fetch_jobs.cancel("dhis")
+        )
+
         # Connect form dropdown on change
         self.dlg.comboOnaForms.currentIndexChanged.connect(
             self.fetch_ona_form_geo_fields
@@ -290,6 +359,9 @@ class AfpolGIS(QObject):
         self.dlg.comboDhisPeriod.currentIndexChanged.connect(
             self.on_dhis_combo_period_change
         )
+        self.dlg.comboDhisPeriod.checkedItemsChanged.connect(
+            self.on_dhis_combo_period_change
+        )
 
         # DHIS Org units on change
         # self.dlg.comboDhisOrgUnits.currentIndexChanged.connect(
@@ -310,6 +382,9 @@ class AfpolGIS(QObject):
         self.dlg.comboDhisIndicators.currentIndexChanged.connect(
             self.on_dhis_indicators_change
         )
+        self.dlg.comboDhisIndicators.checkedItemsChanged.connect(
+            self.on_dhis_indicators_change
+        )
 
         self.dlg.onaOkButton.setEnabled(False)
         self.dlg.odkOkButton.setEnabled(False)
@@ -327,10 +402,10 @@ class AfpolGIS(QObject):
         self.dlg.dhisDownloadCSV.setEnabled(False)
 
         self.dlg.onaDownloadCSV.clicked.connect(
-            lambda: self.download_csv(self.json_data)
+            lambda: self.download_csv(self.ona_download_data())
         )
         self.dlg.odkDownloadCSV.clicked.connect(
-            lambda: self.download_csv(self.odk_json_data)
+            lambda: self.download_csv(self.odk_download_data())
         )
         self.dlg.koboDownloadCSV.clicked.connect(
             lambda: self.download_csv(self.kobo_json_data)
@@ -352,9 +427,6 @@ class AfpolGIS(QObject):
         # data sync
         self.timer = QTimer()
 
-        # Connect the timer to the data-fetching function
-        self.timer.timeout.connect(self.fetch_data_async)
-
         # ONA sync
 
         self.ona_sync_timer = QTimer()
@@ -489,6 +561,12 @@ class AfpolGIS(QObject):
         # Initialize QThreadPool for managing worker threads
         self.thread_pool = QThreadPool.globalInstance()
 
+        # asyncio fetch engine driven by the Qt event loop
+        self.async_engine = AsyncFetchEngine()
+
+        # background fetch jobs running on the QGIS task manager
+        self.fetch_jobs = FetchJobManager()
+
         self.is_interrupted = False
 
         self.asset_from_date = None
@@ -503,6 +581,21 @@ class AfpolGIS(QObject):
         # Create the directory if it doesn't exist
         os.makedirs(self.directory, exist_ok=True)
 
+        # on-disk caches live in the QGIS profile
+        self.cache_dir = os.path.join(QgsApplication.qgisSettingsDirPath(), "afpolgis")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        configure_cache(os.path.join(self.cache_dir, "http_cache.sqlite"))
+
+        # fetched submissions persisted per (server, form, geo field)
+        self.submission_store = SubmissionStore(
+            os.path.join(self.cache_dir, SUBMISSION_STORE_FILE)
+        )
+        # DHIS2 geoFeatures cached per (server, level)
+        self.dhis_store = DhisStore(os.path.join(self.cache_dir, DHIS_STORE_FILE))
+        # {server: (fetched_at, OrgUnitHierarchy)}, loaded from the DHIS
+        # store or fetched, reused until older than ORG_UNITS_TTL
+        self.dhis_hierarchies = dict()
+
     def tr(self, message):
         """Get the translation for a string using Qt translation API.
 
@@ -558,6 +651,11 @@ class AfpolGIS(QObject):
             self.iface.removeToolBarIcon(action)
         del self.toolbar
 
+        # cancel background jobs and release pooled keep-alive connections
+        self.fetch_jobs.cancel_all()
+        self.async_engine.close()
+        close_sessions()
+
     def add_basemap(self):
         # Define the basemap URL (OpenStreetMap in this example)
         basemap_url = "type=xyz&url=https://tile.openstreetmap.org/{z}/{x}/{y}.png"
@@ -599,27 +697,6 @@ class AfpolGIS(QObject):
         self.dlg.show()
         # self.add_basemap()
 
-    def fetch_data_async(
-        self, api_url, formID, username, password, geo_field, page_size, directory
-    ):
-        """Start the data-fetching timer."""
-        value = self.dlg.mQgsDoubleSpinBox.value()
-        self.timer.setInterval(int(value) * 1000)
-        self.timer.start()
-        self.dlg.app_logs.appendPlainText(f"Start of Data Sync...\n")
-        self.json_data = []
-        self.worker = self.fetch_and_save_data(
-            api_url,
-            formID,
-            username,
-            password,
-            geo_field,
-            page_size,
-            directory,
-        )
-        self.thread_pool.start(self.worker)
-        self.dlg.app_logs.appendPlainText(f"Done")
-
     def download_csv(self, data):
         if data:
             # Open file dialog to select save location
@@ -634,13 +711,16 @@ class AfpolGIS(QObject):
                 output_file += ".csv"
 
             # Write to CSV
-            with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
-                headers = data[0].keys()
-                writer = csv.writer(csvfile)
-                writer.writerow(headers)
+            if isinstance(data, ColumnarDataset):
+                data.write_csv(output_file)
+            else:
+                with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
+                    headers = data[0].keys()
+                    writer = csv.writer(csvfile)
+                    writer.writerow(headers)
 
-                for row in data:
-                    writer.writerow(row.values())
+                    for row in data:
+                        writer.writerow(row.values())
 
             QgsMessageLog.logMessage(
                 f"CSV successfully saved to {output_file}", "CSV Download"
@@ -714,19 +794,110 @@ class AfpolGIS(QObject):
         password = self.dlg.dhisMLineEdit.text()
         auth = HTTPBasicAuth(username, password)
 
-        selected_period = self.dlg.comboDhisPeriod.currentText()
-        curr_indicator_id = self.dlg.comboDhisIndicators.currentData()
-        curr_indicator_text = self.dlg.comboDhisIndicators.currentText()
+        indicators = self.dhis_selected_indicators()
+        periods = self.dhis_selected_periods()
+        aggregation = self.dlg.comboDhisAggregation.currentText()
         adm_level = self.dlg.ComboDhisAdminLevels.currentText()
         cleaned_adm_lvl = adm_level.split(" ")[-1]
 
-        geo_data = None
+        if not indicators or not periods:
+            self.iface.messageBar().pushMessage(
+                "Notice",
+                f"Indicator Not Set" if not indicators else f"Period Not Set",
+                level=Qgis.Warning,
+                duration=10,
+            )
+            self.dlg.dhisOkButton.setEnabled(True)
+            self.dlg.dhisProgressBar.setValue(0)
+            return
+
+        indicator_ids = [indicator_id for indicator_id, _ in indicators]
+        # one layer for the whole selection, named after it
+        if len(indicators) == 1:
+            indicators_text = indicators[0][1]
+        else:
+            indicators_text = f"{len(indicators)} Indicators"
+        periods_text = periods[0] if len(periods) == 1 else f"{len(periods)}_PERIODS"
 
-        # Fetch GeoJSON for active level
-        feature_collection = {
-            "type": "FeatureCollection",
-            "features": [],
-        }
+        task = ConnectorFetchTask(
+            f"AfpolGIS: Fetching DHIS {indicators_text}",
+            [
+                lambda task, _: self.fetch_dhis_geo_features(
+                    task, api_url, auth, cleaned_adm_lvl
+                ),
+                lambda task, geo_data: self.fetch_dhis_analytics(
+                    task,
+                    api_url,
+                    auth,
+                    geo_data,
+                    indicator_ids,
+                    cleaned_adm_lvl,
+                    periods,
+                ),
+                lambda task, fetched: self.build_dhis_feature_collection(
+                    task, fetched, aggregation
+                ),
+                lambda task, result: self.store_submissions(
+                    task,
+                    result,
+                    api_url,
+                    ";".join(indicator_ids),
+                    f"LEVEL_{cleaned_adm_lvl}_{';'.join(periods)}",
+                ),
+            ],
+            on_finished=lambda result: self.handle_dhis_data_collected(
+                result, indicators_text, cleaned_adm_lvl, periods_text
+            ),
+            on_error=lambda message: self.handle_fetch_task_error(
+                message, self.dlg.dhisOkButton, self.dlg.dhisProgressBar
+            ),
+            on_cancelled=lambda: self.handle_fetch_task_cancelled(
+                self.dlg.dhisOkButton, self.dlg.dhisProgressBar
+            ),
+        )
+        self.fetch_jobs.start("dhis", task, self.dlg.dhisProgressBar)
+
+    def checked_combo_items(self, combo):
+        """Returns the (data, text) of the checked items of a checkable combo,
+        or of the current item when none is checked.
+        """
+        checked = [
+            (combo.itemData(index), combo.itemText(index))
+            for index in range(combo.count())
+            if combo.itemCheckState(index) == Qt.Checked
+        ]
+        if not checked and combo.currentIndex() >= 0:
+            index = combo.currentIndex()
+            checked = [(combo.itemData(index), combo.itemText(index))]
+        return checked
+
+    def dhis_selected_indicators(self):
+        """Returns the selected indicators as (id, name) pairs."""
+        return [
+            (indicator_id, name)
+            for indicator_id, name in self.checked_combo_items(
+                self.dlg.comboDhisIndicators
+            )
+            if indicator_id
+        ]
+
+    def dhis_selected_periods(self):
+        return [name for _, name in self.checked_combo_items(self.dlg.comboDhisPeriod)]
+
+    def fetch_dhis_geo_features(self, task, api_url, auth, cleaned_adm_lvl):
+        """Returns the geoFeatures of the active level indexed by org unit id.
+
+        Served from the DHIS store while fresh, otherwise fetched and cached.
+        Runs in a background task.
+        """
+        geo_index = self.dhis_store.geo_features(api_url, cleaned_adm_lvl)
+        if geo_index is None and self.cached_dhis_org_unit_hierarchy(api_url) is None:
+            # fetching the hierarchy caches the geometries of every level
+            self.dhis_org_unit_hierarchy(task, api_url, auth)
+            geo_index = self.dhis_store.geo_features(api_url, cleaned_adm_lvl)
+        if geo_index is not None:
+            task.setProgress(20)
+            return geo_index
 
         geo_url = f"https://{api_url}/api/geoFeatures"
         geo_params = [
@@ -734,148 +905,363 @@ class AfpolGIS(QObject):
             ("displayProperty", "NAME"),
         ]
 
-        geo_response = self.fetch_with_retries(geo_url, auth, geo_params)
+        geo_response = fetch_data(geo_url, auth, geo_params)
 
-        if geo_response.status_code == 200:
-            geo_data = geo_response.json()
-        else:
-            self.iface.messageBar().pushMessage(
-                "Error",
-                f"Error fetching Geometry: {geo_response.status_code}",
-                level=Qgis.Critical,
-                duration=10,
+        if geo_response.status_code != 200:
+            raise FetchError(f"Error fetching Geometry: {geo_response.status_code}")
+
+        geo_data = list(iter_json_records(geo_response))
+        try:
+            self.dhis_store.save_geo_features(api_url, cleaned_adm_lvl, geo_data)
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f"Failed to cache geoFeatures: {e}", "AfpolGIS", Qgis.Warning
             )
-            self.dlg.dhisOkButton.setEnabled(True)
-            self.dlg.dhisProgressBar.setValue(0)
 
-        if geo_data and curr_indicator_id:
-            params = [
-                ("dimension", f"dx:{curr_indicator_id}"),
-                ("dimension", f"ou:LEVEL-{cleaned_adm_lvl}"),
-                ("dimension", f"pe:{selected_period}"),
+        task.setProgress(20)
+        return index_geo_features(geo_data)
+
+    def cached_dhis_org_unit_hierarchy(self, api_url):
+        """Returns the in-memory OrgUnitHierarchy of a server, None when it
+        is not loaded or older than ORG_UNITS_TTL.
+        """
+        fetched_at, hierarchy = self.dhis_hierarchies.get(api_url, (None, None))
+        if hierarchy is not None and time.time() - fetched_at > ORG_UNITS_TTL:
+            self.dhis_hierarchies.pop(api_url, None)
+            return None
+        return hierarchy
+
+    def dhis_org_unit_hierarchy(self, task, api_url, auth):
+        """Returns the OrgUnitHierarchy of a server, runs in a background task.
+
+        Kept in memory once loaded, read from the DHIS store while fresh and
+        otherwise fetched in one request, which also stores the geometries
+        of every level as geoFeatures. Both copies expire after
+        ORG_UNITS_TTL. Returns None when the fetch fails.
+        """
+        hierarchy = self.cached_dhis_org_unit_hierarchy(api_url)
+        if hierarchy is not None:
+            return hierarchy
+
+        units = self.dhis_store.org_units(api_url)
+        fetched_at = self.dhis_store.org_units_fetched_at(api_url)
+        if units is not None and fetched_at is not None:
+            hierarchy = OrgUnitHierarchy(units)
+            self.dhis_hierarchies[api_url] = (fetched_at, hierarchy)
+            return hierarchy
+
+        url = f"https://{api_url}/api/organisationUnits"
+        params = [
+            ("fields", "id,name,level,path,parent[id],geometry"),
+            ("paging", "false"),
+        ]
+        try:
+            response = fetch_data(url, auth, params)
+        except requests.RequestException as e:
+            QgsMessageLog.logMessage(
+                f"Failed to fetch the org unit hierarchy: {e}",
+                "AfpolGIS",
+                Qgis.Warning,
+            )
+            return None
+        if response.status_code != 200:
+            QgsMessageLog.logMessage(
+                f"Failed to fetch the org unit hierarchy: {response.status_code}",
+                "AfpolGIS",
+                Qgis.Warning,
+            )
+            return None
+
+        fetched_at = time.time()
+        hierarchy = OrgUnitHierarchy()
+        geo_features = dict()
+        for record in iter_json_records(response, "organisationUnits"):
+            task.check_cancelled()
+            if not record.get("id"):
+                continue
+            unit = org_unit(record)
+            hierarchy.add(unit)
+            # every level gets a geoFeatures cache, empty without geometries
+            features = geo_features.setdefault(unit["level"], [])
+            feature = geo_feature(record)
+            if feature:
+                features.append(feature)
+
+        try:
+            self.dhis_store.save_org_units(api_url, hierarchy.units.values())
+            for level, features in geo_features.items():
+                self.dhis_store.save_geo_features(api_url, level, features)
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f"Failed to cache the org unit hierarchy: {e}",
+                "AfpolGIS",
+                Qgis.Warning,
+            )
+
+        self.dhis_hierarchies[api_url] = (fetched_at, hierarchy)
+        return hierarchy
+
+    def fetch_dhis_analytics(
+        self,
+        task,
+        api_url,
+        auth,
+        geo_data,
+        indicator_ids,
+        cleaned_adm_lvl,
+        periods,
+    ):
+        """Fetches the analytics of the indicators, runs in a background task.
+
+        The query is partitioned into one request per selected period and
+        batch of up to DHIS_ANALYTICS_DX_BATCH_SIZE indicators: relative
+        periods resolve to several, so every row is tagged with the period
+        it was selected for, i.e. rows are [dx, ou, pe, value, selected
+        period]. Partitions run DHIS_MAX_CONCURRENT_ANALYTICS at a time;
+        one that times out or is refused by the server is split (see
+        split_dhis_analytics_partition) and retried, so a large pull is
+        answered piecewise instead of failing as a whole.
+        """
+        url = f"https://{api_url}/api/analytics.json"
+        org_unit_ids = list(geo_data or {})
+        partitions = [
+            {
+                "dx": indicator_ids[start : start + DHIS_ANALYTICS_DX_BATCH_SIZE],
+                "ou": None,
+                "pe": period,
+            }
+            for period in periods
+            for start in range(0, len(indicator_ids), DHIS_ANALYTICS_DX_BATCH_SIZE)
+        ]
+
+        analytics = {
+            "rows": [],
+            "metaData": {"items": dict(), "dimensions": {"pe": []}},
+        }
+        total = len(partitions)
+        done = 0
+        while partitions:
+            task.check_cancelled()
+            requests_list = [
+                {
+                    "url": url,
+                    "auth": auth,
+                    "params": self.dhis_analytics_params(partition, cleaned_adm_lvl),
+                }
+                for partition in partitions
             ]
+            responses = run_blocking(
+                lambda engine: engine.fetch_all(requests_list),
+                max_concurrency=DHIS_MAX_CONCURRENT_ANALYTICS,
+                max_retries=DHIS_ANALYTICS_MAX_RETRIES,
+            )
 
-            url = f"https://{api_url}/api/analytics.json"
+            failed = []
+            for partition, response in zip(partitions, responses):
+                if isinstance(response, Exception):
+                    error = f"Error fetching data: {response}"
+                elif response.status_code == 409 or response.status_code >= 500:
+                    # 409 is how DHIS2 refuses queries that are too large
+                    error = f"Error fetching data: {response.status_code}"
+                elif response.status_code != 200:
+                    raise FetchError(f"Error fetching data: {response.status_code}")
+                else:
+                    self.merge_dhis_analytics(analytics, response, partition["pe"])
+                    done += 1
+                    task.setProgress(20 + 60 * done / total)
+                    continue
+
+                parts = self.split_dhis_analytics_partition(partition, org_unit_ids)
+                if not parts:
+                    raise FetchError(error)
+                QgsMessageLog.logMessage(
+                    f"{error}, retrying as {len(parts)} smaller requests",
+                    "AfpolGIS",
+                    Qgis.Warning,
+                )
+                failed.extend(parts)
+                total += len(parts) - 1
+            partitions = failed
 
-            self.dlg.dhisProgressBar.setValue(20)
+        return {
+            "geo_data": geo_data,
+            "analytics": analytics,
+            "indicator_ids": indicator_ids,
+            "periods": periods,
+        }
 
-            response = self.fetch_with_retries(url, auth, params)
+    def dhis_analytics_params(self, partition, cleaned_adm_lvl):
+        org_units = partition["ou"]
+        return [
+            ("dimension", f"dx:{';'.join(partition['dx'])}"),
+            (
+                "dimension",
+                f"ou:{';'.join(org_units)}"
+                if org_units
+                else f"ou:LEVEL-{cleaned_adm_lvl}",
+            ),
+            ("dimension", f"pe:{partition['pe']}"),
+        ]
 
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    self.dlg.dhisProgressBar.setValue(100)
-                    rows = data.get("rows")
-                    metadata = data.get("metaData")
-                    meta_items = metadata.get("items")
-                    if rows:
-                        cleaned_data = dict()
-                        for row in rows:
-                            if not cleaned_data.get(row[1]):
-                                cleaned_data[row[1]] = {
-                                    "Org ID": row[1],
-                                    "Org Unit": meta_items.get(row[1]).get("name"),
-                                    "Indicator": meta_items.get(row[0]).get("name"),
-                                    "Period": meta_items.get(row[2]).get("name"),
-                                    "Value": float(row[3]),
-                                }
-                            else:
-                                cleaned_data[row[1]]["Value"] += float(row[3])
-                                cleaned_data[row[1]]["Period"] = (
-                                    cleaned_data[row[1]]["Period"]
-                                    + ","
-                                    + meta_items.get(row[2]).get("name")
-                                )
+    def split_dhis_analytics_partition(self, partition, org_unit_ids):
+        """Splits an analytics partition, returns [] when it cannot be split.
 
-                        # get single geometry
-                        if cleaned_data:
-                            for datum in cleaned_data.values():
-                                single_geom_obj = next(
-                                    (
-                                        geom
-                                        for geom in geo_data
-                                        if geom.get("id") == datum.get("Org ID")
-                                    ),
-                                    None,
-                                )
-                                if single_geom_obj:
-                                    coordinates = json.loads(single_geom_obj.get("co"))
-                                    geom_type = "Polygon"
-                                    if len(coordinates) > 1:
-                                        geom_type = "Point"
-
-                                    geometry = {
-                                        "type": geom_type,
-                                        "coordinates": coordinates,
-                                    }
+        Indicators are halved first; a single indicator for the whole level
+        is then split into explicit org unit lists of the level (the ids of
+        its geoFeatures), which are halved in turn.
+        """
+        indicator_ids = partition["dx"]
+        org_units = partition["ou"]
+        if len(indicator_ids) > 1:
+            middle = len(indicator_ids) // 2
+            return [
+                {**partition, "dx": indicator_ids[:middle]},
+                {**partition, "dx": indicator_ids[middle:]},
+            ]
+        if org_units is None:
+            batch_size = DHIS_ANALYTICS_OU_BATCH_SIZE
+            return [
+                {**partition, "ou": org_unit_ids[start : start + batch_size]}
+                for start in range(0, len(org_unit_ids), batch_size)
+            ]
+        if len(org_units) > 1:
+            middle = len(org_units) // 2
+            return [
+                {**partition, "ou": org_units[:middle]},
+                {**partition, "ou": org_units[middle:]},
+            ]
+        return []
+
+    def merge_dhis_analytics(self, analytics, response, period):
+        """Adds the rows and metaData of an analytics response."""
+        # stream the rows, headers and metaData are collected alongside
+        stream = JsonRecordStream(response, "rows")
+        analytics["rows"].extend(row[:4] + [period] for row in stream)
+        metadata = stream.meta.get("metaData") or dict()
+        analytics["metaData"]["items"].update(metadata.get("items") or {})
+        # resolved periods, in chronological order
+        resolved_periods = analytics["metaData"]["dimensions"]["pe"]
+        for resolved in (metadata.get("dimensions") or {}).get("pe") or []:
+            if resolved not in resolved_periods:
+                resolved_periods.append(resolved)
+
+    def build_dhis_feature_collection(
+        self, task, fetched, aggregation=DEFAULT_AGGREGATION
+    ):
+        """Joins analytics rows to their geometry, runs in a background task.
 
-                                    feature = {
-                                        "type": "Feature",
-                                        "geometry": geometry,
-                                        "properties": datum,
-                                    }
+        The rows of an org unit, indicator and selected period are reduced
+        with aggregation (see dhis_aggregation) and pivoted to one feature
+        per org unit, with a column per indicator and selected period, so
+        each geometry is stored once. geo_data is the {org unit id:
+        geoFeature} index of the level.
+        """
+        geo_data = fetched.get("geo_data")
+        data = fetched.get("analytics")
 
-                                    feature_collection["features"].append(feature)
+        feature_collection = {
+            "type": "FeatureCollection",
+            "features": [],
+        }
 
-                            if (
-                                feature_collection["features"]
-                                and len(feature_collection["features"]) > 0
-                            ):
-                                self.dhis_json_data = [
-                                    feature.get("properties")
-                                    for feature in feature_collection["features"]
-                                ]
-                                self.dlg.dhisDownloadCSV.setEnabled(True)
+        if not geo_data or not data:
+            return {"feature_collection": feature_collection, "has_rows": False}
 
-                                cleaned_indicator_text = "_".join(
-                                    curr_indicator_text.split(" ")
-                                )
-                                self.load_data_to_qgis(
-                                    feature_collection,
-                                    cleaned_indicator_text,
-                                    f"LEVEL_{cleaned_adm_lvl}_{selected_period}",
-                                )
-                            else:
-                                self.dlg.app_logs.appendPlainText(
-                                    "No Available Geometry to Display"
-                                )
-                                self.iface.messageBar().pushMessage(
-                                    "Notice",
-                                    f"No Available Geometry to Display",
-                                    level=Qgis.Warning,
-                                    duration=10,
-                                )
-                                self.dlg.dhisOkButton.setEnabled(True)
+        rows = data.get("rows")
+        metadata = data.get("metaData")
+        meta_items = metadata.get("items")
+        if not rows:
+            return {"feature_collection": feature_collection, "has_rows": False}
 
-                            self.dlg.dhisOkButton.setEnabled(True)
-                            self.dlg.dhisProgressBar.setValue(0)
-                    else:
-                        self.iface.messageBar().pushMessage(
-                            "Notice",
-                            "No Data Found for Selected Indicator",
-                            level=Qgis.Warning,
-                            duration=10,
-                        )
-                        self.dlg.dhisOkButton.setEnabled(True)
-                        self.dlg.dhisProgressBar.setValue(0)
-            else:
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
-                    duration=10,
-                )
-                self.dlg.dhisOkButton.setEnabled(True)
-                self.dlg.dhisProgressBar.setValue(0)
+        def item_name(item_id):
+            return (meta_items.get(item_id) or {}).get("name") or item_id
+
+        columns = {
+            (indicator_id, period): f"{item_name(indicator_id)} {period}"
+            for indicator_id in fetched.get("indicator_ids")
+            for period in fetched.get("periods")
+        }
+
+        groups = aggregate_rows(
+            rows,
+            aggregation,
+            (metadata.get("dimensions") or {}).get("pe"),
+        )
+        task.check_cancelled()
+
+        cleaned_data = dict()
+        for org_id, indicator_id, period, value in groups:
+            datum = cleaned_data.get(org_id)
+            if datum is None:
+                datum = cleaned_data[org_id] = {
+                    "Org ID": org_id,
+                    "Org Unit": item_name(org_id),
+                }
+            datum[columns[(indicator_id, period)]] = value
+
+        # every feature gets every column, None where there is no value
+        template = dict.fromkeys(["Org ID", "Org Unit", *columns.values()])
+
+        # get single geometry
+        for datum in cleaned_data.values():
+            task.check_cancelled()
+            single_geom_obj = geo_data.get(datum.get("Org ID"))
+            if single_geom_obj:
+                coordinates = json.loads(single_geom_obj.get("co"))
+                geom_type = "Polygon"
+                if len(coordinates) > 1:
+                    geom_type = "Point"
+
+                geometry = {
+                    "type": geom_type,
+                    "coordinates": coordinates,
+                }
+
+                feature = {
+                    "type": "Feature",
+                    "geometry": geometry,
+                    "properties": {**template, **datum},
+                }
+
+                feature_collection["features"].append(feature)
+
+        return {"feature_collection": feature_collection, "has_rows": True}
+
+    def handle_dhis_data_collected(
+        self, result, indicators_text, cleaned_adm_lvl, periods_text
+    ):
+        feature_collection = result.get("feature_collection")
+
+        if not result.get("has_rows"):
+            self.iface.messageBar().pushMessage(
+                "Notice",
+                "No Data Found for Selected Indicator",
+                level=Qgis.Warning,
+                duration=10,
+            )
+        elif feature_collection["features"] and len(feature_collection["features"]) > 0:
+            self.dhis_json_data = [
+                feature.get("properties") for feature in feature_collection["features"]
+            ]
+            self.dlg.dhisDownloadCSV.setEnabled(True)
+
+            cleaned_indicator_text = "_".join(indicators_text.split(" "))
+            self.load_data_to_qgis(
+                feature_collection,
+                cleaned_indicator_text,
+                f"LEVEL_{cleaned_adm_lvl}_{periods_text}",
+            )
         else:
+            self.dlg.app_logs.appendPlainText("No Available Geometry to Display")
             self.iface.messageBar().pushMessage(
                 "Notice",
-                f"Indicator Not Set",
+                f"No Available Geometry to Display",
                 level=Qgis.Warning,
                 duration=10,
             )
-            self.dlg.dhisOkButton.setEnabled(True)
-            self.dlg.dhisProgressBar.setValue(0)
+
+        self.dlg.dhisOkButton.setEnabled(True)
+        self.dlg.dhisProgressBar.setValue(0)
 
     def fetch_dhis_org_units_handler(self):
         api_url = self.dlg.dhis_api_url.text()
@@ -885,8 +1271,7 @@ class AfpolGIS(QObject):
 
     def on_dhis_indicators_change(self):
         self.dhis_reset_saved_data()
-        indicator_data = self.dlg.comboDhisIndicators.currentData()
-        if indicator_data:
+        if self.dhis_selected_indicators():
             self.dlg.dhisOkButton.setEnabled(True)
 
     def on_dhis_datasets_change(self):
@@ -903,39 +1288,47 @@ class AfpolGIS(QObject):
             dataset_id = dataset_data.get("dataset_id")
 
             if dataset_id:
-                params = {"fields": "name,id,indicators[id,name]"}
+                # served from the metadata store when the dataSet was synced
+                data = self.dhis_store.metadata_item(api_url, "dataSets", dataset_id)
 
-                url = f"https://{api_url}/api/dataSets/{dataset_id}"
+                if data is None:
+                    params = {"fields": "name,id,indicators[id,name]"}
 
-                response = self.fetch_with_retries(url, auth, params)
-                if response.status_code == 200:
+                    url = f"https://{api_url}/api/dataSets/{dataset_id}"
+
+                    response = self.fetch_with_retries(
+                        url, auth, params, use_cache=True
+                    )
+                    if response is None or response.status_code != 200:
+                        self.iface.messageBar().pushMessage(
+                            "Error",
+                            f"Error fetching data: Status Code "
+                            f"{getattr(response, 'status_code', None)}",
+                            level=Qgis.Critical,
+                            duration=10,
+                        )
+                        return
                     data = response.json()
-                    if data:
-                        indicators = data.get("indicators")
-                        if indicators:
-                            for indicator in indicators:
-                                indicator_name = indicator.get("name")
-                                indicator_id = indicator.get("id")
-                                self.dlg.comboDhisIndicators.addItem(
-                                    indicator_name, {"indicator_id": indicator_id}
-                                )
-                        else:
-                            self.dlg.app_logs.appendPlainText(
-                                f"No Available Indicators for selected Dataset {dataset_id}"
-                            )
-                            self.iface.messageBar().pushMessage(
-                                "Notice",
-                                "No Available Indicators for Selected Dataset",
-                                level=Qgis.Warning,
-                                duration=10,
+
+                if data:
+                    indicators = data.get("indicators")
+                    if indicators:
+                        for indicator in indicators:
+                            indicator_name = indicator.get("name")
+                            indicator_id = indicator.get("id")
+                            self.dlg.comboDhisIndicators.addItem(
+                                indicator_name, {"indicator_id": indicator_id}
                             )
-                else:
-                    self.iface.messageBar().pushMessage(
-                        "Error",
-                        f"Error fetching data: Status Code {response.status_code}",
-                        level=Qgis.Critical,
-                        duration=10,
-                    )
+                    else:
+                        self.dlg.app_logs.appendPlainText(
+                            f"No Available Indicators for selected Dataset {dataset_id}"
+                        )
+                        self.iface.messageBar().pushMessage(
+                            "Notice",
+                            "No Available Indicators for Selected Dataset",
+                            level=Qgis.Warning,
+                            duration=10,
+                        )
 
     def on_dhis_org_units_change(self):
         org_units_data = self.dlg.comboDhisOrgUnits.currentData()
@@ -947,6 +1340,27 @@ class AfpolGIS(QObject):
                         dataset.get("name"), {"dataset_id": dataset.get("id")}
                     )
 
+    def fetch_dhis_org_unit_page(self, url, auth, level, page):
+        """Fetches a page of org units, returns a (page, data, error) tuple."""
+        params = [
+            (
+                "fields",
+                "id,name,lastUpdated,dimensionItemType,shortName,displayName,children[id,name],dataSets[id,name],geometry",
+            ),
+            ("filter", f"level:eq:{level}"),
+            ("filter", "children:gte:0"),
+            ("page", page),
+            ("pageSize", DHIS_ORG_UNITS_PAGE_SIZE),
+        ]
+        try:
+            response = fetch_data(url, auth, params)
+        except requests.RequestException as e:
+            return page, None, str(e)
+
+        if response.status_code != 200:
+            return page, None, f"Error fetching data: {response.status_code}"
+        return page, response.json(), None
+
     def fetch_dhis_org_units(self, api_url, username, password):
         auth = HTTPBasicAuth(username, password)
         adm_level = self.dlg.ComboDhisAdminLevels.currentText()
@@ -963,100 +1377,51 @@ class AfpolGIS(QObject):
         self.dlg.btnFetchDhisCategory.setText("Connecting...")
         self.dlg.btnFetchDhisCategory.repaint()
 
-        page = 1
+        # answered from the hierarchy index when it is loaded, else fetched
+        records = self.dhis_level_org_units(
+            api_url, cleaned_adm_lvl, with_geometry=True
+        )
+        if records is None:
+            records = self.fetch_dhis_org_unit_records(
+                f"https://{api_url}/api/organisationUnits", auth, cleaned_adm_lvl
+            )
+        if records is None:
+            self.dlg.dhisProgressBar.setValue(0)
+            self.dlg.btnFetchDhisCategory.setEnabled(True)
+            self.dlg.btnFetchDhisCategory.setText("Connect")
+            self.dlg.btnFetchDhisCategory.repaint()
+            return
 
         feature_collection = {
             "type": "FeatureCollection",
             "features": [],
         }
-
-        url = f"https://{api_url}/api/organisationUnits"
-        hasData = True
-
-        while hasData:
-            params = [
-                (
-                    "fields",
-                    "id,name,lastUpdated,dimensionItemType,shortName,displayName,children[id,name],dataSets[id,name],geometry",
-                ),
-                ("filter", f"level:eq:{cleaned_adm_lvl}"),
-                ("filter", "children:gte:0"),
-                ("page", page),
-                ("pageSize", 1000),
-            ]
-
-            response = self.fetch_with_retries(url, auth, params)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data.get("organisationUnits")
-
-                # handle progress
-                pager = data.get("pager")
-                total_pages = (
-                    pager.get("total") + pager.get("pageSize") - 1
-                ) // pager.get("pageSize")
-                progress = (
-                    (int(page) / int(total_pages)) * 100
-                    if int(total_pages) > 1
-                    else 100
-                )
-                self.dlg.dhisProgressBar.setValue(math.ceil(progress) * 2)
-                self.dlg.dhisProgressBar.repaint()
-
-                if result:
-                    for datum in result:
-                        org_id = datum.get("id")
-                        org_name = datum.get("name")
-                        org_datasets = datum.get("dataSets")
-                        self.dlg.comboDhisOrgUnits.addItem(
-                            org_name, {"id": org_id, "dataSets": org_datasets}
-                        )
-                        if datum.get("geometry"):
-                            geometry = datum.get("geometry")
-                            feature_collection["features"].append(
-                                {
-                                    "type": "Feature",
-                                    "geometry": geometry,
-                                    "properties": {
-                                        "name": datum.get("name"),
-                                        "lastUpdated": datum.get("lastUpdated"),
-                                        "dimensionItemType": datum.get(
-                                            "dimensionItemType"
-                                        ),
-                                        "shortName": datum.get("shortName"),
-                                        "displayName": datum.get("displayName"),
-                                    },
-                                }
-                            )
-                elif not pager.get("nextPage"):
-                    hasData = False
-                    self.dlg.dhisProgressBar.setValue(0)
-                    self.dlg.btnFetchDhisCategory.setEnabled(True)
-                    self.dlg.btnFetchDhisCategory.setText("Connect")
-                    self.dlg.btnFetchDhisCategory.repaint()
-                else:
-                    self.dlg.dhisProgressBar.setValue(0)
-                    self.iface.messageBar().pushMessage(
-                        "Notice", "No Data Found", level=Qgis.Warning
-                    )
-                    self.dlg.btnFetchDhisCategory.setEnabled(True)
-                    self.dlg.btnFetchDhisCategory.setText("Connect")
-                    self.dlg.btnFetchDhisCategory.repaint()
-                    break
-            else:
-                self.dlg.dhisProgressBar.setValue(0)
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
+        for datum in records:
+            if datum.get("geometry"):
+                feature_collection["features"].append(
+                    {
+                        "type": "Feature",
+                        "geometry": datum.get("geometry"),
+                        "properties": {
+                            "name": datum.get("name"),
+                            "lastUpdated": datum.get("lastUpdated"),
+                            "dimensionItemType": datum.get("dimensionItemType"),
+                            "shortName": datum.get("shortName"),
+                            "displayName": datum.get("displayName"),
+                        },
+                    }
                 )
-                self.dlg.btnFetchDhisCategory.setEnabled(True)
-                self.dlg.btnFetchDhisCategory.setText("Connect")
-                self.dlg.btnFetchDhisCategory.repaint()
-                break
+        self.set_dhis_org_units(records)
 
-            page += 1
+        self.dlg.dhisProgressBar.setValue(0)
+        self.dlg.btnFetchDhisCategory.setEnabled(True)
+        self.dlg.btnFetchDhisCategory.setText("Connect")
+        self.dlg.btnFetchDhisCategory.repaint()
+
+        if not records:
+            self.iface.messageBar().pushMessage(
+                "Notice", "No Data Found", level=Qgis.Warning
+            )
 
         if feature_collection["features"] and len(feature_collection["features"]) > 0:
             self.load_data_to_qgis(
@@ -1072,17 +1437,175 @@ class AfpolGIS(QObject):
             )
             self.dlg.dhisOkButton.setEnabled(True)
 
+    def fetch_dhis_org_unit_records(self, url, auth, level):
+        """Fetches the org units of a level page by page.
+
+        Returns the /api/organisationUnits records in page order, or None
+        when the first page fails.
+        """
+        # the first page gives the total, the rest are fetched concurrently
+        _, data, error = self.fetch_dhis_org_unit_page(url, auth, level, 1)
+        if error:
+            self.iface.messageBar().pushMessage(
+                "Error", error, level=Qgis.Critical, duration=10
+            )
+            return None
+
+        pager = data.get("pager") or dict()
+        page_size = pager.get("pageSize") or DHIS_ORG_UNITS_PAGE_SIZE
+        total_pages = max(
+            1, (int(pager.get("total") or 0) + page_size - 1) // page_size
+        )
+        page_results = {1: data.get("organisationUnits") or []}
+
+        completed = 1
+        failed_pages = []
+        self.dlg.dhisProgressBar.setValue(math.ceil(completed / total_pages * 100))
+        self.dlg.dhisProgressBar.repaint()
+
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=DHIS_MAX_CONCURRENT_PAGES) as executor:
+                futures = [
+                    executor.submit(
+                        self.fetch_dhis_org_unit_page, url, auth, level, page
+                    )
+                    for page in range(2, total_pages + 1)
+                ]
+                for future in as_completed(futures):
+                    page, data, error = future.result()
+                    completed += 1
+                    self.dlg.dhisProgressBar.setValue(
+                        math.ceil(completed / total_pages * 100)
+                    )
+                    self.dlg.dhisProgressBar.repaint()
+                    QCoreApplication.processEvents()
+                    if error:
+                        self.dlg.app_logs.appendPlainText(f"Page {page}: {error}")
+                        failed_pages.append(page)
+                    else:
+                        page_results[page] = data.get("organisationUnits") or []
+
+        # failed pages are retried one at a time, backing off between rounds
+        for attempt in range(DHIS_ORG_UNIT_PAGE_RETRIES):
+            if not failed_pages:
+                break
+            time.sleep(0.2 * (2**attempt))
+            retry_pages, failed_pages = sorted(failed_pages), []
+            for page in retry_pages:
+                _, data, error = self.fetch_dhis_org_unit_page(url, auth, level, page)
+                QCoreApplication.processEvents()
+                if error:
+                    self.dlg.app_logs.appendPlainText(
+                        f"Page {page} (retry {attempt + 1}): {error}"
+                    )
+                    failed_pages.append(page)
+                else:
+                    page_results[page] = data.get("organisationUnits") or []
+
+        if failed_pages:
+            self.iface.messageBar().pushMessage(
+                "Warning",
+                f"{len(failed_pages)} of {total_pages} org unit pages could not be "
+                "fetched, the org unit list is incomplete",
+                level=Qgis.Warning,
+                duration=10,
+            )
+
+        return [datum for page in sorted(page_results) for datum in page_results[page]]
+
+    def dhis_level_org_units(self, api_url, level, with_geometry=False):
+        """Returns the org units of a level as /api/organisationUnits records,
+        sorted by name, answered from the server's hierarchy index.
+
+        with_geometry adds the geometries from the stored geoFeatures. None
+        when the index (or those geoFeatures) is not loaded.
+        """
+        hierarchy = self.cached_dhis_org_unit_hierarchy(api_url)
+        if hierarchy is None or not str(level).isdigit():
+            return None
+        geo_index = dict()
+        if with_geometry:
+            geo_index = self.dhis_store.geo_features(api_url, level)
+            if geo_index is None:
+                return None
+
+        records = []
+        for key in hierarchy.at_level(level):
+            feature = geo_index.get(key)
+            records.append(
+                {
+                    "id": key,
+                    "name": hierarchy.units[key].get("name"),
+                    "geometry": geo_feature_geometry(feature) if feature else None,
+                }
+            )
+        return sorted(records, key=lambda record: record.get("name") or "")
+
+    def set_dhis_org_units(self, records):
+        """Lists org unit records in the org unit combo."""
+        # one model swap instead of an addItem (and a repaint) per org unit
+        model = QStandardItemModel()
+        for datum in records:
+            item = QStandardItem(datum.get("name"))
+            item.setData(
+                {"id": datum.get("id"), "dataSets": datum.get("dataSets")},
+                Qt.UserRole,
+            )
+            model.appendRow(item)
+        self.dlg.comboDhisOrgUnits.setModel(model)
+
     def fetch_dhis_selected_category_handler(self):
         api_url = self.dlg.dhis_api_url.text()
         username = self.dlg.dhis_username.text()
         password = self.dlg.dhisMLineEdit.text()
         self.dhis_reset_saved_data()
         self.fetch_dhis_selected_category(api_url, username, password)
+        self.load_dhis_org_unit_hierarchy(
+            api_url, HTTPBasicAuth(username, password)
+        )
 
-    def fetch_dhis_selected_category(self, api_url, username, password):
-        auth = HTTPBasicAuth(username, password)
-        self.dlg.comboDhisProgramsOrDataSets.clear()
-        self.dlg.comboDhisIndicators.clear()
+    def load_dhis_org_unit_hierarchy(self, api_url, auth):
+        """Indexes the org units of the server in the background, so level
+        switches reuse the stored tree and geometries.
+        """
+        task = ConnectorFetchTask(
+            "AfpolGIS: Indexing DHIS org units",
+            [lambda task, _: self.dhis_org_unit_hierarchy(task, api_url, auth)],
+            on_finished=self.set_dhis_admin_levels,
+        )
+        self.fetch_jobs.start("dhis_hierarchy", task)
+
+    def set_dhis_admin_levels(self, hierarchy):
+        """Lists the levels of the server's org unit hierarchy, and the org
+        units of the selected level.
+        """
+        if not hierarchy or not hierarchy.levels():
+            return
+        combo = self.dlg.ComboDhisAdminLevels
+        levels = [f"Level {level}" for level in hierarchy.levels()]
+        if levels != [combo.itemText(index) for index in range(combo.count())]:
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(levels)
+            if current in levels:
+                combo.setCurrentText(current)
+            combo.blockSignals(False)
+
+        self.set_dhis_level_org_units()
+
+    def set_dhis_level_org_units(self):
+        """Lists the org units of the selected level from the hierarchy
+        index, without a request; cleared while the index is not loaded.
+        """
+        api_url = self.dlg.dhis_api_url.text()
+        level = self.dlg.ComboDhisAdminLevels.currentText().split(" ")[-1]
+        self.set_dhis_org_units(self.dhis_level_org_units(api_url, level) or [])
+
+    def fetch_dhis_selected_category(self, api_url, username, password):
+        auth = HTTPBasicAuth(username, password)
+        self.dlg.comboDhisProgramsOrDataSets.clear()
+        self.dlg.comboDhisIndicators.clear()
 
         category_text = self.dlg.ComboDhisCategory.currentText()
         indicator_text = None
@@ -1099,85 +1622,112 @@ class AfpolGIS(QObject):
         self.dlg.dhisOkButton.setEnabled(False)
         self.dlg.dhisOkButton.repaint()
 
-        page = 1
+        error = self.sync_dhis_metadata(api_url, auth, category_text, indicator_text)
+        items = self.dhis_store.metadata_items(api_url, category_text)
+
+        if error:
+            # fall back to what was stored by the previous syncs
+            self.iface.messageBar().pushMessage(
+                "Error",
+                f"{error}, showing stored {category_text}" if items else error,
+                level=Qgis.Warning if items else Qgis.Critical,
+                duration=10,
+            )
+        elif not items:
+            self.iface.messageBar().pushMessage(
+                "Notice", "No Data Found", level=Qgis.Warning
+            )
+
+        # one model swap instead of an addItem per dataSet / program
+        model = QStandardItemModel()
+        for datum in items:
+            item = QStandardItem(datum.get("name"))
+            item.setData(
+                {
+                    "category_id": datum.get("id"),
+                    "curr_indicators": datum.get(indicator_text),
+                },
+                Qt.UserRole,
+            )
+            model.appendRow(item)
+        self.dlg.comboDhisProgramsOrDataSets.setModel(model)
 
+        self.dlg.dhisProgressBar.setValue(0)
+        self.dlg.btnFetchDhisCategory.setEnabled(True)
+        self.dlg.btnFetchDhisCategory.setText("Connect")
+        self.dlg.btnFetchDhisCategory.repaint()
+
+    def sync_dhis_metadata(self, api_url, auth, category_text, indicator_text):
+        """Brings the stored dataSets / programs of a server up to date.
+
+        Only the objects updated since the newest stored lastUpdated are
+        fetched; the ids of the remaining ones are then listed to drop the
+        objects deleted on the server. Returns an error message, or None.
+        """
         url = f"https://{api_url}/api/{category_text}"
-        hasData = True
+        since = self.dhis_store.metadata_last_updated(api_url, category_text)
+        filters = [("filter", f"lastUpdated:gt:{since}")] if since else []
 
-        while hasData:
+        updated = []
+        page = 1
+        while True:
             params = [
-                ("fields", f"id,name,{indicator_text}[id,name]"),
+                ("fields", f"id,name,lastUpdated,{indicator_text}[id,name]"),
+                *filters,
                 ("page", page),
                 ("pageSize", 1000),
             ]
 
             response = self.fetch_with_retries(url, auth, params)
+            if response is None:
+                return "Error fetching data"
+            if response.status_code != 200:
+                return f"Error fetching data: {response.status_code}"
 
-            if response.status_code == 200:
-                data = response.json()
-                result = data.get(category_text)
-
-                pager = data.get("pager")
-                total_pages = (
-                    pager.get("total") + pager.get("pageSize") - 1
-                ) // pager.get("pageSize")
-                progress = (
-                    (int(page) / int(total_pages)) * 100
-                    if int(total_pages) > 1
-                    else 100
-                )
-                self.dlg.dhisProgressBar.setValue(math.ceil(progress))
-                self.dlg.dhisProgressBar.repaint()
+            data = response.json()
+            updated.extend(data.get(category_text) or [])
 
-                if result:
-                    for datum in result:
-                        category_name = datum.get("name")
-                        category_id = datum.get("id")
-                        curr_indicators = datum.get(indicator_text)
+            pager = data.get("pager") or dict()
+            page_count = pager.get("pageCount") or 1
+            self.dlg.dhisProgressBar.setValue(math.ceil(page / page_count * 100))
+            self.dlg.dhisProgressBar.repaint()
 
-                        self.dlg.comboDhisProgramsOrDataSets.addItem(
-                            category_name,
-                            {
-                                "category_id": category_id,
-                                "curr_indicators": curr_indicators,
-                            },
-                        )
+            if not pager.get("nextPage"):
+                break
+            page += 1
 
-                elif not pager.get("nextPage"):
-                    hasData = False
-                    self.dlg.dhisProgressBar.setValue(0)
-                    self.dlg.btnFetchDhisCategory.setEnabled(True)
-                    self.dlg.btnFetchDhisCategory.setText("Connect")
-                    self.dlg.btnFetchDhisCategory.repaint()
+        current_ids = None
+        if since:
+            response = self.fetch_with_retries(
+                url, auth, [("fields", "id"), ("paging", "false")]
+            )
+            if response is not None and response.status_code == 200:
+                current_ids = [
+                    item.get("id") for item in response.json().get(category_text) or []
+                ]
 
-                else:
-                    hasData = False
-                    self.dlg.dhisProgressBar.setValue(0)
-                    self.iface.messageBar().pushMessage(
-                        "Notice", "No Data Found", level=Qgis.Warning
-                    )
-                    self.dlg.btnFetchDhisCategory.setEnabled(True)
-                    self.dlg.btnFetchDhisCategory.setText("Connect")
-                    self.dlg.btnFetchDhisCategory.repaint()
-            else:
-                hasData = False
-                self.dlg.dhisProgressBar.setValue(0)
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
-                )
-                self.dlg.btnFetchDhisCategory.setEnabled(True)
-                self.dlg.btnFetchDhisCategory.setText("Connect")
-                self.dlg.btnFetchDhisCategory.repaint()
+        try:
+            self.dhis_store.save_metadata(api_url, category_text, updated)
+            if current_ids is not None:
+                self.dhis_store.prune_metadata(api_url, category_text, current_ids)
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f"Failed to store {category_text}: {e}", "AfpolGIS", Qgis.Warning
+            )
 
-            page += 1
+        self.dlg.app_logs.appendPlainText(
+            f"{len(updated)} {category_text} updated since {since}"
+            if since
+            else f"{len(updated)} {category_text} fetched"
+        )
+        return None
 
     def on_dhis_combo_period_change(self):
         self.dhis_reset_saved_data()
 
     def on_dhis_combo_admin_level_change(self):
         self.dhis_reset_saved_data()
+        self.set_dhis_level_org_units()
 
     def dhis_indicator_groups_on_change(self):
         self.dhis_reset_saved_data()
@@ -1214,103 +1764,112 @@ class AfpolGIS(QObject):
             url = f"https://{api_url}/fastapi/odata/v1/{single_tracking_url}"
             auth = HTTPBasicAuth(username, password)
 
-            feature_collection = {
-                "type": "FeatureCollection",
-                "features": [],
-            }
+            task = ConnectorFetchTask(
+                f"AfpolGIS: Fetching GTS data for {single_round_name}",
+                [
+                    lambda task, _: self.collect_gts_data(task, url, auth),
+                    lambda task, result: self.store_submissions(
+                        task, result, api_url, single_tracking_url, "gts"
+                    ),
+                ],
+                on_finished=lambda result: self.handle_gts_data_collected(
+                    result, cleaned_field_act_text, single_round_name
+                ),
+                on_error=lambda message: self.handle_fetch_task_error(
+                    message, self.dlg.gtsOkButton, self.dlg.gtsProgressBar
+                ),
+                on_cancelled=lambda: self.handle_fetch_task_cancelled(
+                    self.dlg.gtsOkButton, self.dlg.gtsProgressBar
+                ),
+            )
+            self.fetch_jobs.start("gts", task, self.dlg.gtsProgressBar)
 
-            params = {"$top": 50000, "$skip": 0}
+    def collect_gts_data(self, task, url, auth):
+        """Pages through a GTS tracking round, runs in a background task."""
+        feature_collection = {
+            "type": "FeatureCollection",
+            "features": [],
+        }
 
-            hasData = True
-            page = 0
+        params = {"$top": 50000, "$skip": 0}
+        error = None
 
-            while hasData:
-                page += 1
-                max_pages = 100
+        hasData = True
+        page = 0
 
-                progress = (int(page) / max_pages) * 100 if int(max_pages) > 1 else 100
-                self.dlg.gtsProgressBar.setValue(math.ceil(progress))
-                self.dlg.gtsProgressBar.repaint()
+        while hasData:
+            task.check_cancelled()
+            page += 1
+            max_pages = 100
+            task.report_progress(min(page, max_pages), max_pages)
 
-                self.dlg.gtsOkButton.setEnabled(False)
-                response = self.fetch_with_retries(url, auth, params)
-                if response.status_code == 200:
-                    data = response.json()
-                    data_list = data.get("value")
+            response = fetch_data(url, auth, params)
+            if response.status_code != 200:
+                error = f"Error fetching data: {response.status_code}"
+                break
 
-                    if data_list:
-                        for datum in data_list:
-                            long = (
-                                datum.get("X") or datum.get("Lon") or datum.get("Long")
-                            )
-                            lat = datum.get("Y") or datum.get("Lat")
-
-                            if lat and long:
-                                geometry = {
-                                    "type": "Point",
-                                    "coordinates": [float(long), float(lat)],
-                                }
-                                # try:
-                                #     del datum["geometry"]
-                                # except ValueError:
-                                #     pass
-                                feature_collection["features"].append(
-                                    {
-                                        "type": "Feature",
-                                        "geometry": geometry,
-                                        "properties": datum,
-                                    }
-                                )
-                    else:
-                        hasData = False
-                        self.dlg.gtsProgressBar.setValue(0)
-                        self.dlg.gtsOkButton.setEnabled(True)
-                else:
-                    hasData = False
-                    self.dlg.gtsProgressBar.setValue(0)
-                    self.iface.messageBar().pushMessage(
-                        "Error",
-                        f"Error fetching data: {response.status_code}",
-                        level=Qgis.Critical,
-                        duration=10,
+            page_records = 0
+            for datum in iter_json_records(response, "value"):
+                page_records += 1
+                long = datum.get("X") or datum.get("Lon") or datum.get("Long")
+                lat = datum.get("Y") or datum.get("Lat")
+
+                if lat and long:
+                    geometry = {
+                        "type": "Point",
+                        "coordinates": [float(long), float(lat)],
+                    }
+                    feature_collection["features"].append(
+                        {
+                            "type": "Feature",
+                            "geometry": geometry,
+                            "properties": datum,
+                        }
                     )
-                    self.dlg.gtsOkButton.setEnabled(True)
 
-                params["$skip"] += params["$top"]
+            if not page_records:
+                hasData = False
 
-            if (
-                feature_collection["features"]
-                and len(feature_collection["features"]) > 0
-            ):
-                self.gts_json_data = [
-                    feature.get("properties")
-                    for feature in feature_collection["features"]
-                ]
-                self.dlg.gtsDownloadCSV.setEnabled(True)
+            params["$skip"] += params["$top"]
 
-                self.dlg.gtsProgressBar.setValue(100)
-                self.load_data_to_qgis(
-                    feature_collection,
-                    f"gts_{cleaned_field_act_text}",
-                    "_".join(single_round_name.split(" ")),
-                )
-                self.dlg.gtsProgressBar.setValue(0)
-            else:
-                self.dlg.app_logs.appendPlainText(
-                    f"No available Geo Data for Selected Tracking Round"
-                )
-                self.iface.messageBar().pushMessage(
-                    "Notice",
-                    f"No available Geo Data for Selected Tracking Round",
-                    level=Qgis.Warning,
-                    duration=10,
-                )
-                self.dlg.gtsOkButton.setEnabled(True)
-                self.dlg.gtsOkButton.repaint()
+        return {"feature_collection": feature_collection, "error": error}
 
-                self.dlg.gtsProgressBar.setValue(0)
+    def handle_gts_data_collected(
+        self, result, cleaned_field_act_text, single_round_name
+    ):
+        feature_collection = result.get("feature_collection")
+
+        if result.get("error"):
+            self.report_fetch_error(result.get("error"))
+
+        if feature_collection["features"] and len(feature_collection["features"]) > 0:
+            self.gts_json_data = [
+                feature.get("properties") for feature in feature_collection["features"]
+            ]
+            self.dlg.gtsDownloadCSV.setEnabled(True)
+
+            self.dlg.gtsProgressBar.setValue(100)
+            self.load_data_to_qgis(
+                feature_collection,
+                f"gts_{cleaned_field_act_text}",
+                "_".join(single_round_name.split(" ")),
+            )
+        else:
+            self.dlg.app_logs.appendPlainText(
+                f"No available Geo Data for Selected Tracking Round"
+            )
+            self.iface.messageBar().pushMessage(
+                "Notice",
+                f"No available Geo Data for Selected Tracking Round",
+                level=Qgis.Warning,
+                duration=10,
+            )
+        self.dlg.gtsOkButton.setEnabled(True)
+        self.dlg.gtsOkButton.repaint()
+        self.dlg.gtsProgressBar.setValue(0)
 
     def handle_gts_cancel_btn(self):
+        self.fetch_jobs.cancel("gts")
         self.dlg.gtsProgressBar.setValue(0)
         self.dlg.gtsOkButton.setEnabled(True)
 
@@ -1339,7 +1898,7 @@ class AfpolGIS(QObject):
         gts_field_activities = dict()
         url = f"https://{api_url}/fastapi/odata/v1/{tables_url}"
         self.dlg.gtsProgressBar.setValue(50)
-        response = self.fetch_with_retries(url, auth)
+        response = self.fetch_with_retries(url, auth, use_cache=True)
         if response.status_code == 200:
             data = response.json()
             data_list = data.get("value")
@@ -1482,7 +2041,7 @@ class AfpolGIS(QObject):
 
         url = f"https://{api_url}/fastapi/odata/v1/"
 
-        response = self.fetch_with_retries(url, auth)
+        response = self.fetch_with_retries(url, auth, use_cache=True)
         if response.status_code == 200:
             data = response.json()
             if data:
@@ -1572,6 +2131,10 @@ class AfpolGIS(QObject):
                 self.kobo_sync_timer.start(kobo_sync_interval * 1000)
 
     def on_kobo_data_sync_enabled(self):
+        # skip this tick while the previous pull is still running
+        if self.fetch_jobs.is_running("kobo"):
+            return
+
         api_url = self.dlg.kobo_api_url.text()
         selected_form = self.dlg.comboKoboForms.currentData()
         username = self.dlg.kobo_username.text()
@@ -1632,7 +2195,6 @@ class AfpolGIS(QObject):
         self.dlg.koboOkButton.setEnabled(False)
 
         self.dlg.koboOkButton.repaint()
-        time.sleep(0.5)
 
         sort_param = json.dumps({"_submission_time": -1})
 
@@ -1647,60 +2209,80 @@ class AfpolGIS(QObject):
                 {"_submission_time": {"$gte": from_date, "$lte": to_date}}
             )
 
-        feature_collection = {
-            "type": "FeatureCollection",
-            "features": [],
-        }
-
         url = f"https://{api_url}/api/v2/assets/{asset_id}/data.json"
+        cleaned_asset_name = "".join(asset_name.split(" "))
+
+        task = ConnectorFetchTask(
+            f"AfpolGIS: Fetching Kobo data for {asset_name}",
+            [
+                lambda task, _: self.collect_kobo_data(
+                    task, url, auth, params, geo_field
+                ),
+                lambda task, result: self.store_submissions(
+                    task, result, api_url, asset_id, geo_field
+                ),
+            ],
+            on_finished=lambda result: self.handle_kobo_data_collected(
+                result, cleaned_asset_name, geo_field
+            ),
+            on_error=lambda message: self.handle_fetch_task_error(
+                message, self.dlg.koboOkButton, self.dlg.koboPorgressBar
+            ),
+            on_cancelled=lambda: self.handle_fetch_task_cancelled(
+                self.dlg.koboOkButton, self.dlg.koboPorgressBar
+            ),
+        )
+        self.fetch_jobs.start("kobo", task, self.dlg.koboPorgressBar)
+
+    def collect_kobo_data(self, task, url, auth, params, geo_field):
+        """Pages through Kobo submissions, runs in a background task."""
+        params = dict(params)
+        dataset = ColumnarDataset(geometry_field=geo_field)
+        error = None
+
         hasData = True
 
         while hasData:
-            response = self.fetch_with_retries(url, auth, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                data_list = data.get("results")
-                if data_list:
-                    self.dlg.koboPorgressBar.setValue(100)
-                    for datum in data_list:
-                        flattened_datum = self.flatten_dict(datum)
-                        self.kobo_json_data.append(flattened_datum)
-                        self.get_geo_data(
-                            flattened_datum, geo_field, feature_collection
-                        )
+            task.check_cancelled()
+            response = fetch_data(url, auth, params=params)
+            if response.status_code != 200:
+                error = f"Error fetching data: {response.status_code}"
+                break
 
-                elif not data.get("next"):
-                    hasData = False
-                    self.dlg.koboOkButton.setEnabled(True)
-                else:
-                    hasData = False
-                    self.dlg.koboOkButton.setEnabled(True)
-                    break
-            else:
+            stream = JsonRecordStream(response, "results")
+            page = [self.flatten_dict(datum) for datum in stream]
+            page_records = len(page)
+            # parse the geo strings of the whole page at once
+            self.build_geo_dataset(page, geo_field, dataset)
+            task.report_progress(len(dataset), stream.meta.get("count"))
+
+            if not page_records or not stream.meta.get("next"):
                 hasData = False
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
-                )
-                self.dlg.koboOkButton.setEnabled(True)
-                break
 
             params["start"] += params["limit"]
 
-        # count = len(feature_collection["features"])
-        # self.dlg.app_logs.appendPlainText(f"Features count: {count}")
+        return {
+            "dataset": dataset,
+            "error": error,
+        }
+
+    def handle_kobo_data_collected(self, result, cleaned_asset_name, geo_field):
+        self.kobo_json_data = result.get("dataset")
+
+        if result.get("error"):
+            self.report_fetch_error(result.get("error"))
 
         if self.kobo_json_data:
             self.dlg.koboDownloadCSV.setEnabled(True)
             self.dlg.koboDownloadCSV.repaint()
 
-        if feature_collection["features"] and len(feature_collection["features"]) > 0:
-            cleaned_asset_name = "".join(asset_name.split(" "))
-
-            self.load_data_to_qgis(feature_collection, cleaned_asset_name, geo_field)
-            self.dlg.koboPorgressBar.setValue(0)
-            self.dlg.koboOkButton.setEnabled(True)
+        if self.kobo_json_data is not None and self.kobo_json_data.feature_count():
+            self.load_data_to_qgis(
+                self.kobo_json_data,
+                cleaned_asset_name,
+                geo_field,
+                schema=self.kobo_field_types,
+            )
         else:
             self.dlg.app_logs.appendPlainText(
                 "The selected geo field doesn't have geo data"
@@ -1712,8 +2294,8 @@ class AfpolGIS(QObject):
                 level=Qgis.Warning,
                 duration=10,
             )
-            self.dlg.koboPorgressBar.setValue(0)
-            self.dlg.koboOkButton.setEnabled(True)
+        self.dlg.koboPorgressBar.setValue(0)
+        self.dlg.koboOkButton.setEnabled(True)
 
     def fetch_kobo_date_range_fields(self, api_url, username, password, asset_id):
         auth = HTTPBasicAuth(username, password)
@@ -1775,13 +2357,21 @@ class AfpolGIS(QObject):
         url = f"https://{api_url}/api/v2/assets/{asset_id}.json"
         params = {"metadata": "on"}
         self.dlg.comboKoboGeoFields.setEnabled(False)
-        response = self.fetch_with_retries(url, auth, params=params)
+        response = self.fetch_with_retries(url, auth, params=params, use_cache=True)
         if response.status_code == 200:
             self.dlg.comboKoboGeoFields.clear()
             data = response.json()
             self.asset_from_date = data.get("date_created")
             content = data.get("content")
             survey_arr = content.get("survey")
+            self.kobo_field_types = schema_field_types(
+                {
+                    field.get("$xpath")
+                    or field.get("$autoname")
+                    or field.get("name"): field.get("type")
+                    for field in survey_arr
+                }
+            )
             geo_fields = [
                 field.get("$autoname") or field.get("name")
                 for field in survey_arr
@@ -1851,7 +2441,7 @@ class AfpolGIS(QObject):
         self.dlg.btnFetchKoboForms.repaint()
 
         url = f"https://{api_url}/api/v2/assets.json"
-        response = self.fetch_with_retries(url, auth)
+        response = self.fetch_with_retries(url, auth, use_cache=True)
 
         if response.status_code == 200:
             assets = response.json()
@@ -1922,181 +2512,154 @@ class AfpolGIS(QObject):
         es_api_version = self.dlg.esAPIVersion.text()
         topography = self.dlg.combESTopology.currentText()
         topography_param = topography.lower()
-        site_admin_tokens = []
-        lab_ids = []
-        params = dict()
-
-        export_url = None
 
         self.dlg.esOkButton.setEnabled(False)
+        self.dlg.esProgressBar.setValue(20)
 
-        sites_feature_collection = {
-            "type": "FeatureCollection",
-            "features": [],
-        }
+        task = ConnectorFetchTask(
+            f"AfpolGIS: Fetching ES World {topography}",
+            [
+                lambda task, _: self.resolve_es_export(
+                    task, api_url, es_api_version, topography_param
+                ),
+                lambda task, export: self.collect_es_data(task, export),
+                lambda task, result: self.store_submissions(
+                    task, result, api_url, es_api_version, topography_param
+                ),
+            ],
+            on_finished=lambda result: self.handle_es_data_collected(
+                result, topography_param
+            ),
+            on_error=lambda message: self.handle_fetch_task_error(
+                message, self.dlg.esOkButton, self.dlg.esProgressBar
+            ),
+            on_cancelled=lambda: self.handle_fetch_task_cancelled(
+                self.dlg.esOkButton, self.dlg.esProgressBar
+            ),
+        )
+        self.fetch_jobs.start("es", task, self.dlg.esProgressBar)
+
+    def resolve_es_export(self, task, api_url, es_api_version, topography_param):
+        """Looks up the admin tokens or lab ids to export, runs in a background task."""
+        export = {"export_url": None, "params": dict(), "site_admin_tokens": []}
 
         if topography_param == "sites":
             countries_url = (
                 f"https://{api_url}/api/{es_api_version}-prod/admin/countries"
             )
-            self.dlg.esProgressBar.setValue(20)
-            response = self.fetch_with_retries(countries_url)
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    features = data.get("features")
-                    if features:
-                        site_admin_tokens = [
-                            f.get("properties").get("token") for f in features
-                        ]
-                        tokens_str = ",".join(site_admin_tokens)
-                        params["export"] = "geojson"
-                        params["admin"] = tokens_str
-                        export_url = (
-                            f"https://{api_url}/api/{es_api_version}-prod/sites"
-                        )
-                    else:
-                        self.iface.messageBar().pushMessage(
-                            "Notice",
-                            "No Available Features",
-                            level=Qgis.Warning,
-                            duration=10,
-                        )
-            else:
-                self.dlg.esProgressBar.setValue(0)
-                self.dlg.esOkButton.setEnabled(True)
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
-                    duration=10,
+            response = fetch_data(countries_url)
+            if response.status_code != 200:
+                raise FetchError(f"Error fetching data: {response.status_code}")
+
+            data = response.json()
+            features = data.get("features") if data else None
+            if features:
+                site_admin_tokens = [f.get("properties").get("token") for f in features]
+                export["site_admin_tokens"] = site_admin_tokens
+                export["params"] = {
+                    "export": "geojson",
+                    "admin": ",".join(site_admin_tokens),
+                }
+                export["export_url"] = (
+                    f"https://{api_url}/api/{es_api_version}-prod/sites"
                 )
 
         if topography_param == "labs":
             labs_url = f"https://{api_url}/api/{es_api_version}-prod/{topography_param}"
-            self.dlg.esProgressBar.setValue(20)
-            response = self.fetch_with_retries(labs_url)
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    lab_ids = [datum.get("id") for datum in data]
-                    lab_ids_str = ",".join(lab_ids)
+            response = fetch_data(labs_url)
+            if response.status_code != 200:
+                raise FetchError(f"Error fetching data: {response.status_code}")
 
-                    params["export"] = "geojson"
-                    params["admin"] = lab_ids_str
-                    export_url = f"https://{api_url}/api/{es_api_version}-prod/labs"
-                else:
-                    self.iface.messageBar().pushMessage(
-                        "Notice", "No Available Data", level=Qgis.Warning, duration=10
-                    )
-            else:
-                self.dlg.esProgressBar.setValue(0)
-                self.dlg.esOkButton.setEnabled(True)
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
-                    duration=10,
+            data = response.json()
+            if data:
+                lab_ids = [datum.get("id") for datum in data]
+                export["params"] = {"export": "geojson", "admin": ",".join(lab_ids)}
+                export["export_url"] = (
+                    f"https://{api_url}/api/{es_api_version}-prod/labs"
                 )
 
-        if export_url:
-            self.dlg.esProgressBar.setValue(50)
+        task.setProgress(50)
+        return export
 
-            if site_admin_tokens:
-                quater = len(site_admin_tokens) // 4  # Find the midpoint
-                first = site_admin_tokens[:quater]
-                second = site_admin_tokens[quater : 2 * quater]
-                third = site_admin_tokens[2 * quater : 3 * quater]
-                fourth = site_admin_tokens[3 * quater :]
+    def collect_es_data(self, task, export):
+        """Downloads the ES GeoJSON export, runs in a background task."""
+        export_url = export.get("export_url")
+        site_admin_tokens = export.get("site_admin_tokens")
+        feature_collection = {
+            "type": "FeatureCollection",
+            "features": [],
+        }
+        errors = []
 
-                for admin_tokens in [first, second, third, fourth]:
-                    token_str = ",".join(admin_tokens)
+        if not export_url:
+            return {"feature_collection": feature_collection, "error": None}
 
-                    response = self.fetch_with_retries(
-                        export_url, params={"export": "geojson", "admin": token_str}
-                    )
+        if site_admin_tokens:
+            quater = len(site_admin_tokens) // 4  # Find the midpoint
+            first = site_admin_tokens[:quater]
+            second = site_admin_tokens[quater : 2 * quater]
+            third = site_admin_tokens[2 * quater : 3 * quater]
+            fourth = site_admin_tokens[3 * quater :]
 
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data:
-                            features = data.get("features")
-                            sites_feature_collection["features"].extend(features)
-                    else:
-                        self.dlg.esProgressBar.setValue(0)
-                        self.dlg.esOkButton.setEnabled(True)
-                        self.iface.messageBar().pushMessage(
-                            "Error",
-                            f"Error fetching data: {response.status_code}",
-                            level=Qgis.Critical,
-                        )
+            requests_list = [
+                {
+                    "url": export_url,
+                    "params": {"export": "geojson", "admin": ",".join(admin_tokens)},
+                }
+                for admin_tokens in [first, second, third, fourth]
+            ]
 
-                self.dlg.esProgressBar.setValue(100)
+            # fetch the four export chunks concurrently
+            responses = run_blocking(lambda engine: engine.fetch_all(requests_list))
+        else:
+            responses = [fetch_data(export_url, params=export.get("params"))]
+
+        for response in responses:
+            if isinstance(response, Exception):
+                errors.append(f"Error fetching data: {response}")
+            elif response.status_code == 200:
+                feature_collection["features"].extend(
+                    iter_json_records(response, "features")
+                )
+            else:
+                errors.append(f"Error fetching data: {response.status_code}")
 
-                if (
-                    sites_feature_collection["features"]
-                    and len(sites_feature_collection["features"]) > 0
-                ):
-                    self.es_json_data = [
-                        feature.get("properties")
-                        for feature in sites_feature_collection["features"]
-                    ]
-                    self.dlg.esDownloadCSV.setEnabled(True)
+        return {
+            "feature_collection": feature_collection,
+            "error": "; ".join(errors) if errors else None,
+        }
 
-                    self.load_data_to_qgis(
-                        sites_feature_collection, "es", topography_param
-                    )
-                    self.dlg.esProgressBar.setValue(0)
-                    self.dlg.esOkButton.setEnabled(True)
-                else:
-                    self.dlg.esProgressBar.setValue(0)
-                    self.iface.messageBar().pushMessage(
-                        "Notice", "No Data Found", level=Qgis.Warning
-                    )
-                    self.dlg.esOkButton.setEnabled(True)
+    def handle_es_data_collected(self, result, topography_param):
+        feature_collection = result.get("feature_collection")
 
-            else:
-                response = self.fetch_with_retries(export_url, params=params)
+        if result.get("error"):
+            self.report_fetch_error(result.get("error"))
 
-                if response.status_code == 200:
-                    self.dlg.esProgressBar.setValue(100)
-                    feature_collection = response.json()
-                    if (
-                        feature_collection["features"]
-                        and len(feature_collection["features"]) > 0
-                    ):
-                        self.es_json_data = [
-                            feature.get("properties")
-                            for feature in feature_collection["features"]
-                        ]
-                        self.dlg.esDownloadCSV.setEnabled(True)
-
-                        self.load_data_to_qgis(
-                            feature_collection, "es", topography_param
-                        )
-                        self.dlg.esProgressBar.setValue(0)
-                        self.dlg.esOkButton.setEnabled(True)
-                    else:
-                        self.dlg.esProgressBar.setValue(0)
-                        self.iface.messageBar().pushMessage(
-                            "Notice", "No Data Found", level=Qgis.Warning
-                        )
-                        self.dlg.esOkButton.setEnabled(True)
-                else:
-                    self.dlg.esProgressBar.setValue(0)
-                    self.dlg.esOkButton.setEnabled(True)
-                    self.iface.messageBar().pushMessage(
-                        "Error",
-                        f"Error fetching data: {response.status_code}",
-                        level=Qgis.Critical,
-                    )
+        self.dlg.esProgressBar.setValue(100)
+
+        if feature_collection["features"] and len(feature_collection["features"]) > 0:
+            self.es_json_data = [
+                feature.get("properties") for feature in feature_collection["features"]
+            ]
+            self.dlg.esDownloadCSV.setEnabled(True)
+
+            self.load_data_to_qgis(feature_collection, "es", topography_param)
+        else:
+            self.iface.messageBar().pushMessage(
+                "Notice", "No Data Found", level=Qgis.Warning
+            )
+        self.dlg.esProgressBar.setValue(0)
+        self.dlg.esOkButton.setEnabled(True)
 
     def ona_reset_saved_data(self):
         self.json_data = list()
+        self.ona_synced_form = None
         self.dlg.onaDownloadCSV.setEnabled(False)
         self.dlg.onaDownloadCSV.repaint()
 
     def odk_reset_saved_data(self):
         self.odk_json_data = list()
+        self.odk_synced_form = None
         self.dlg.odkDownloadCSV.setEnabled(False)
         self.dlg.odkDownloadCSV.repaint()
 
@@ -2163,7 +2726,9 @@ class AfpolGIS(QObject):
 
         # headers for additional metadata
         headers = {"X-Extended-Metadata": "true"}
-        response = self.fetch_with_retries(url, auth, params=None, headers=headers)
+        response = self.fetch_with_retries(
+            url, auth, params=None, headers=headers, use_cache=True
+        )
         if response.status_code == 200:
             data = response.json()
             from_timestamp = data.get("createdAt")
@@ -2220,10 +2785,13 @@ class AfpolGIS(QObject):
         url = f"https://{api_url}/v1/projects/{project_id}/forms/{form_id_str}/fields"
         params = {"odata": True}
         self.dlg.comboODKGeoFields.setEnabled(False)
-        response = self.fetch_with_retries(url, auth, params=params)
+        response = self.fetch_with_retries(url, auth, params=params, use_cache=True)
         if response.status_code == 200:
             self.dlg.comboODKGeoFields.clear()
             data = response.json()
+            self.odk_field_types = schema_field_types(
+                {field.get("path", "").strip("/"): field.get("type") for field in data}
+            )
             geo_fields = [
                 field.get("name")
                 for field in data
@@ -2324,6 +2892,7 @@ class AfpolGIS(QObject):
         if isinstance(data, dict):
             geo_fields_set = data.get("geo_fields_set")
             geo_fields_dict = data.get("geo_fields_dict")
+            self.ona_field_types = schema_field_types(data.get("field_types") or {})
 
             for i, gf in enumerate(geo_fields_set):
                 cleaned_gf = gf.strip()
@@ -2426,9 +2995,27 @@ class AfpolGIS(QObject):
 
     def fetch_odk_forms_per_proj(self, api_url, username, password, project_ids):
         auth = HTTPBasicAuth(username, password)
-        for proj_id in project_ids:
-            url = f"https://{api_url}/v1/projects/{proj_id}/forms"
-            response = self.fetch_with_retries(url, auth)
+        requests_list = [
+            {"url": f"https://{api_url}/v1/projects/{proj_id}/forms", "auth": auth}
+            for proj_id in project_ids
+        ]
+        # fetch the forms of every project concurrently without blocking the UI
+        self.async_engine.submit(
+            self.async_engine.fetch_all(requests_list),
+            on_done=lambda responses: self.handle_odk_project_forms(
+                project_ids, responses
+            ),
+            on_error=self.handle_odk_project_forms_error,
+        )
+
+    def handle_odk_project_forms(self, project_ids, responses):
+        for proj_id, response in zip(project_ids, responses):
+            if isinstance(response, Exception):
+                self.dlg.app_logs.appendPlainText(
+                    f"Failed to fetch forms for project {proj_id}: {response}"
+                )
+                continue
+
             if response.status_code == 200:
                 forms = response.json()
                 if forms:
@@ -2441,31 +3028,35 @@ class AfpolGIS(QObject):
                         )
                         if not self.odk_forms_to_projects_map.get(form_id):
                             self.odk_forms_to_projects_map[form_id] = proj_id
-                    self.dlg.btnFetchODKForms.setEnabled(True)
-                    self.dlg.btnFetchODKForms.setText("Connect")
-                    self.dlg.btnFetchODKForms.repaint()
                     self.dlg.comboODKForms.setEnabled(True)
                 else:
                     self.iface.messageBar().pushMessage(
                         "Notice", "No Forms Found", level=Qgis.Warning
                     )
-            else:
-                self.dlg.btnFetchODKForms.setEnabled(True)
-                self.dlg.btnFetchODKForms.setText("Connect")
-                self.dlg.btnFetchODKForms.repaint()
-        return
-
-    def fetch_odk_projects(self, api_url, username, password):
-        auth = HTTPBasicAuth(username, password)
-        self.dlg.comboODKForms.clear()
-        self.dlg.comboODKGeoFields.clear()
+
+        self.dlg.btnFetchODKForms.setEnabled(True)
+        self.dlg.btnFetchODKForms.setText("Connect")
+        self.dlg.btnFetchODKForms.repaint()
+
+    def handle_odk_project_forms_error(self, message):
+        self.iface.messageBar().pushMessage(
+            "Error", f"Error fetching data: {message}", level=Qgis.Critical
+        )
+        self.dlg.btnFetchODKForms.setEnabled(True)
+        self.dlg.btnFetchODKForms.setText("Connect")
+        self.dlg.btnFetchODKForms.repaint()
+
+    def fetch_odk_projects(self, api_url, username, password):
+        auth = HTTPBasicAuth(username, password)
+        self.dlg.comboODKForms.clear()
+        self.dlg.comboODKGeoFields.clear()
 
         self.dlg.btnFetchODKForms.setEnabled(False)
         self.dlg.btnFetchODKForms.setText("Connecting...")
         self.dlg.btnFetchODKForms.repaint()
 
         url = f"https://{api_url}/v1/projects"
-        response = self.fetch_with_retries(url, auth)
+        response = self.fetch_with_retries(url, auth, use_cache=True)
 
         if response.status_code == 200:
             odk_projects = response.json()
@@ -2487,6 +3078,10 @@ class AfpolGIS(QObject):
             self.dlg.btnFetchODKForms.setEnabled(True)
 
     def on_odk_data_sync_enabled(self):
+        # skip this tick while the previous pull is still running
+        if self.fetch_jobs.is_running("odk"):
+            return
+
         api_url = self.dlg.odk_api_url.text()
         username = self.dlg.odk_username.text()
         password = self.dlg.odkmLineEdit.text()
@@ -2501,17 +3096,8 @@ class AfpolGIS(QObject):
             form_id_str = form_data.get("form_id")
             project_id = form_data.get("project_id")
 
-            self.fetch_odk_date_range_fields(
-                api_url,
-                username,
-                password,
-                project_id,
-                form_id_str,
-            )
-
             # extract date fields
             odk_from_date = self.dlg.ODKDateTimeFrom.date()
-            odk_to_date = self.dlg.ODKDateTimeTo.date()
 
             from_dt = datetime(
                 odk_from_date.year(),
@@ -2521,15 +3107,17 @@ class AfpolGIS(QObject):
                 0,
                 0,
             )  # 12:00 AM
-            to_dt = datetime(
-                odk_to_date.year(), odk_to_date.month(), odk_to_date.day(), 23, 59, 59
-            )
 
             # Convert datetime to timestamp string
             odk_from_timestamp = (
                 from_dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
             )  # Adjust to match original format
-            odk_to_timestamp = to_dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+            # only pull submissions created or edited after the last sync,
+            # no upper bound so new submissions are always picked up
+            watermark = self.submission_store.watermark(
+                api_url, f"{project_id}/{form_id_str}", geo_field
+            )
 
             if hasattr(self, "vlayers"):
                 if self.vlayers.get(f"{form_id_str}_{geo_field}"):
@@ -2542,7 +3130,8 @@ class AfpolGIS(QObject):
                 form_id_str,
                 geo_field,
                 odk_from_timestamp,
-                odk_to_timestamp,
+                None,
+                since=watermark.get("modified_at"),
             )
 
     def fetch_odk_form_data_clicked(self):
@@ -2582,151 +3171,47 @@ class AfpolGIS(QObject):
         )  # Adjust to match original format
         odk_to_timestamp = to_dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
 
-        page_size = 1000
-        directory = True
-
-        if directory:
-            # Create a worker for background data fetching
-            # self.odk_worker = FetchODKDataWorker(
-            #     self,
-            #     api_url,
-            #     form_id_str,
-            #     username,
-            #     password,
-            #     geo_field,
-            #     page_size,
-            #     directory,
-            #     self.dlg,
-            #     False,
-            #     odk_from_timestamp,
-            #     odk_to_timestamp
-            # )
-
-            # # # Connect signals to handle results in the main thread
-            # self.odk_worker.odk_data_fetched.connect(self.on_data_fetched)
-            # self.odk_worker.odk_fetch_error.connect(self.on_fetch_error)
-            # self.odk_worker.odk_rogress_updated.connect(self.on_progress_update)
-
-            # # Start the thread
-            # self.odk_worker.start()
-            # if odk_sync_interval > 0:
-            #     self.odk_sync_timer.start(odk_sync_interval * 1000)
-
-            if form_id_str:
-                self.fetch_and_save_odk_data(
-                    api_url,
-                    username,
-                    password,
-                    form_id_str,
-                    geo_field,
-                    odk_from_timestamp,
-                    odk_to_timestamp,
-                )
+        # the pull runs as a background job, see fetch_and_save_odk_data
+        if form_id_str:
+            self.fetch_and_save_odk_data(
+                api_url,
+                username,
+                password,
+                form_id_str,
+                geo_field,
+                odk_from_timestamp,
+                odk_to_timestamp,
+            )
 
-                if odk_sync_interval > 0:
-                    self.odk_sync_timer.start(odk_sync_interval * 1000)
-
-    def is_valid_wkt(self, wkt_string):
-        # Define basic geometry types
-        valid_geometries = [
-            "POINT",
-            "LINESTRING",
-            "POLYGON",
-            "MULTIPOINT",
-            "MULTILINESTRING",
-            "MULTIPOLYGON",
-        ]
+            if odk_sync_interval > 0:
+                self.odk_sync_timer.start(odk_sync_interval * 1000)
 
-        # Extract the geometry type
-        match = re.match(r"^\s*(\w+)\s*\((.*)\)\s*$", wkt_string, re.IGNORECASE)
-        if not match:
-            return False  # Invalid format
+    def build_odk_geo_features(self, data, geom_field, dataset):
+        """Adds a page of flattened ODK submissions and their geometries.
 
-        geometry_type, coordinates_part = match.groups()
-        geometry_type = geometry_type.upper()
+        The WKT of the whole page is parsed in one pass (see wkt_parser).
+        A submission without the geo field at the top level takes the first
+        valid geometry found in its repeats.
+        """
+        candidates = []
+        wkt_values = []
+        for index, datum in enumerate(data):
+            if geom_field in datum:
+                # this means that the geo field is not inside a repeat
+                keys = [geom_field]
+            else:
+                keys = [k for k in datum.keys() if geom_field in k.split("/")]
+            for k in keys:
+                candidates.append(index)
+                wkt_values.append(datum.get(k))
 
-        # Check if geometry type is valid
-        if geometry_type not in valid_geometries:
-            return False
-        else:
-            return True
-
-    def wkt_to_geometry_obj(self, wkt_string):
-        # Identify the geometry type and coordinates
-        wkt = wkt_string.strip()
-        geometry_type, coords = wkt.split("(", 1)
-        geometry_type = geometry_type.strip().upper()
-        coords = coords.strip().rstrip(")").lstrip("(")
-
-        if geometry_type == "POINT":
-            # Take only the first two values (X and Y)
-            coordinate_values = coords.split()
-            coordinates = [float(coordinate_values[0]), float(coordinate_values[1])]
-            geometry_obj = {"type": "Point", "coordinates": coordinates}
-
-        elif geometry_type == "LINESTRING" or geometry_type == "GEOTRACE":
-            # Extract all numeric values, including negative and decimal points
-            coordinate_values = re.findall(r"-?\d+\.?\d*", coords)
-            # Group into pairs (X, Y), ignoring the Z component if present
-            coordinates = [
-                [float(coordinate_values[i]), float(coordinate_values[i + 1])]
-                for i in range(
-                    0,
-                    len(coordinate_values),
-                    2 if len(coordinate_values) % 3 != 0 else 3,
-                )
-            ]
-            geometry_obj = {"type": "LineString", "coordinates": coordinates}
+        geometries = dict()
+        for index, geometry in zip(candidates, parse_wkt_batch(wkt_values)):
+            if geometry and index not in geometries:
+                geometries[index] = geometry
 
-        elif geometry_type == "POLYGON":
-            rings = coords.split("), (")
-            rings = [ring.replace("(", "").replace(")", "").strip() for ring in rings]
-            coordinates = [
-                [
-                    [float(pair.split()[0]), float(pair.split()[1])]
-                    for pair in ring.split(",")
-                ]
-                for ring in rings
-            ]
-            geometry_obj = {"type": "Polygon", "coordinates": coordinates}
-        else:
-            raise ValueError(f"Unsupported geometry type: {geometry_type}")
-
-        return geometry_obj
-
-    def get_odk_geo_data(self, datum, geom_field):
-        field_keys = datum.keys()
-        if geom_field in field_keys:
-            # this means that the geo field is not inside a repeat
-            # build the corresponding geometry/feature collection
-            geom = datum.get(geom_field)
-            # determine whether polygon or point
-            if geom and self.is_valid_wkt(geom):
-                geometry = self.wkt_to_geometry_obj(geom)
-                # this means that it is a polygon
-                # build the correspoing collection
-                feature = {"type": "Feature", "geometry": geometry, "properties": datum}
-                return feature
-        else:
-            # flatten the datum
-            repeat_geo_arr = []
-            for k in datum.keys():
-                field_arr = k.split("/")
-                if geom_field in field_arr:
-                    repeat_geo_arr.append(k)
-            if repeat_geo_arr:
-                for f in repeat_geo_arr:
-                    nested_geom = datum.get(f)
-                    if nested_geom and self.is_valid_wkt(nested_geom):
-                        geometry = self.wkt_to_geometry_obj(nested_geom)
-                        # this means that it is a polygon
-                        # build the correspoing collection
-                        feature = {
-                            "type": "Feature",
-                            "geometry": geometry,
-                            "properties": datum,
-                        }
-                        return feature
+        for index, datum in enumerate(data):
+            dataset.append(datum, [geometries.get(index)])
 
     def flatten_odk_json(self, json_obj, parent_key=""):
         """Recursively flattens a nested JSON object into a dictionary with XPath keys."""
@@ -2755,66 +3240,133 @@ class AfpolGIS(QObject):
         geo_field,
         odk_from_date,
         odk_to_date,
+        since=None,
     ):
+        """Pulls ODK submissions in a background task.
+
+        With since set, only submissions created or edited after that
+        timestamp are fetched, stored and merged into the layer; otherwise
+        the stored submissions for the form and the layer are replaced.
+        """
         auth = HTTPBasicAuth(username, password)
         self.dlg.odkOkButton.setEnabled(False)
         page_size = int(self.dlg.odkPageSize.value())
 
         params = {"$expand": "*", "$wkt": True, "$top": page_size, "$skip": 0}
 
-        if odk_from_date and odk_to_date:
-            filter_query = f"__system/submissionDate ge {odk_from_date} and __system/submissionDate le {odk_to_date}"
-            params["$filter"] = filter_query
+        filters = []
+        if odk_from_date:
+            filters.append(f"__system/submissionDate ge {odk_from_date}")
+        if odk_to_date:
+            filters.append(f"__system/submissionDate le {odk_to_date}")
+        if since:
+            filters.append(
+                f"(__system/submissionDate gt {since} or __system/updatedAt gt {since})"
+            )
+        if filters:
+            params["$filter"] = " and ".join(filters)
 
         project_id = self.odk_forms_to_projects_map.get(form_id_str)
-
-        feature_collection = {
-            "type": "FeatureCollection",
-            "features": [],
-        }
+        store_key = (api_url, f"{project_id}/{form_id_str}", geo_field)
 
         url = f"https://{api_url}/v1/projects/{project_id}/forms/{form_id_str}.svc/Submissions"
+
+        stages = [
+            lambda task, _: self.collect_odk_data(task, url, auth, params, geo_field)
+        ]
+        if since:
+            stages.append(self.require_complete_delta)
+        stages.append(
+            lambda task, result: self.store_submissions(
+                task, result, *store_key, replace=since is None
+            )
+        )
+        if since:
+            stages.append(
+                lambda task, result: self.mark_delta(task, result, *store_key)
+            )
+
+        task = ConnectorFetchTask(
+            f"AfpolGIS: Fetching ODK data for {form_id_str}",
+            stages,
+            on_finished=lambda result: self.handle_odk_data_collected(
+                result, form_id_str, geo_field
+            ),
+            on_error=lambda message: self.handle_fetch_task_error(
+                message, self.dlg.odkOkButton, self.dlg.odkProgressBar
+            ),
+            on_cancelled=lambda: self.handle_fetch_task_cancelled(
+                self.dlg.odkOkButton, self.dlg.odkProgressBar
+            ),
+        )
+        self.fetch_jobs.start("odk", task, self.dlg.odkProgressBar)
+
+    def collect_odk_data(self, task, url, auth, params, geo_field):
+        """Pages through ODK submissions, runs in a background task."""
+        params = dict(params)
+        params["$count"] = "true"
+        dataset = ColumnarDataset()
+        total_records = None
+        error = None
+
         hasData = True
 
         while hasData:
-            response = self.fetch_with_retries(url, auth, params)
-            if response.status_code == 200:
-                self.dlg.gtsProgressBar.setValue(50)
-                data = response.json()
-                data_list = data.get("value")
-                if data_list:
-                    self.dlg.odkProgressBar.setValue(100)
-                    for datum in data_list:
-                        flat_data = self.flatten_odk_json(datum)
-                        self.odk_json_data.append(flat_data)
-                        feature = self.get_odk_geo_data(flat_data, geo_field)
-                        if feature:
-                            feature_collection["features"].append(feature)
-                else:
-                    hasData = False
-                    self.dlg.gtsProgressBar.setValue(100)
-                    self.dlg.odkOkButton.setEnabled(True)
+            task.check_cancelled()
+            response = fetch_data(url, auth, params)
+            if response.status_code != 200:
+                error = f"Error fetching data: {response.status_code}"
+                break
+
+            stream = JsonRecordStream(response, "value")
+            page = [self.flatten_odk_json(datum) for datum in stream]
+            self.build_odk_geo_features(page, geo_field, dataset)
+
+            if page:
+                total_records = stream.meta.get("@odata.count", total_records)
+                task.report_progress(len(dataset), total_records)
             else:
                 hasData = False
-                self.dlg.gtsProgressBar.setValue(0)
-                self.iface.messageBar().pushMessage(
-                    "Error",
-                    f"Error fetching data: {response.status_code}",
-                    level=Qgis.Critical,
-                    duration=10,
-                )
-                self.dlg.odkOkButton.setEnabled(True)
 
             params["$skip"] += params["$top"]
 
-        if self.odk_json_data:
-            self.dlg.odkDownloadCSV.setEnabled(True)
-            self.dlg.odkDownloadCSV.repaint()
+        return {
+            "dataset": dataset,
+            "error": error,
+        }
 
-        if feature_collection["features"] and len(feature_collection["features"]) > 0:
-            self.load_data_to_qgis(feature_collection, form_id_str, geo_field)
+    def handle_odk_data_collected(self, result, form_id_str, geo_field):
+        if result.get("new_records") == 0 and not result.get("error"):
+            # incremental sync found nothing new, leave the layer as is
+            self.dlg.app_logs.appendPlainText("No new ODK submissions since last sync")
             self.dlg.odkOkButton.setEnabled(True)
             self.dlg.odkProgressBar.setValue(0)
+            return
+
+        dataset = result.get("dataset")
+        delta = result.get("delta")
+        if delta:
+            # the layer and the store already hold the earlier submissions
+            self.odk_synced_form = (*delta, dataset.geometry_field)
+        else:
+            self.odk_json_data = dataset
+            self.odk_synced_form = None
+
+        if result.get("error"):
+            self.report_fetch_error(result.get("error"))
+
+        if dataset:
+            self.dlg.odkDownloadCSV.setEnabled(True)
+            self.dlg.odkDownloadCSV.repaint()
+
+        if dataset is not None and dataset.feature_count():
+            self.load_data_to_qgis(
+                dataset,
+                form_id_str,
+                geo_field,
+                schema=self.odk_field_types,
+                replace=not delta,
+            )
         else:
             self.iface.messageBar().pushMessage(
                 "Notice",
@@ -2822,8 +3374,91 @@ class AfpolGIS(QObject):
                 level=Qgis.Warning,
                 duration=10,
             )
-            self.dlg.odkOkButton.setEnabled(True)
-            self.dlg.odkProgressBar.setValue(0)
+        self.dlg.odkOkButton.setEnabled(True)
+        self.dlg.odkProgressBar.setValue(0)
+
+    def store_submissions(self, task, result, server, form, geo_field, replace=False):
+        """Persists a fetch result in the submission store.
+
+        Used as the last stage of the connector fetch tasks, so it normally
+        runs in the background; task may be None when called directly. With
+        replace, previously stored submissions for the form are dropped first.
+        """
+        dataset = result.get("dataset")
+        if dataset is not None:
+            records = dataset.iter_records()
+            features = dataset.iter_features()
+        else:
+            records = result.get("records")
+            features = (result.get("feature_collection") or dict()).get("features")
+        try:
+            if replace:
+                self.submission_store.clear(server, form, geo_field)
+            self.submission_store.upsert(server, form, geo_field, records, features)
+        except sqlite3.Error as e:
+            QgsMessageLog.logMessage(
+                f"Failed to store submissions: {e}", "AfpolGIS", Qgis.Warning
+            )
+        return result
+
+    def require_complete_delta(self, task, result):
+        """Fails an incremental fetch that stopped on an error.
+
+        Storing the pages fetched before the error would move the sync
+        watermark past the submissions of the failed pages, which would then
+        never be pulled; the store and the layer are left as they are.
+        """
+        if result.get("error"):
+            raise FetchError(result.get("error"))
+        return result
+
+    def mark_delta(self, task, result, server, form, geo_field):
+        """Flags an incremental fetch result as a delta of the stored form.
+
+        The delta has already been upserted by store_submissions and is
+        merged into the layer as is, see update_layer_data.
+        """
+        dataset = result.get("dataset")
+        if dataset is not None:
+            new_records = len(dataset)
+        else:
+            new_records = len(result.get("records") or [])
+        if not new_records:
+            return dict(result, new_records=0)
+        return dict(result, new_records=new_records, delta=(server, form, geo_field))
+
+    def odk_download_data(self):
+        """Returns the ODK data for the CSV download.
+
+        After an incremental sync only the delta is in memory, so the
+        submissions stored for the form are read back instead.
+        """
+        if self.odk_synced_form:
+            server, form, geo_field, geometry_field = self.odk_synced_form
+            return ColumnarDataset.from_store_rows(
+                self.submission_store.iter_rows(server, form, geo_field),
+                geometry_field,
+            )
+        return self.odk_json_data
+
+    def report_fetch_error(self, message):
+        self.dlg.app_logs.appendPlainText(f"Error - {message}")
+        self.iface.messageBar().pushMessage(
+            "Error", f"{message}", level=Qgis.Critical, duration=10
+        )
+
+    def handle_fetch_task_error(self, message, ok_button, progress_bar):
+        self.report_fetch_error(message)
+        ok_button.setEnabled(True)
+        progress_bar.setValue(0)
+
+    def handle_fetch_task_cancelled(self, ok_button, progress_bar):
+        self.dlg.app_logs.appendPlainText("Data fetching cancelled.")
+        self.iface.messageBar().pushMessage(
+            "Notice", "Data fetching cancelled.", level=Qgis.Warning, duration=5
+        )
+        ok_button.setEnabled(True)
+        progress_bar.setValue(0)
 
     # Slots to handle signals
     def on_data_fetched(self, data):
@@ -2847,16 +3482,120 @@ class AfpolGIS(QObject):
             self.loop.stop()
             self.loop.close()
 
-    def handle_data_fetched(self, data):
+    def handle_ona_delta_fetched(self, data):
+        """Merges the records pulled by an incremental Ona sync into the layer."""
+        if not data:
+            self.dlg.app_logs.appendPlainText("No new Ona submissions since last sync")
+            self.dlg.onaProgressBar.setValue(0)
+            return
+
+        api_url = self.dlg.onadata_api_url.text()
         formID = self.dlg.comboOnaForms.currentData()
         form_str = self.dlg.comboOnaForms.currentText()
         cleaned_form_str = "_".join(form_str.split(" "))
+        geo_field = self.curr_geo_field
 
+        self.dlg.app_logs.appendPlainText(
+            f"{len(data)} new or edited submissions, updating layer...\n"
+        )
+
+        dataset = ColumnarDataset(geometry_field=geo_field)
+        self.build_geo_dataset(data, geo_field, dataset)
+
+        self.store_submissions(
+            None, {"dataset": dataset}, api_url, str(formID), geo_field
+        )
+        # the layer and the store already hold the earlier submissions
+        self.ona_synced_form = (api_url, str(formID), geo_field)
+
+        if dataset.feature_count():
+            self.load_data_to_qgis(
+                dataset,
+                cleaned_form_str,
+                geo_field,
+                schema=self.ona_field_types,
+                replace=False,
+            )
+        self.dlg.onaProgressBar.setValue(0)
+
+    def ona_download_data(self):
+        """Returns the Ona records for the CSV download.
+
+        After an incremental sync only the delta has been fetched, so the
+        submissions stored for the form are read back instead.
+        """
+        if self.ona_synced_form:
+            server, form, geo_field = self.ona_synced_form
+            return ColumnarDataset.from_store_rows(
+                self.submission_store.iter_rows(server, form, geo_field), geo_field
+            )
+        return self.json_data
+
+    def handle_ona_page_fetched(self, data):
+        """Writes a page of a full Ona fetch to the store and the layer.
+
+        Every page goes flatten -> geometry -> store -> layer as it arrives,
+        in a ColumnarDataset of its own that is dropped afterwards; the
+        records are kept in self.json_data, a ColumnarDataset as well, for
+        the CSV download. The layer is created from the first page (see
+        write_features_to_layer). A layer that already exists is left alone
+        here and refreshed from the store by handle_data_fetched.
+        """
+        records = data.get("records") or []
+        api_url = self.dlg.onadata_api_url.text()
+        formID = self.dlg.comboOnaForms.currentData()
+        form_str = self.dlg.comboOnaForms.currentText()
+        cleaned_form_str = "_".join(form_str.split(" "))
         geo_field = self.curr_geo_field
 
-        self.dlg.app_logs.appendPlainText("Data Fetch Complete, Building GeoJSON... \n")
+        first_page = self.ona_page_load is None
+        if first_page:
+            layer_name = f"{cleaned_form_str}_{geo_field}"
+            self.ona_page_load = {
+                "layer_name": layer_name,
+                "existing": bool(QgsProject.instance().mapLayersByName(layer_name)),
+                "vlayer": None,
+                "features": 0,
+            }
+            # the records of every page, for the CSV download
+            self.json_data = ColumnarDataset(geometry_field=geo_field)
+            self.ona_synced_form = None
+        load = self.ona_page_load
+
+        dataset = ColumnarDataset(geometry_field=geo_field)
+        self.build_geo_dataset(records, geo_field, dataset)
+        self.store_submissions(
+            None,
+            {"dataset": dataset},
+            api_url,
+            str(formID),
+            geo_field,
+            replace=first_page,
+        )
 
-        if isinstance(data, dict) or (isinstance(data, list) and len(data) == 0):
+        if dataset.feature_count() and not load["existing"]:
+            load["vlayer"] = self.write_features_to_layer(
+                load["vlayer"],
+                load["layer_name"],
+                dataset,
+                schema=self.ona_field_types,
+            )
+        load["features"] += dataset.feature_count()
+        for record in dataset.iter_records():
+            self.json_data.append(record)
+
+    def handle_data_fetched(self, data):
+        """Finishes a full Ona fetch once all its pages have been written."""
+        api_url = self.dlg.onadata_api_url.text()
+        formID = self.dlg.comboOnaForms.currentData()
+        form_str = self.dlg.comboOnaForms.currentText()
+        cleaned_form_str = "_".join(form_str.split(" "))
+        geo_field = self.curr_geo_field
+
+        load = self.ona_page_load
+        self.ona_page_load = None
+
+        if not load:
             self.dlg.app_logs.appendPlainText(
                 "No Data Available For the selected date range"
             )
@@ -2864,45 +3603,46 @@ class AfpolGIS(QObject):
             if self.ona_sync_timer.isActive():
                 self.ona_sync_timer.stop()
                 self.dlg.onaOkButton.setEnabled(True)
-        else:
-            feature_collection = {
-                "type": "FeatureCollection",
-                "features": [],
-            }
-
-            if data:
-                self.json_data = data
-                self.dlg.onaDownloadCSV.setEnabled(True)
+            return
 
-            for datum in data:
-                self.get_geo_data(datum, geo_field, feature_collection)
+        self.dlg.onaDownloadCSV.setEnabled(True)
+        self.dlg.app_logs.appendPlainText(
+            f"Data Fetch Complete, {data.get('records')} submissions\n"
+        )
 
-            if (
-                feature_collection["features"]
-                and len(feature_collection["features"]) > 0
-            ):
-                # self.dlg.onaProgressBar.setValue(100)
-                self.dlg.app_logs.appendPlainText(
-                    "Building GeoJSON Complete. Adding Layer to Map...\n"
+        if load["features"]:
+            if load["existing"]:
+                # synced (or already loaded) layer, compared with the store
+                self.load_data_to_qgis(
+                    ColumnarDataset.from_store_rows(
+                        self.submission_store.iter_rows(
+                            api_url, str(formID), geo_field
+                        ),
+                        geo_field,
+                    ),
+                    cleaned_form_str,
+                    geo_field,
+                    schema=self.ona_field_types,
                 )
-                self.load_data_to_qgis(feature_collection, cleaned_form_str, geo_field)
+            elif load["vlayer"]:
+                self.add_layer_to_map(load["vlayer"], load["layer_name"])
 
-                self.dlg.onaProgressBar.setValue(0)
-                if not self.ona_sync_timer.isActive():
-                    self.dlg.onaOkButton.setEnabled(True)
-            else:
-                self.dlg.app_logs.appendPlainText(
-                    "The selected geo field doesn't have geo data"
-                )
+            self.dlg.onaProgressBar.setValue(0)
+            if not self.ona_sync_timer.isActive():
+                self.dlg.onaOkButton.setEnabled(True)
+        else:
+            self.dlg.app_logs.appendPlainText(
+                "The selected geo field doesn't have geo data"
+            )
 
-                self.iface.messageBar().pushMessage(
-                    "Notice",
-                    f"The selected geo field doesn't have geo data",
-                    level=Qgis.Warning,
-                    duration=10,
-                )
-                if not self.ona_sync_timer.isActive():
-                    self.dlg.onaOkButton.setEnabled(True)
+            self.iface.messageBar().pushMessage(
+                "Notice",
+                f"The selected geo field doesn't have geo data",
+                level=Qgis.Warning,
+                duration=10,
+            )
+            if not self.ona_sync_timer.isActive():
+                self.dlg.onaOkButton.setEnabled(True)
 
     def handle_fetch_error(self, message):
         self.dlg.app_logs.appendPlainText(f"Error - {message}")
@@ -2978,6 +3718,18 @@ class AfpolGIS(QObject):
             elif isinstance(data, str):
                 self.dlg.app_logs.appendPlainText(data)
 
+    def handle_ona_page_failed(self, data):
+        if isinstance(data, dict):
+            page = data.get("page")
+            error = data.get("error")
+            self.dlg.app_logs.appendPlainText(f"Error - Page {page} failed: {error}")
+            self.iface.messageBar().pushMessage(
+                "Error",
+                f"Page {page} failed: {error}",
+                level=Qgis.Critical,
+                duration=10,
+            )
+
     def handle_no_json_data(self, msg):
         self.dlg.app_logs.appendPlainText(f"Warning - {msg}")
         self.iface.messageBar().pushMessage(
@@ -2986,6 +3738,10 @@ class AfpolGIS(QObject):
         self.dlg.onaOkButton.setEnabled(True)
 
     def ona_fetch_data_sync_enabled(self):
+        # skip this tick while the previous pull is still running
+        if getattr(self, "ona_worker", None) and self.ona_worker.isRunning():
+            return
+
         # disable OK button during sync
         self.dlg.onaOkButton.setEnabled(False)
         api_url = self.dlg.onadata_api_url.text()
@@ -3005,27 +3761,27 @@ class AfpolGIS(QObject):
         params = dict()
 
         ona_from_date = self.dlg.onaDateTimeFrom.date()
-        ona_to_date = self.dlg.onaDateTimeTo.date()
 
         from_dt = datetime(
             ona_from_date.year(), ona_from_date.month(), ona_from_date.day(), 0, 0, 0
         )  # 12:00 AM
-        to_dt = datetime(
-            ona_to_date.year(), ona_to_date.month(), ona_to_date.day(), 23, 59, 59
-        )
 
         ona_from_timestamp = from_dt.strftime("%Y-%m-%dT%H:%M:%S")
-        ona_to_timestamp = to_dt.strftime("%Y-%m-%dT%H:%M:%S")
 
-        if ona_from_timestamp and ona_to_timestamp:
-            params["query"] = json.dumps(
-                {
-                    "_submission_time": {
-                        "$gte": ona_from_timestamp,
-                        "$lte": ona_to_timestamp,
-                    }
-                }
+        # only query records above the highest _id / _date_modified already
+        # stored, no upper bound so new submissions are always picked up
+        watermark = self.submission_store.watermark(api_url, str(formID), geo_field)
+        query = {"_submission_time": {"$gte": ona_from_timestamp}}
+        delta_conditions = []
+        if watermark.get("max_id") is not None:
+            delta_conditions.append({"_id": {"$gt": watermark.get("max_id")}})
+        if watermark.get("modified_at"):
+            delta_conditions.append(
+                {"_date_modified": {"$gt": watermark.get("modified_at")}}
             )
+        if delta_conditions:
+            query["$or"] = delta_conditions
+        params["query"] = json.dumps(query)
 
         if formID:
             if hasattr(self, "vlayers"):
@@ -3037,6 +3793,7 @@ class AfpolGIS(QObject):
                         ).get("vlayer"),
                     }
 
+            self.ona_page_load = None
             self.ona_worker = OnaRequestThread(
                 url,
                 auth,
@@ -3045,10 +3802,13 @@ class AfpolGIS(QObject):
                 total_records=self.data_count,
                 records_per_page=page_size,
                 formID=formID,
+                incremental=bool(delta_conditions),
             )
 
             # Connect signals to the handler methods
+            self.ona_worker.page_fetched.connect(self.handle_ona_page_fetched)
             self.ona_worker.data_fetched.connect(self.handle_data_fetched)
+            self.ona_worker.delta_fetched.connect(self.handle_ona_delta_fetched)
             self.ona_worker.progress_updated.connect(
                 self.handle_ona_data_fetch_progress
             )
@@ -3060,6 +3820,7 @@ class AfpolGIS(QObject):
                 self.handle_date_and_count_fields_error
             )
             self.ona_worker.error_occurred.connect(self.handle_fetch_error)
+            self.ona_worker.page_failed.connect(self.handle_ona_page_failed)
             self.ona_worker.start()
 
     def fetch_button_clicked(self):
@@ -3109,6 +3870,7 @@ class AfpolGIS(QObject):
                 }
             )
 
+        self.ona_page_load = None
         self.ona_worker = OnaRequestThread(
             url,
             auth,
@@ -3120,6 +3882,7 @@ class AfpolGIS(QObject):
         )
 
         # Connect signals to the handler methods
+        self.ona_worker.page_fetched.connect(self.handle_ona_page_fetched)
         self.ona_worker.data_fetched.connect(self.handle_data_fetched)
         self.ona_worker.progress_updated.connect(self.handle_ona_data_fetch_progress)
         self.ona_worker.count_and_date_fields_fetched.connect(
@@ -3130,6 +3893,7 @@ class AfpolGIS(QObject):
             self.handle_date_and_count_fields_error
         )
         self.ona_worker.error_occurred.connect(self.handle_fetch_error)
+        self.ona_worker.page_failed.connect(self.handle_ona_page_failed)
         self.ona_worker.start()
 
         if ona_sync_interval > 0:
@@ -3143,42 +3907,33 @@ class AfpolGIS(QObject):
         headers=None,
         max_retries=5,
         backoff_factor=0.2,
+        use_cache=False,
     ):
-        with requests.Session() as session:  # Use a session
-            if auth:
-                session.auth = auth  # Set Basic Auth for the session
-
-            # set headers
-            if headers:
-                session.headers.update(headers)
-
-            for attempt in range(max_retries):
-                try:
-                    if params:
-                        response = session.get(url, params=params, stream=True)
-                    else:
-                        response = session.get(url, stream=True)
-
-                    if response.status_code == 404:
-                        return response  # Return if the resource is not found
-                    # response.raise_for_status()  # Raise HTTPError for bad responses (4xx and 5xx)
-                    return response  # Successful request
-
-                except (
-                    requests.RequestException,
-                    requests.ConnectionError,
-                    requests.ConnectTimeout,
-                    requests.ReadTimeout,
-                ) as e:
-                    print(f"Attempt {attempt + 1} failed: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(backoff_factor * (2**attempt))  # Exponential backoff
-                    else:
-                        self.dlg.app_logs.appendPlainText(f"Failed to fetch data")
-                        self.iface.messageBar().pushMessage(
-                            "Error", f"{e}", level=Qgis.Critical, duration=10
-                        )
-                        self.dlg.accept()
+        get = cached_get if use_cache else pooled_get
+        for attempt in range(max_retries):
+            try:
+                response = get(url, auth, params=params, headers=headers)
+
+                if response.status_code == 404:
+                    return response  # Return if the resource is not found
+                # response.raise_for_status()  # Raise HTTPError for bad responses (4xx and 5xx)
+                return response  # Successful request
+
+            except (
+                requests.RequestException,
+                requests.ConnectionError,
+                requests.ConnectTimeout,
+                requests.ReadTimeout,
+            ) as e:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries - 1:
+                    time.sleep(backoff_factor * (2**attempt))  # Exponential backoff
+                else:
+                    self.dlg.app_logs.appendPlainText(f"Failed to fetch data")
+                    self.iface.messageBar().pushMessage(
+                        "Error", f"{e}", level=Qgis.Critical, duration=10
+                    )
+                    self.dlg.accept()
 
     def retrieve_all_geofields(self, fields):
         for field in fields:
@@ -3236,24 +3991,11 @@ class AfpolGIS(QObject):
             self.dlg.onaDateTimeFrom.repaint()
             self.dlg.onaDateTimeTo.repaint()
 
-    def fetchDataCount(self, api_url, username, password, formID):
-        auth = HTTPBasicAuth(username, password=password)
-        url = f"https://{api_url}/api/v1/forms/{formID}.json"
-        self.dlg.app_logs.appendPlainText(f"Fetching Submissions Count...")
-        resp = self.fetch_with_retries(url, auth)
-        if resp.status_code == 200:
-            data = resp.json()
-            count = data.get("num_of_submissions")
-            self.dlg.app_logs.appendPlainText(
-                f"Done. Number Of Submissions - {count} \n"
-            )
-            return count
-
     def fetchGeoFields(self, api_url, username, password, formID):
         auth = HTTPBasicAuth(username, password)
         url = f"https://{api_url}/api/v1/forms/{formID}/versions"
         self.dlg.app_logs.appendPlainText(f"Fetching Form Versions...")
-        resp = self.fetch_with_retries(url, auth)
+        resp = self.fetch_with_retries(url, auth, use_cache=True)
         if resp.status_code == 200:
             versions = resp.json()
             self.dlg.app_logs.appendPlainText(
@@ -3266,7 +4008,7 @@ class AfpolGIS(QObject):
                     self.dlg.app_logs.appendPlainText(
                         f"Fetching Form Schema for {version_str}..."
                     )
-                    res = self.fetch_with_retries(version_url, auth)
+                    res = self.fetch_with_retries(version_url, auth, use_cache=True)
                     if res.status_code == 200:
                         self.dlg.app_logs.appendPlainText(f"Done \n")
                         the_v = json.dumps(res.json())
@@ -3301,7 +4043,7 @@ class AfpolGIS(QObject):
         # clear any initial logs
         self.dlg.app_logs.clear()
         self.dlg.app_logs.appendPlainText(f"Fetching Form Schema...")
-        resp = self.fetch_with_retries(url)
+        resp = self.fetch_with_retries(url, use_cache=True)
         if resp.status_code == 200:
             self.dlg.app_logs.appendPlainText(f"Done \n")
             data = resp.json()
@@ -3319,30 +4061,6 @@ class AfpolGIS(QObject):
             )
             return field_props
 
-    def dataFetch(
-        self, base_url, username, password, form_id, geo_field, fields, page, page_size
-    ):
-        auth = HTTPBasicAuth(username, password=password)
-        url = f"https://{base_url}/api/v1/data/{form_id}.json"
-        params = {"page": page, "page_size": page_size}
-        if self.from_date and self.to_date:
-            params["query"] = json.dumps(
-                {"_submission_time": {"$gte": self.from_date, "$lte": self.to_date}}
-            )
-        self.dlg.app_logs.appendPlainText(f"Fetching Page {page} of geojson data...")
-        response = self.fetch_with_retries(url, auth, params=params)
-        if response.status_code == 200:
-            # Calculate progress
-            self.dlg.app_logs.appendPlainText(f"Done \n")
-            total_pages = math.ceil((int(self.data_count) / int(page_size)))
-            progress = (page / total_pages) * 100 if total_pages > 1 else 100
-            # self.dlg.onaProgressBar.setValue(math.ceil(progress))
-        elif response.status_code in [401, 500, 502, 503]:
-            self.dlg.app_logs.appendPlainText(
-                f"Fetch failed!!! Status Code - {response.status_code}"
-            )
-        return response
-
     def flatten_dict(self, data, parent_key="", sep="/"):
         flattened = {}
 
@@ -3366,191 +4084,68 @@ class AfpolGIS(QObject):
 
         return flattened
 
-    def build_feature_collection(self, filtered_datum, geom, feature_collection):
-        # determine whether polygon or point
-        if geom and geom.__contains__(";") and len(geom.split(";")) > 1:
-            coords_arr = geom.split(";")
-            # this means that it is a polygon
-            # build the correspoing collection
-            coodinates = [
-                [
-                    float(x.strip().split(" ")[1]),
-                    float(x.strip().split(" ")[0]),
-                ]
-                for x in coords_arr
-            ]
-            poly_feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Polygon",
-                    "coordinates": [coodinates],
-                },
-                "properties": filtered_datum,
-            }
-            feature_collection["features"].append(poly_feature)
-        elif geom and not geom.__contains__(";"):
-            # this means its a feature point
-            point_arr = geom.strip().split(" ")
-            point_feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [
-                        float(point_arr[1]),
-                        float(point_arr[0]),
-                    ],
-                },
-                "properties": filtered_datum,
-            }
-            feature_collection["features"].append(point_feature)
-
-    def get_geo_data(self, datum, geom_field, feature_collection):
-        field_keys = datum.keys()
-        flattened_data = self.flatten_dict(datum)
-
-        if geom_field in field_keys:
-            # this means that the geo field is not inside a repeat
-            # build the corresponding geometry/feature collection
-            geom = datum.get(geom_field, "")
-            filtered_datum = {
-                key: value for key, value in flattened_data.items() if key != geom_field
-            }
-            # build feature collection
-            self.build_feature_collection(filtered_datum, geom, feature_collection)
-        else:
-            # flatten the datum
-            repeat_geo_arr = []
-            flattened_data = self.flatten_dict(datum)
-            for k in flattened_data.keys():
-                field_arr = k.split("/")
-                if geom_field in field_arr:
-                    repeat_geo_arr.append(k)
-            if repeat_geo_arr:
-                for f in repeat_geo_arr:
-                    nested_geom = flattened_data.get(f, "")
-                    filtered_datum = {
-                        key: value
-                        for key, value in flattened_data.items()
-                        if f in key.split("/")
-                    }
-                    self.build_feature_collection(
-                        flattened_data, nested_geom, feature_collection
-                    )
-
-    def getTheGeoJson(
-        self,
-        api_url,
-        username,
-        password,
-        formID,
-        geo_field,
-        page_size,
-        page,
-        response=None,
-    ):
-        self.dlg.onaOkButton.setEnabled(False)
-        if page == 1 and not response:
-            self.data_count = self.fetchDataCount(api_url, username, password, formID)
-            response = self.dataFetch(
-                api_url,
-                username,
-                password,
-                formID,
-                geo_field,
-                self.fields,
-                page,
-                page_size,
-            )
-        if response and response.status_code == 200:
-            data = response.json()
-            if len(data) == 0:
-                self.dlg.app_logs.appendPlainText(
-                    "No Data Available For the selected date range"
-                )
-                self.dlg.onaProgressBar.setValue(0)
-                self.dlg.onaOkButton.setEnabled(True)
-                # self.dlg.progress_bar.update()
-                return
+    def build_geo_dataset(self, data, geom_field, dataset):
+        """Adds a batch of records and their geometries to a ColumnarDataset.
 
-            # features_list = data.get("features")
-            # self.features.extend(features_list)
-            self.json_data.extend(data)
-            page = page + 1
-            response = self.dataFetch(
-                api_url,
-                username,
-                password,
-                formID,
-                geo_field,
-                self.fields,
-                page,
-                page_size,
-            )
-            self.getTheGeoJson(
-                api_url,
-                username,
-                password,
-                formID,
-                geo_field,
-                page_size,
-                page,
-                response,
+        The geopoint / geotrace / geoshape strings of all the records are
+        parsed in one pass (see geo_parser) rather than vertex by vertex. A
+        record with the geo field inside a repeat gets one geometry per
+        repeat instance; the dataset leaves a top level geo field out of the
+        feature properties itself.
+        """
+        flattened = [self.flatten_dict(datum) for datum in data]
+        owners = []
+        geo_values = []
+        for index, (datum, flattened_data) in enumerate(zip(data, flattened)):
+            if geom_field in datum:
+                keys = [geom_field]
+            else:
+                # one geometry per repeat instance of the geo field
+                keys = [k for k in flattened_data.keys() if geom_field in k.split("/")]
+            for k in keys:
+                owners.append(index)
+                geo_values.append(flattened_data.get(k, ""))
+
+        geometries = [[] for _ in flattened]
+        for index, geometry in zip(owners, parse_geo_geometries(geo_values)):
+            if geometry:
+                geometries[index].append(geometry)
+
+        for flattened_data, record_geometries in zip(flattened, geometries):
+            dataset.append(flattened_data, record_geometries)
+
+    def write_features_to_layer(self, vlayer, layer_name, features, schema=None):
+        """Appends a page of features to a memory layer and returns the layer.
+
+        features is a ColumnarDataset or a GeoJSON FeatureCollection. The
+        layer is created from the first page; fields showing up in later
+        pages are added as they come (see add_layer_fields).
+        """
+        dataset = as_dataset(features)
+        if vlayer is None:
+            vlayer = QgsVectorLayer(
+                f"{dataset.geometry_type()}?crs=EPSG:4326", f"{layer_name}", "memory"
             )
-        else:
-            if self.json_data:
-                feature_collection = {
-                    "type": "FeatureCollection",
-                    "features": [],
-                }
-                for datum in self.json_data:
-                    self.get_geo_data(datum, geo_field, feature_collection)
+            if not vlayer.isValid():
+                self.iface.messageBar().pushMessage("Failed to load Layer")
+                return None
 
-                if (
-                    feature_collection["features"]
-                    and len(feature_collection["features"]) > 0
-                ):
-                    self.dlg.onaProgressBar.setValue(100)
-                    self.load_data_to_qgis(
-                        feature_collection,
-                        api_url,
-                        username,
-                        password,
-                        formID,
-                        page_size,
-                        geo_field,
-                    )
-                    self.dlg.onaOkButton.setEnabled(True)
-                else:
-                    self.dlg.app_logs.appendPlainText(
-                        "The selected geo field doesn't have geo data"
-                    )
-                    if self.worker:
-                        self.worker.stop()
-                    self.dlg.onaOkButton.setEnabled(True)
-            else:
-                self.dlg.app_logs.appendPlainText(
-                    "No Data Available For the selected date range"
-                )
-                return
+        self.add_layer_fields(vlayer, layer_name, dataset, schema)
+        self.add_features_in_chunks(
+            vlayer.dataProvider(), vlayer.fields(), dataset.iter_features()
+        )
+        return vlayer
 
-        return self.json_data
-        # with open(f"{formID}_{geo_field}", "w") as outfile:
-        #     print("Writting geo data to json file...")
-        #     json.dump(feature_collection, outfile)
+    def add_layer_to_map(self, vlayer, layer_name):
+        vlayer.updateExtents()
+        QgsProject.instance().addMapLayer(vlayer)
+        canvas = self.iface.mapCanvas()
+        canvas.setExtent(vlayer.extent())
+        canvas.refresh()
 
-    def fetch_and_save_data(
-        self, api_url, formID, username, password, geo_field, page_size, directory
-    ):
-        self.getTheGeoJson(
-            api_url,
-            username,
-            password,
-            formID,
-            geo_field,
-            page_size,
-            page=1,
-            response=None,
-        )
+        self.dlg.app_logs.appendPlainText(f"Layer {layer_name} Added Successfully!")
+        if not self.vlayers.get(layer_name):
+            self.vlayers[layer_name] = {"syncData": False, "vlayer": vlayer}
 
     def validate_geojson(self, geojson_data):
         """Validate if the fetched data is a valid GeoJSON."""
@@ -3568,36 +4163,6 @@ class AfpolGIS(QObject):
 
         return True
 
-    def geojson_to_wkt(self, geometry):
-        geom_type = geometry["type"]
-        coords = geometry["coordinates"]
-
-        if geom_type == "Point":
-            return f"POINT ({coords[0]} {coords[1]})"
-
-        elif geom_type == "LineString":
-            coord_str = ", ".join([f"{x} {y}" for x, y in coords])
-            return f"LINESTRING ({coord_str})"
-
-        elif geom_type == "Polygon":
-            rings = []
-            for ring in coords:
-                ring_str = ", ".join([f"{x} {y}" for x, y in ring])
-                rings.append(f"({ring_str})")
-            return f"POLYGON ({', '.join(rings)})"
-
-        elif geom_type == "MultiPolygon":
-            polygons = []
-            for polygon in coords:
-                rings = []
-                for ring in polygon:
-                    ring_str = ", ".join([f"{x} {y}" for x, y in ring])
-                    rings.append(f"({ring_str})")
-                polygons.append(f"({', '.join(rings)})")
-            return f"MULTIPOLYGON ({', '.join(polygons)})"
-        else:
-            raise ValueError(f"Unsupported geometry type: {geom_type}")
-
     def rename_dhis_row_entries(self, row, metadata_items, org_id, indicator_id):
         new_row = []
         for elem in row:
@@ -3663,19 +4228,40 @@ class AfpolGIS(QObject):
         # Add the layer to the QGIS project
         QgsProject.instance().addMapLayer(layer)
 
-    def load_data_to_qgis(self, geojson_data, formID, geo_field):
-        """Load the fetched GeoJSON data into QGIS as a layer."""
+    def load_data_to_qgis(
+        self,
+        geojson_data,
+        formID,
+        geo_field,
+        chunk_size=LOAD_CHUNK_SIZE,
+        schema=None,
+        replace=True,
+        deleted_keys=None,
+    ):
+        """Load the fetched data into QGIS as a layer.
+
+        geojson_data is a ColumnarDataset or a GeoJSON FeatureCollection,
+        which is converted to one. Field types come from the form schema
+        ({field path: QVariant type}) where known and are otherwise inferred
+        from a sample of the values. When the layer is being synced,
+        replace / deleted_keys tell update_layer_data whether geojson_data
+        is a full refresh or a delta.
+        """
+        dataset = None
+        if isinstance(geojson_data, ColumnarDataset) or self.validate_geojson(
+            geojson_data
+        ):
+            dataset = as_dataset(geojson_data)
+
         # validate fetched GeoJSON
-        if not self.validate_geojson(geojson_data):
+        if dataset is None or not dataset.feature_count():
             self.iface.messageBar().pushMessage("Invalid GeoJSON data.")
             return  # Stop if the GeoJSON is invalid
 
         else:
             layer_name = f"{formID}_{geo_field}"
-            features = geojson_data["features"]
-            chunk_size = 10000  # make this configurable
             # Define the layer with the same geometry type and fields as the GeoJSON data
-            feature_type = features[0].get("geometry").get("type")
+            feature_type = dataset.geometry_type()
 
             # Check for existing layer
             existing_layer = None
@@ -3707,35 +4293,28 @@ class AfpolGIS(QObject):
                     and self.vlayers.get(layer_name).get("syncData")
                     and existing_layer
                 ):
-                    self.update_layer_data(layer_name, geojson_data, vlayer)
+                    self.update_layer_data(
+                        layer_name,
+                        dataset,
+                        vlayer,
+                        replace=replace,
+                        deleted_keys=deleted_keys,
+                        chunk_size=chunk_size,
+                        schema=schema,
+                    )
                 elif (
                     not self.vlayers.get(layer_name)
                     or not self.vlayers.get(layer_name).get("syncData")
                 ) and not existing_layer:
-                    # Start editing to add fields and features
-                    vlayer.startEditing()
-                    prop_keys = [
-                        QgsField(f"{prop}", QVariant.String)
-                        for prop in features[0].get("properties").keys()
-                    ]
-                    pr.addAttributes(prop_keys)  # Add fields as needed
-                    vlayer.updateFields()
-
-                    # Add features to the layer
-                    for feature in features:
-                        new_feature = QgsFeature(vlayer.fields())
-                        # Convert GeoJSON geometry to WKT
-                        geometry_wkt = self.geojson_to_wkt(feature["geometry"])
-                        geometry = QgsGeometry.fromWkt(geometry_wkt)
-                        if geometry:
-                            new_feature.setGeometry(geometry)
-                        new_feature.setAttributes(
-                            list(feature.get("properties").values())
-                        )  # Adjust based on properties
-                        pr.addFeatures([new_feature])
-
-                    # Commit changes and add to project
-                    vlayer.commitChanges()
+                    self.add_layer_fields(vlayer, layer_name, dataset, schema)
+
+                    # Write the features straight to the provider in chunks
+                    self.add_features_in_chunks(
+                        pr, vlayer.fields(), dataset.iter_features(), chunk_size
+                    )
+                    vlayer.updateExtents()
+
+                    # add to project
 
                     QgsProject.instance().addMapLayer(vlayer)
                     canvas = self.iface.mapCanvas()
@@ -3755,55 +4334,118 @@ class AfpolGIS(QObject):
                     if not self.vlayers.get(layer_name):
                         self.vlayers[layer_name] = {"syncData": False, "vlayer": vlayer}
 
-    def update_layer_data(self, layer_name, geojson_data, vlayer):
-        """Fetch new data and update the existing layer in QGIS."""
+    def update_layer_data(
+        self,
+        layer_name,
+        geojson_data,
+        vlayer,
+        replace=True,
+        deleted_keys=None,
+        chunk_size=LOAD_CHUNK_SIZE,
+        schema=None,
+    ):
+        """Fetch new data and update the existing layer in QGIS.
+
+        Features are matched on their submission key and only changed
+        attributes / geometries are written, new features added. With
+        replace, geojson_data is a full refresh: every feature of the layer
+        is compared and those no longer present are deleted. Otherwise it is
+        a delta and only the features of the incoming submissions are looked
+        up, by a filter on the layer's id field; deleted_keys lists the
+        submission ids to remove. Changes go to the data provider in bulk,
+        bypassing the edit buffer and undo stack. geojson_data is a
+        ColumnarDataset or a GeoJSON FeatureCollection.
+        """
+        dataset = as_dataset(geojson_data)
         layers = QgsProject.instance().mapLayersByName(layer_name)
 
         if layers:
             vlayer = layers[0]
-            vlayer.startEditing()
-
-            # Collect all unique property keys from the new data
-            all_property_keys = set()
-            for feature_data in geojson_data["features"]:
-                all_property_keys.update(feature_data.get("properties", {}).keys())
+            pr = vlayer.dataProvider()
 
             # Ensure layer fields include all property keys
-            layer_fields = [field.name() for field in vlayer.fields()]
-            for key in all_property_keys:
-                if key not in layer_fields:
-                    # Add missing fields dynamically
-                    vlayer.addAttribute(
-                        QgsField(key, QVariant.String)
-                    )  # Adjust type if needed
-                    layer_fields.append(key)
-
-            vlayer.updateFields()  # Refresh the field structure
-
-            # Delete existing features
-            vlayer.deleteFeatures([feature.id() for feature in vlayer.getFeatures()])
+            self.add_layer_fields(vlayer, layer_name, dataset, schema)
+            layer_fields = vlayer.fields().names()
+            layer_field_types = [field.type() for field in vlayer.fields()]
+
+            key_field = self.layer_key_field(vlayer)
+            incoming_keys = dataset.feature_keys()
+            if replace or key_field is None:
+                existing_features = list(vlayer.getFeatures())
+            else:
+                # the bare ids are among the keys, the numbered repeat keys
+                # just match nothing
+                existing_features = list(
+                    self.layer_features_by_key(vlayer, key_field, set(incoming_keys))
+                )
+            existing_keys = submission_keys(
+                [
+                    dict(zip(layer_fields, self.layer_attribute_values(feature)))
+                    for feature in existing_features
+                ]
+            )
+            existing = dict(zip(existing_keys, existing_features))
 
-            # Load new features
-            for feature_data in geojson_data["features"]:
-                new_feature = QgsFeature(vlayer.fields())
+            attribute_changes = dict()
+            geometry_changes = dict()
+            new_features = []
 
-                # Set geometry
-                geometry_wkt = self.geojson_to_wkt(feature_data["geometry"])
-                geometry = QgsGeometry.fromWkt(geometry_wkt)
-                if geometry:
-                    new_feature.setGeometry(geometry)
+            for key, feature_data in zip(incoming_keys, dataset.iter_features()):
+                old_feature = existing.pop(key, None)
+                if old_feature is None:
+                    new_features.append(feature_data)
+                    continue
 
-                # Align attributes with updated fields
                 properties = feature_data.get("properties", {})
                 attributes = [
-                    properties.get(field_name, None) for field_name in layer_fields
+                    convert_value(properties.get(field_name, None), field_type)
+                    for field_name, field_type in zip(layer_fields, layer_field_types)
                 ]
-                new_feature.setAttributes(attributes)
+                geometry = build_geometry(feature_data["geometry"])
 
-                vlayer.addFeature(new_feature)
+                old_attributes = self.layer_attribute_values(old_feature)
+                changed = {
+                    idx: value
+                    for idx, value in enumerate(attributes)
+                    if old_attributes[idx] != value
+                }
+                if changed:
+                    attribute_changes[old_feature.id()] = changed
+                if geometry and not geometry.equals(old_feature.geometry()):
+                    geometry_changes[old_feature.id()] = geometry
+
+            removed_ids = set()
+            if replace or key_field is not None:
+                # features missing from a full refresh, or repeat rows an
+                # edited submission of the delta no longer has
+                removed_ids.update(feature.id() for feature in existing.values())
+            if deleted_keys and key_field is not None:
+                removed_ids.update(
+                    feature.id()
+                    for feature in self.layer_features_by_key(
+                        vlayer, key_field, deleted_keys
+                    )
+                )
 
-            # Commit changes and refresh the layer
-            vlayer.commitChanges()
+            if removed_ids:
+                pr.deleteFeatures(list(removed_ids))
+            if attribute_changes:
+                pr.changeAttributeValues(attribute_changes)
+            if geometry_changes:
+                pr.changeGeometryValues(geometry_changes)
+            if new_features:
+                self.add_features_in_chunks(
+                    pr, vlayer.fields(), new_features, chunk_size
+                )
+
+            self.dlg.app_logs.appendPlainText(
+                f"{len(new_features)} added, "
+                f"{len(set(attribute_changes) | set(geometry_changes))} changed, "
+                f"{len(removed_ids)} removed"
+            )
+
+            # Refresh the layer
+            vlayer.updateExtents()
             vlayer.triggerRepaint()
 
             # Zoom to the updated layer
@@ -3825,6 +4467,165 @@ class AfpolGIS(QObject):
                 duration=10,
             )
 
+    def add_layer_fields(self, vlayer, layer_name, dataset, schema=None):
+        """Adds the fields of a dataset missing from a layer.
+
+        Their types come from the schema or are inferred (see
+        ColumnarDataset.field_types); layer fields whose type cannot hold
+        the dataset's values are widened.
+        """
+        field_types = dataset.field_types(schema)
+
+        # Layer fields keep their type unless new values do not fit it
+        existing_types = {
+            field.name(): field.type()
+            for field in vlayer.fields()
+            if field.name() in field_types
+        }
+        widened = self.widen_field_types(layer_name, dataset, existing_types)
+        if widened:
+            self.widen_layer_fields(vlayer, widened)
+
+        missing_types = {
+            key: field_type
+            for key, field_type in field_types.items()
+            if key not in existing_types
+        }
+        missing_types.update(self.widen_field_types(layer_name, dataset, missing_types))
+        if missing_types:
+            vlayer.dataProvider().addAttributes(
+                [QgsField(key, field_type) for key, field_type in missing_types.items()]
+            )
+            vlayer.updateFields()  # Refresh the field structure
+
+    def widen_field_types(self, layer_name, dataset, field_types):
+        """Returns the widened types of the fields holding values that do not
+        fit their type in field_types, and logs each of them.
+        """
+        widened = dataset.widened_field_types(field_types)
+        for name, field_type in widened.items():
+            message = (
+                f"{layer_name}: {name} has values that are not "
+                f"{QVariant.typeToName(field_types[name])}, "
+                f"stored as {QVariant.typeToName(field_type)}"
+            )
+            self.dlg.app_logs.appendPlainText(message)
+            QgsMessageLog.logMessage(message, "AfpolGIS", Qgis.Warning)
+        return widened
+
+    def widen_layer_fields(self, vlayer, widened):
+        """Changes the type of layer fields ({name: type}), keeping their
+        values.
+
+        The data provider cannot change the type of a field, so it is added
+        again (as the last field) and its converted values copied over.
+        """
+        pr = vlayer.dataProvider()
+        for name, field_type in widened.items():
+            index = vlayer.fields().indexOf(name)
+            request = QgsFeatureRequest().setSubsetOfAttributes([index])
+            request.setFlags(QgsFeatureRequest.NoGeometry)
+            values = {
+                feature.id(): self.layer_attribute_value(feature.attributes()[index])
+                for feature in vlayer.getFeatures(request)
+            }
+
+            pr.deleteAttributes([index])
+            vlayer.updateFields()
+            pr.addAttributes([QgsField(name, field_type)])
+            vlayer.updateFields()
+
+            index = vlayer.fields().indexOf(name)
+            changes = {
+                fid: {index: convert_value(value, field_type)}
+                for fid, value in values.items()
+                if value is not None
+            }
+            if changes:
+                pr.changeAttributeValues(changes)
+
+    def layer_key_field(self, vlayer):
+        """Returns the layer field holding the submission ids, if any."""
+        field_names = vlayer.fields().names()
+        return next((key for key in SUBMISSION_ID_KEYS if key in field_names), None)
+
+    def layer_features_by_key(self, vlayer, key_field, keys):
+        """Yields the features whose key_field holds one of keys.
+
+        The keys are looked up KEY_FILTER_CHUNK_SIZE at a time with an IN
+        filter, so only the matching features are read from the layer.
+        """
+        field_type = vlayer.fields().field(key_field).type()
+        column = QgsExpression.quotedColumnRef(key_field)
+        keys = list(keys)
+        for start in range(0, len(keys), KEY_FILTER_CHUNK_SIZE):
+            values = [
+                convert_value(key, field_type)
+                for key in keys[start : start + KEY_FILTER_CHUNK_SIZE]
+            ]
+            values = [QgsExpression.quotedValue(v) for v in values if v is not None]
+            if not values:
+                continue
+            request = QgsFeatureRequest().setFilterExpression(
+                f"{column} IN ({', '.join(values)})"
+            )
+            yield from vlayer.getFeatures(request)
+
+    def add_features_in_chunks(
+        self, provider, fields, features, chunk_size=LOAD_CHUNK_SIZE
+    ):
+        """Builds QgsFeatures from GeoJSON features (any iterable) chunk by
+        chunk and adds each chunk to the data provider in a single call.
+
+        Writing to the provider directly skips the edit buffer, so the layer
+        must not be committed afterwards. Returns the number of features added.
+        """
+        field_names = fields.names()
+        field_types = [field.type() for field in fields]
+        chunk_size = max(1, int(chunk_size or LOAD_CHUNK_SIZE))
+        features = iter(features)
+        added = 0
+        start = 0
+
+        while True:
+            chunk = []
+            for feature_data in itertools.islice(features, chunk_size):
+                new_feature = QgsFeature(fields)
+                geometry = build_geometry(feature_data["geometry"])
+                if geometry:
+                    new_feature.setGeometry(geometry)
+                properties = feature_data.get("properties", {})
+                new_feature.setAttributes(
+                    [
+                        convert_value(properties.get(field_name), field_type)
+                        for field_name, field_type in zip(field_names, field_types)
+                    ]
+                )
+                chunk.append(new_feature)
+
+            if not chunk:
+                break
+
+            ok, _ = provider.addFeatures(chunk)
+            if ok:
+                added += len(chunk)
+            else:
+                self.dlg.app_logs.appendPlainText(
+                    f"Failed to add features {start + 1} to {start + len(chunk)}"
+                )
+            start += len(chunk)
+
+        return added
+
+    def layer_attribute_value(self, value):
+        """Returns a layer attribute with NULL variants as None."""
+        if value is None or (isinstance(value, QVariant) and value.isNull()):
+            return None
+        return value
+
+    def layer_attribute_values(self, feature):
+        return [self.layer_attribute_value(value) for value in feature.attributes()]
+
     # stop workers if they are running
     def stop_workers(self):
         if hasattr(self, "ona_worker") and self.ona_worker.isRunning():
@@ -3866,6 +4667,8 @@ class AfpolGIS(QObject):
         if self.odk_sync_timer.isActive():
             self.odk_sync_timer.stop()
 
+        self.fetch_jobs.cancel("odk")
+
         self.dlg.app_logs.clear()
         self.dlg.odkProgressBar.setValue(0)
 
@@ -3877,6 +4680,8 @@ class AfpolGIS(QObject):
         if self.kobo_sync_timer.isActive():
             self.kobo_sync_timer.stop()
 
+        self.fetch_jobs.cancel("kobo")
+
         self.dlg.app_logs.clear()
         self.dlg.koboPorgressBar.setValue(0)
 
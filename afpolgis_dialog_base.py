@@ -729,7 +729,7 @@ class Ui_AfpolGISDialogBase(object):
             3, QtWidgets.QFormLayout.FieldRole, self.btnFetchDhisCategory
         )
         self.formGroup_7 = QtWidgets.QGroupBox(self.tab_6)
-        self.formGroup_7.setGeometry(QtCore.QRect(10, 200, 741, 201))
+        self.formGroup_7.setGeometry(QtCore.QRect(10, 200, 741, 226))
         self.formGroup_7.setObjectName("formGroup_7")
         self.formLayout_8 = QtWidgets.QFormLayout(self.formGroup_7)
         self.formLayout_8.setObjectName("formLayout_8")
@@ -752,7 +752,7 @@ class Ui_AfpolGISDialogBase(object):
         self.label_5 = QtWidgets.QLabel(self.formGroup_7)
         self.label_5.setObjectName("label_5")
         self.formLayout_8.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.label_5)
-        self.comboDhisIndicators = QtWidgets.QComboBox(self.formGroup_7)
+        self.comboDhisIndicators = QgsCheckableComboBox(self.formGroup_7)
         self.comboDhisIndicators.setObjectName("comboDhisIndicators")
         self.formLayout_8.setWidget(
             3, QtWidgets.QFormLayout.FieldRole, self.comboDhisIndicators
@@ -760,11 +760,21 @@ class Ui_AfpolGISDialogBase(object):
         self.label_7 = QtWidgets.QLabel(self.formGroup_7)
         self.label_7.setObjectName("label_7")
         self.formLayout_8.setWidget(4, QtWidgets.QFormLayout.LabelRole, self.label_7)
-        self.comboDhisPeriod = QtWidgets.QComboBox(self.formGroup_7)
+        self.comboDhisPeriod = QgsCheckableComboBox(self.formGroup_7)
         self.comboDhisPeriod.setObjectName("comboDhisPeriod")
         self.formLayout_8.setWidget(
             4, QtWidgets.QFormLayout.FieldRole, self.comboDhisPeriod
         )
+        self.labelDhisAggregation = QtWidgets.QLabel(self.formGroup_7)
+        self.labelDhisAggregation.setObjectName("labelDhisAggregation")
+        self.formLayout_8.setWidget(
+            5, QtWidgets.QFormLayout.LabelRole, self.labelDhisAggregation
+        )
+        self.comboDhisAggregation = QtWidgets.QComboBox(self.formGroup_7)
+        self.comboDhisAggregation.setObjectName("comboDhisAggregation")
+        self.formLayout_8.setWidget(
+            5, QtWidgets.QFormLayout.FieldRole, self.comboDhisAggregation
+        )
         self.ComboDhisCategory = QtWidgets.QComboBox(self.formGroup_7)
         self.ComboDhisCategory.setObjectName("ComboDhisCategory")
         self.formLayout_8.setWidget(
@@ -969,6 +979,9 @@ class Ui_AfpolGISDialogBase(object):
         )
         self.label_5.setText(_translate("AfpolGISDialogBase", "Select Indicator"))
         self.label_7.setText(_translate("AfpolGISDialogBase", "Period"))
+        self.labelDhisAggregation.setText(
+            _translate("AfpolGISDialogBase", "Aggregation")
+        )
         self.label_10.setText(_translate("AfpolGISDialogBase", "Select Category"))
         self.dhisCancelButton.setText(_translate("AfpolGISDialogBase", "Cancel"))
         self.dhisOkButton.setText(_translate("AfpolGISDialogBase", "Load Data To Map"))
@@ -991,5 +1004,6 @@ class Ui_AfpolGISDialogBase(object):
         )
 
 
+from qgis.gui import QgsCheckableComboBox
 from qgspasswordlineedit import QgsPasswordLineEdit
 from qgsspinbox import QgsSpinBox
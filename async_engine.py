@@ -0,0 +1,174 @@
+import asyncio
+
+import httpx
+import qasync
+
+from PyQt5.QtCore import QCoreApplication
+from qgis.core import Qgis, QgsMessageLog
+
+from .http_client import credentials_key
+
+# Maximum number of requests in flight per engine
+MAX_CONCURRENT_REQUESTS = 20
+# Idle keep-alive connections kept per engine
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+_qt_loop = None
+
+
+def get_event_loop():
+    """Returns the asyncio loop driven by the (already running) Qt event loop.
+
+    QGIS owns the Qt event loop, so the qasync loop is created in
+    "already running" mode and coroutines are advanced by Qt itself.
+    """
+    global _qt_loop
+    if _qt_loop is None or _qt_loop.is_closed():
+        _qt_loop = qasync.QEventLoop(QCoreApplication.instance(), already_running=True)
+        asyncio.set_event_loop(_qt_loop)
+    return _qt_loop
+
+
+def to_httpx_auth(auth):
+    if auth is None:
+        return None
+    if isinstance(auth, tuple):
+        return httpx.BasicAuth(*auth)
+    if hasattr(auth, "username") and hasattr(auth, "password"):
+        return httpx.BasicAuth(auth.username, auth.password)
+    return auth
+
+
+class AsyncFetchEngine:
+    """Asyncio based fetch engine shared by the connectors.
+
+    Requests are multiplexed over one keep-alive pool per set of credentials,
+    with at most max_concurrency requests in flight, so many requests can run
+    at once without an OS thread each.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=MAX_CONCURRENT_REQUESTS,
+        timeout=60,
+        max_retries=5,
+        backoff_factor=0.2,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.clients = dict()
+        self.tasks = set()
+        self.semaphore = None
+
+    def client_for(self, auth=None):
+        key = credentials_key(auth)
+        client = self.clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                auth=to_httpx_auth(auth),
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+            self.clients[key] = client
+        return client
+
+    async def fetch(self, url, auth=None, params=None, headers=None):
+        """Fetches a url with retries and exponential backoff."""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        client = self.client_for(auth)
+        for attempt in range(self.max_retries):
+            try:
+                async with self.semaphore:
+                    return await client.get(url, params=params, headers=headers)
+            except httpx.TransportError as e:
+                QgsMessageLog.logMessage(
+                    f"Attempt {attempt + 1} for {url} failed: {e}",
+                    "AfpolGIS",
+                    Qgis.Warning,
+                )
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.backoff_factor * (2**attempt))
+                else:
+                    raise
+
+    async def fetch_json(self, url, auth=None, params=None, headers=None):
+        response = await self.fetch(url, auth, params, headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_all(self, requests):
+        """Fetches many requests concurrently.
+
+        Each request is a dict of fetch() keyword arguments. Responses are
+        returned in request order; failed requests yield their exception.
+        """
+        return await asyncio.gather(
+            *[self.fetch(**request) for request in requests],
+            return_exceptions=True,
+        )
+
+    def submit(self, coro, on_done=None, on_error=None):
+        """Schedules a coroutine on the Qt driven loop.
+
+        on_done receives the result and on_error the error message, both on
+        the main thread, so they can safely update the UI.
+        """
+        loop = get_event_loop()
+        task = loop.create_task(coro)
+
+        def task_finished(task):
+            self.tasks.discard(task)
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error:
+                if on_error:
+                    on_error(str(error))
+            elif on_done:
+                on_done(task.result())
+
+        self.tasks.add(task)
+        task.add_done_callback(task_finished)
+        return task
+
+    def cancel_all(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+    async def aclose(self):
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def close(self):
+        self.cancel_all()
+        if self.clients:
+            get_event_loop().create_task(self.aclose())
+
+
+def run_blocking(coro_factory, max_concurrency=MAX_CONCURRENT_REQUESTS, **options):
+    """Runs engine work to completion from a worker thread.
+
+    coro_factory receives a fresh AsyncFetchEngine bound to a private event
+    loop and returns the coroutine to run, e.g.
+    run_blocking(lambda engine: engine.fetch_all(requests)). options are
+    passed on to the engine (timeout, max_retries, backoff_factor).
+    """
+
+    async def runner():
+        engine = AsyncFetchEngine(max_concurrency=max_concurrency, **options)
+        try:
+            return await coro_factory(engine)
+        finally:
+            await engine.aclose()
+
+    return asyncio.run(runner())
@@ -0,0 +1,361 @@
+import csv
+import json
+from array import array
+
+import numpy as np
+
+from .field_types import INFERENCE_SAMPLE_SIZE, combine_types, value_type, widen_type
+from .submission_store import SUBMISSION_ID_KEYS, submission_id
+
+# Compact, column oriented storage for the submissions of a fetch.
+#
+# A fetch used to keep the raw JSON, a flattened dict per record (CSV
+# export), a GeoJSON FeatureCollection and the layer features alive at the
+# same time. A ColumnarDataset replaces the first three: every field is a
+# dictionary encoded column (one int32 code per row, each distinct value
+# stored once) and all the geometries share flat coordinate / offset
+# buffers. Records and GeoJSON features are rebuilt on the fly, one at a
+# time, for the readers (layer loading, sync diffing, CSV export, store).
+
+GEOMETRY_TYPES = (
+    "Point",
+    "LineString",
+    "Polygon",
+    "MultiPoint",
+    "MultiLineString",
+    "MultiPolygon",
+)
+GEOMETRY_TYPE_CODES = {name: code for code, name in enumerate(GEOMETRY_TYPES)}
+
+
+class DictionaryColumn:
+    """A field stored as per-row codes into the table of its distinct values."""
+
+    __slots__ = ("codes", "values", "index")
+
+    def __init__(self, rows=0):
+        # -1 marks a missing / null value
+        self.codes = array("i", [-1]) * rows
+        self.values = []
+        self.index = dict()
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+
+        # keep True, 1 and 1.0 apart, they hash alike
+        key = value if value.__class__ is str else (value.__class__, value)
+        try:
+            code = self.index.get(key)
+        except TypeError:
+            # lists / dicts left in a record
+            key = (value.__class__, json.dumps(value, sort_keys=True, default=str))
+            code = self.index.get(key)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.index[key] = code
+        self.codes.append(code)
+
+    def get(self, row):
+        code = self.codes[row]
+        return None if code < 0 else self.values[code]
+
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes)
+
+
+class GeometryBuffer:
+    """Stores GeoJSON geometries in flat buffers.
+
+    Every geometry is a list of parts (polygons, lines or points), every
+    part a list of rings (coordinate lists) and every ring a run of [x, y]
+    vertices in the shared coordinate buffer, i.e. the MultiPolygon layout
+    which all the GeoJSON types fit in. Only X/Y are kept.
+    """
+
+    def __init__(self):
+        self.types = array("b")
+        self.coordinates = array("d")  # x0, y0, x1, y1, ...
+        self.ring_ends = array("q")  # vertex count at the end of each ring
+        self.part_ends = array("q")  # ring count at the end of each part
+        self.geometry_ends = array("q")  # part count at the end of each geometry
+
+    def __len__(self):
+        return len(self.types)
+
+    def append(self, geometry):
+        geometry_type = geometry.get("type")
+        code = GEOMETRY_TYPE_CODES.get(geometry_type)
+        if code is None:
+            raise ValueError(f"Unsupported geometry type: {geometry_type}")
+
+        coordinates = geometry.get("coordinates")
+        if geometry_type == "Point":
+            parts = [[[coordinates]]]
+        elif geometry_type == "LineString":
+            parts = [[coordinates]]
+        elif geometry_type == "Polygon":
+            parts = [coordinates]
+        elif geometry_type == "MultiPoint":
+            parts = [[[point]] for point in coordinates]
+        elif geometry_type == "MultiLineString":
+            parts = [[line] for line in coordinates]
+        else:
+            parts = coordinates
+
+        for rings in parts:
+            for ring in rings:
+                self.append_ring(ring)
+            self.part_ends.append(len(self.ring_ends))
+        self.geometry_ends.append(len(self.part_ends))
+        self.types.append(code)
+
+    def append_ring(self, ring):
+        try:
+            vertices = np.asarray(ring, dtype=np.float64)
+        except ValueError:
+            # ragged input, e.g. vertices with and without Z
+            vertices = np.array([vertex[:2] for vertex in ring], dtype=np.float64)
+        vertices = np.ascontiguousarray(vertices.reshape(-1, vertices.shape[-1])[:, :2])
+        self.coordinates.frombytes(vertices.tobytes())
+        self.ring_ends.append(len(self.coordinates) // 2)
+
+    def ring(self, index):
+        start = self.ring_ends[index - 1] if index else 0
+        end = self.ring_ends[index]
+        return np.frombuffer(
+            self.coordinates[2 * start : 2 * end], dtype=np.float64
+        ).reshape(-1, 2)
+
+    def part(self, index):
+        start = self.part_ends[index - 1] if index else 0
+        return [self.ring(ring) for ring in range(start, self.part_ends[index])]
+
+    def get(self, index):
+        """Returns geometry index as a GeoJSON dict with NumPy coordinates."""
+        geometry_type = GEOMETRY_TYPES[self.types[index]]
+        start = self.geometry_ends[index - 1] if index else 0
+        parts = [self.part(part) for part in range(start, self.geometry_ends[index])]
+
+        if geometry_type == "Point":
+            coordinates = parts[0][0][0]
+        elif geometry_type == "LineString":
+            coordinates = parts[0][0]
+        elif geometry_type == "Polygon":
+            coordinates = parts[0]
+        elif geometry_type == "MultiPoint":
+            coordinates = [rings[0][0] for rings in parts]
+        elif geometry_type == "MultiLineString":
+            coordinates = [rings[0] for rings in parts]
+        else:
+            coordinates = parts
+        return {"type": geometry_type, "coordinates": coordinates}
+
+    def nbytes(self):
+        return sum(
+            buffer.itemsize * len(buffer)
+            for buffer in (
+                self.types,
+                self.coordinates,
+                self.ring_ends,
+                self.part_ends,
+                self.geometry_ends,
+            )
+        )
+
+
+class ColumnarDataset:
+    """The records of a fetch and their geometries, stored column by column.
+
+    A row is a (flattened) record with zero or more geometries; every
+    geometry makes a GeoJSON feature whose properties are the row, without
+    geometry_field when the geo answer sits at the top level of the record.
+    """
+
+    def __init__(self, geometry_field=None):
+        self.geometry_field = geometry_field
+        self.columns = dict()
+        self.row_count = 0
+        self.row_geometry_ends = array("q")  # geometry count at the end of each row
+        self.geometries = GeometryBuffer()
+
+    def __len__(self):
+        return self.row_count
+
+    def append(self, record, geometries=()):
+        """Adds a record and its GeoJSON geometries (None entries skipped)."""
+        row = self.row_count
+        columns = self.columns
+        for name, value in record.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = DictionaryColumn(row)
+            column.append(value)
+        # fields missing from this record
+        for column in columns.values():
+            if len(column.codes) == row:
+                column.codes.append(-1)
+
+        for geometry in geometries:
+            if geometry:
+                self.geometries.append(geometry)
+        self.row_geometry_ends.append(len(self.geometries))
+        self.row_count += 1
+
+    def extend_features(self, features):
+        """Adds GeoJSON features, one row per feature."""
+        for feature in features:
+            self.append(feature.get("properties") or {}, [feature.get("geometry")])
+
+    @classmethod
+    def from_feature_collection(cls, feature_collection, geometry_field=None):
+        dataset = cls(geometry_field)
+        dataset.extend_features(feature_collection.get("features") or [])
+        return dataset
+
+    @classmethod
+    def from_store_rows(cls, rows, geometry_field=None):
+        """Builds a dataset from SubmissionStore.iter_rows()."""
+        dataset = cls(geometry_field)
+        for _, record, features in rows:
+            dataset.append(record, [feature.get("geometry") for feature in features])
+        return dataset
+
+    def field_names(self):
+        return list(self.columns)
+
+    def feature_field_names(self):
+        return [name for name in self.columns if name != self.geometry_field]
+
+    def feature_count(self):
+        return len(self.geometries)
+
+    def geometry_type(self, index=0):
+        return GEOMETRY_TYPES[self.geometries.types[index]]
+
+    def record(self, row):
+        record = dict()
+        for name, column in self.columns.items():
+            code = column.codes[row]
+            if code >= 0:
+                record[name] = column.values[code]
+        return record
+
+    def iter_records(self):
+        for row in range(self.row_count):
+            yield self.record(row)
+
+    def feature_properties(self, row):
+        properties = self.record(row)
+        properties.pop(self.geometry_field, None)
+        return properties
+
+    def row_geometry_range(self, row):
+        start = self.row_geometry_ends[row - 1] if row else 0
+        return range(start, self.row_geometry_ends[row])
+
+    def iter_features(self):
+        """Yields the GeoJSON features, built one at a time."""
+        for row in range(self.row_count):
+            indexes = self.row_geometry_range(row)
+            if not indexes:
+                continue
+            properties = self.feature_properties(row)
+            for index in indexes:
+                yield {
+                    "type": "Feature",
+                    "geometry": self.geometries.get(index),
+                    "properties": properties,
+                }
+
+    def feature_keys(self):
+        """Returns the submission key of every feature, see submission_keys.
+
+        Ids are read straight from the id columns; records without any of
+        them fall back to the content hash of their properties.
+        """
+        id_columns = [
+            self.columns[key] for key in SUBMISSION_ID_KEYS if key in self.columns
+        ]
+        seen = dict()
+        keys = []
+        for row in range(self.row_count):
+            indexes = self.row_geometry_range(row)
+            if not indexes:
+                continue
+            key = None
+            for column in id_columns:
+                value = column.get(row)
+                if value not in (None, ""):
+                    key = str(value)
+                    break
+            if key is None:
+                key = submission_id(self.feature_properties(row))
+            for _ in indexes:
+                count = seen.get(key, 0)
+                seen[key] = count + 1
+                keys.append(f"{key}#{count}" if count else key)
+        return keys
+
+    def field_types(self, schema=None, sample_size=INFERENCE_SAMPLE_SIZE):
+        """Returns an ordered {field name: QVariant type} for the features.
+
+        Like field_types.infer_field_types, but sampling the distinct values
+        of each column rather than the first records.
+        """
+        schema = schema or dict()
+        return {
+            name: schema.get(name)
+            or combine_types(
+                {
+                    value_type(value)
+                    for value in self.columns[name].values[:sample_size]
+                    if value != ""
+                }
+            )
+            for name in self.feature_field_names()
+        }
+
+    def widened_field_types(self, field_types):
+        """Returns {field name: widened type} for the fields of field_types
+        holding values that do not fit their type, see widen_type.
+
+        Every distinct value is checked, including those past the sample
+        the types were inferred from.
+        """
+        widened = dict()
+        for name, field_type in field_types.items():
+            column = self.columns.get(name)
+            if column is None:
+                continue
+            new_type = widen_type(field_type, column.values)
+            if new_type != field_type:
+                widened[name] = new_type
+        return widened
+
+    def write_csv(self, path):
+        names = self.field_names()
+        columns = [self.columns[name] for name in names]
+        with open(path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(names)
+            for row in range(self.row_count):
+                values = [column.get(row) for column in columns]
+                writer.writerow(["" if value is None else value for value in values])
+
+    def nbytes(self):
+        """Approximate size of the encoded data, without the distinct values."""
+        return (
+            sum(column.nbytes() for column in self.columns.values())
+            + self.row_geometry_ends.itemsize * len(self.row_geometry_ends)
+            + self.geometries.nbytes()
+        )
+
+
+def as_dataset(data, geometry_field=None):
+    """Returns data as a ColumnarDataset, converting FeatureCollection dicts."""
+    if isinstance(data, ColumnarDataset):
+        return data
+    return ColumnarDataset.from_feature_collection(data, geometry_field)
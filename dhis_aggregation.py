@@ -0,0 +1,112 @@
+from operator import itemgetter
+
+import numpy as np
+
+# Aggregates DHIS2 analytics rows ([dx, ou, pe, value, selected period], see
+# AfpolGIS.fetch_dhis_analytics) per org unit, indicator and selected period
+# with NumPy: the identifiers are factorized to integer codes once and every
+# group is reduced over the sorted value array, instead of updating a dict
+# entry per row in Python. Relative periods (LAST_12_MONTHS, THIS_YEAR, ...)
+# resolve to many rows per group, which is where the reduction applies.
+
+AGGREGATIONS = ("sum", "mean", "last", "min", "max")
+DEFAULT_AGGREGATION = "sum"
+
+
+def factorize(values):
+    """Returns (uniques, codes) with values == uniques[codes]."""
+    index = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    codes = np.fromiter(map(index.__getitem__, values), np.int64, len(values))
+    return list(index), codes
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def to_values(values):
+    """Converts analytics values to floats, NaN where not numeric."""
+    try:
+        return np.fromiter(map(float, values), np.float64, len(values))
+    except (TypeError, ValueError):
+        return np.fromiter(map(to_float, values), np.float64, len(values))
+
+
+def aggregate_rows(rows, method=DEFAULT_AGGREGATION, period_order=None):
+    """Groups analytics rows by (ou, dx, selected period) and reduces them.
+
+    period_order lists the resolved period ids in chronological order, as
+    in metaData.dimensions.pe; "last" takes the latest period of a group
+    (the last row of the group when a period is not listed). Non numeric
+    values are ignored.
+
+    Returns a list of (ou, dx, selected period, value) tuples, one per
+    group, in order of first appearance.
+    """
+    if method not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation: {method}")
+    if not rows:
+        return []
+
+    org_units, ou_codes = factorize(list(map(itemgetter(1), rows)))
+    indicators, dx_codes = factorize(list(map(itemgetter(0), rows)))
+    periods, pe_codes = factorize(list(map(itemgetter(4), rows)))
+    values = to_values(list(map(itemgetter(3), rows)))
+
+    keys = (ou_codes * len(indicators) + dx_codes) * len(periods) + pe_codes
+    valid = ~np.isnan(values)
+    keys, values = keys[valid], values[valid]
+    if not len(keys):
+        return []
+
+    if method == "last":
+        rank = np.arange(len(rows), dtype=np.int64)[valid]
+        if period_order:
+            period_rank = {period: i for i, period in enumerate(period_order)}
+            resolved = [row[2] for row, keep in zip(rows, valid) if keep]
+            # unlisted periods after the listed ones, in row order
+            rank = np.array(
+                [period_rank.get(period, len(period_rank)) for period in resolved],
+                dtype=np.int64,
+            ) * len(rows) + rank
+        # sort by key, then rank, so the last row of each run is the latest
+        order = np.lexsort((rank, keys))
+    else:
+        order = np.argsort(keys, kind="stable")
+
+    sorted_keys = keys[order]
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+
+    if method == "sum":
+        reduced = np.add.reduceat(sorted_values, starts)
+    elif method == "mean":
+        counts = np.diff(np.r_[starts, len(sorted_values)])
+        reduced = np.add.reduceat(sorted_values, starts) / counts
+    elif method == "min":
+        reduced = np.minimum.reduceat(sorted_values, starts)
+    elif method == "max":
+        reduced = np.maximum.reduceat(sorted_values, starts)
+    else:
+        reduced = sorted_values[np.r_[starts[1:], len(sorted_values)] - 1]
+
+    group_keys = sorted_keys[starts]
+    # back to the order in which the groups first appear in the rows
+    first_seen = np.minimum.reduceat(order, starts)
+    group_order = np.argsort(first_seen, kind="stable")
+
+    pe_index = group_keys % len(periods)
+    dx_index = (group_keys // len(periods)) % len(indicators)
+    ou_index = group_keys // (len(periods) * len(indicators))
+    return [
+        (org_units[ou], indicators[dx], periods[pe], value)
+        for ou, dx, pe, value in zip(
+            ou_index[group_order].tolist(),
+            dx_index[group_order].tolist(),
+            pe_index[group_order].tolist(),
+            reduced[group_order].tolist(),
+        )
+    ]
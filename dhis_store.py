@@ -0,0 +1,307 @@
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# How long the geoFeatures of an org unit level are reused, in seconds
+GEO_FEATURES_TTL = 24 * 60 * 60
+
+# How long the org unit hierarchy of a server is reused, in seconds
+ORG_UNITS_TTL = 24 * 60 * 60
+
+DHIS_STORE_FILE = "dhis.sqlite"
+
+
+class DhisStore:
+    """Caches DHIS2 metadata in SQLite, per server.
+
+    geoFeatures are stored one row per org unit and level, so indicator and
+    period pulls at a level reuse the geometries fetched by the previous
+    ones until they are older than GEO_FEATURES_TTL.
+
+    dataSets / programs (with their indicators) are stored one row per
+    object and kept up to date incrementally: only objects whose
+    lastUpdated is after the newest one stored are fetched again.
+
+    The org unit tree (see OrgUnitHierarchy) is stored one row per org
+    unit and reused until it is older than ORG_UNITS_TTL.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geo_feature_levels (
+                    server TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (server, level)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS metadata (
+                    server TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    name TEXT,
+                    last_updated TEXT,
+                    item TEXT NOT NULL,
+                    PRIMARY KEY (server, kind, id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS org_unit_syncs (
+                    server TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS org_units (
+                    server TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    name TEXT,
+                    level INTEGER,
+                    parent TEXT,
+                    path TEXT,
+                    geometry INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (server, id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geo_features (
+                    server TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    feature TEXT NOT NULL,
+                    PRIMARY KEY (server, level, id)
+                )
+                """
+            )
+
+    @contextlib.contextmanager
+    def connect(self):
+        """Opens a connection that commits (or rolls back) and is closed on exit."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save_geo_features(self, server, level, features):
+        """Replaces the cached geoFeatures of a level."""
+        rows = [
+            (server, str(level), str(feature.get("id")), json.dumps(feature))
+            for feature in features
+            if feature.get("id")
+        ]
+        with self.lock, self.connect() as conn:
+            conn.execute(
+                "DELETE FROM geo_features WHERE server = ? AND level = ?",
+                (server, str(level)),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO geo_features (server, level, id, feature) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO geo_feature_levels (server, level, fetched_at) "
+                "VALUES (?, ?, ?)",
+                (server, str(level), time.time()),
+            )
+
+    def geo_features(self, server, level, max_age=GEO_FEATURES_TTL):
+        """Returns the cached {org unit id: geoFeature} of a level.
+
+        None when the level was never fetched or the cache is older than
+        max_age seconds.
+        """
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM geo_feature_levels "
+                "WHERE server = ? AND level = ?",
+                (server, str(level)),
+            ).fetchone()
+            if not row or time.time() - row[0] > max_age:
+                return None
+
+            cursor = conn.execute(
+                "SELECT id, feature FROM geo_features WHERE server = ? AND level = ?",
+                (server, str(level)),
+            )
+            return {key: json.loads(feature) for key, feature in cursor}
+
+    def save_org_units(self, server, units):
+        """Replaces the stored org unit tree of a server."""
+        rows = [
+            (
+                server,
+                unit["id"],
+                unit.get("name"),
+                unit.get("level"),
+                unit.get("parent"),
+                unit.get("path"),
+                int(bool(unit.get("geometry"))),
+            )
+            for unit in units
+        ]
+        with self.lock, self.connect() as conn:
+            conn.execute("DELETE FROM org_units WHERE server = ?", (server,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO org_units "
+                "(server, id, name, level, parent, path, geometry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO org_unit_syncs (server, fetched_at) "
+                "VALUES (?, ?)",
+                (server, time.time()),
+            )
+
+    def org_units(self, server, max_age=ORG_UNITS_TTL):
+        """Returns the stored org units of a server as dicts.
+
+        None when the tree was never fetched or is older than max_age
+        seconds.
+        """
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM org_unit_syncs WHERE server = ?", (server,)
+            ).fetchone()
+            if not row or time.time() - row[0] > max_age:
+                return None
+
+            cursor = conn.execute(
+                "SELECT id, name, level, parent, path, geometry FROM org_units "
+                "WHERE server = ?",
+                (server,),
+            )
+            return [
+                {
+                    "id": key,
+                    "name": name,
+                    "level": level,
+                    "parent": parent,
+                    "path": path,
+                    "geometry": bool(geometry),
+                }
+                for key, name, level, parent, path, geometry in cursor
+            ]
+
+    def org_units_fetched_at(self, server):
+        """Returns when the org unit tree of a server was stored, or None."""
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM org_unit_syncs WHERE server = ?", (server,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def clear_org_units(self, server=None):
+        with self.lock, self.connect() as conn:
+            if server is None:
+                conn.execute("DELETE FROM org_units")
+                conn.execute("DELETE FROM org_unit_syncs")
+            else:
+                conn.execute("DELETE FROM org_units WHERE server = ?", (server,))
+                conn.execute("DELETE FROM org_unit_syncs WHERE server = ?", (server,))
+
+    def save_metadata(self, server, kind, items):
+        """Inserts or updates metadata objects of a kind (dataSets, ...)."""
+        rows = [
+            (
+                server,
+                kind,
+                str(item.get("id")),
+                item.get("name"),
+                item.get("lastUpdated"),
+                json.dumps(item),
+            )
+            for item in items
+            if item.get("id")
+        ]
+        with self.lock, self.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata "
+                "(server, kind, id, name, last_updated, item) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def prune_metadata(self, server, kind, ids):
+        """Deletes the stored objects of a kind whose id is not in ids."""
+        ids = set(ids)
+        with self.lock, self.connect() as conn:
+            stored = conn.execute(
+                "SELECT id FROM metadata WHERE server = ? AND kind = ?",
+                (server, kind),
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM metadata WHERE server = ? AND kind = ? AND id = ?",
+                [(server, kind, key) for key, in stored if key not in ids],
+            )
+
+    def metadata_last_updated(self, server, kind):
+        """Returns the newest lastUpdated stored for a kind, None if empty."""
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(last_updated) FROM metadata WHERE server = ? AND kind = ?",
+                (server, kind),
+            ).fetchone()
+        return row[0] if row else None
+
+    def metadata_items(self, server, kind):
+        """Returns the stored objects of a kind, ordered by name."""
+        with self.connect() as conn:
+            cursor = conn.execute(
+                "SELECT item FROM metadata WHERE server = ? AND kind = ? "
+                "ORDER BY name COLLATE NOCASE",
+                (server, kind),
+            )
+            return [json.loads(item) for item, in cursor]
+
+    def metadata_item(self, server, kind, key):
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT item FROM metadata WHERE server = ? AND kind = ? AND id = ?",
+                (server, kind, key),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def clear_metadata(self, server=None):
+        with self.lock, self.connect() as conn:
+            if server is None:
+                conn.execute("DELETE FROM metadata")
+            else:
+                conn.execute("DELETE FROM metadata WHERE server = ?", (server,))
+
+    def clear_geo_features(self, server=None):
+        with self.lock, self.connect() as conn:
+            if server is None:
+                conn.execute("DELETE FROM geo_features")
+                conn.execute("DELETE FROM geo_feature_levels")
+            else:
+                conn.execute("DELETE FROM geo_features WHERE server = ?", (server,))
+                conn.execute(
+                    "DELETE FROM geo_feature_levels WHERE server = ?", (server,)
+                )
+
+
+def index_geo_features(features):
+    """Indexes a geoFeatures response by org unit id."""
+    return {feature.get("id"): feature for feature in features if feature.get("id")}
@@ -0,0 +1,124 @@
+from qgis.core import Qgis, QgsApplication, QgsMessageLog, QgsTask
+
+
+class FetchCancelled(Exception):
+    """Raised inside a fetch stage when the task has been cancelled."""
+
+
+class FetchError(Exception):
+    """Raised inside a fetch stage when a request fails."""
+
+
+class ConnectorFetchTask(QgsTask):
+    """Runs a connector's fetch/transform stages on a QgsTaskManager thread.
+
+    Each stage is called as stage(task, previous_result) and must not touch
+    the UI. on_finished(result), on_error(message) and on_cancelled() are
+    called on the main thread once the task completes, unless the task has
+    been superseded by a newer job for the same connector.
+    """
+
+    def __init__(
+        self,
+        description,
+        stages,
+        on_finished=None,
+        on_error=None,
+        on_cancelled=None,
+    ):
+        super().__init__(description, QgsTask.CanCancel)
+        self.stages = stages
+        self.on_finished = on_finished
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.result = None
+        self.error = None
+        # set by FetchJobManager when a newer task replaces this one
+        self.superseded = False
+
+    def check_cancelled(self):
+        if self.isCanceled():
+            raise FetchCancelled()
+
+    def report_progress(self, current, total):
+        if total:
+            self.setProgress(min(100.0, (float(current) / float(total)) * 100))
+
+    def run(self):
+        try:
+            result = None
+            for stage in self.stages:
+                self.check_cancelled()
+                result = stage(self, result)
+            self.result = result
+            return True
+        except FetchCancelled:
+            return False
+        except Exception as e:
+            self.error = str(e)
+            QgsMessageLog.logMessage(
+                f"{self.description()} failed: {e}", "AfpolGIS", Qgis.Critical
+            )
+            return False
+
+    def finished(self, result):
+        if self.superseded:
+            # the newer task owns the dialog's buttons and progress bar
+            return
+        if result:
+            if self.on_finished:
+                self.on_finished(self.result)
+        elif self.isCanceled() or self.error is None:
+            if self.on_cancelled:
+                self.on_cancelled()
+        elif self.on_error:
+            self.on_error(self.error)
+
+
+class FetchJobManager:
+    """Keeps track of the background fetch jobs, one per connector key."""
+
+    def __init__(self):
+        self.jobs = dict()
+
+    def start(self, key, task, progress_bar=None):
+        """Starts a task, cancelling any job already running under key.
+
+        The cancelled job is marked superseded so that its callbacks and
+        progress updates do not reach the UI shared with the new task.
+        """
+        previous = self.jobs.get(key)
+        if previous is not None and self.is_running(key):
+            previous.superseded = True
+            previous.cancel()
+        if progress_bar is not None:
+            task.progressChanged.connect(
+                lambda value: task.superseded or progress_bar.setValue(int(value))
+            )
+        task.taskCompleted.connect(lambda: self.forget(key, task))
+        task.taskTerminated.connect(lambda: self.forget(key, task))
+        # keep a reference, QgsTaskManager does not own the python wrapper
+        self.jobs[key] = task
+        QgsApplication.taskManager().addTask(task)
+        return task
+
+    def forget(self, key, task):
+        if self.jobs.get(key) is task:
+            del self.jobs[key]
+
+    def is_running(self, key):
+        task = self.jobs.get(key)
+        return task is not None and task.status() in (
+            QgsTask.Queued,
+            QgsTask.OnHold,
+            QgsTask.Running,
+        )
+
+    def cancel(self, key):
+        task = self.jobs.get(key)
+        if task is not None and self.is_running(key):
+            task.cancel()
+
+    def cancel_all(self):
+        for key in list(self.jobs.keys()):
+            self.cancel(key)
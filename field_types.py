@@ -0,0 +1,204 @@
+import re
+
+from PyQt5.QtCore import QDate, QDateTime, Qt, QVariant
+
+# Number of records sampled to infer the type of fields missing from a schema
+INFERENCE_SAMPLE_SIZE = 1000
+
+# Question types (XLSForm, ODK Central /fields, Kobo survey) with a typed column
+SCHEMA_TYPES = {
+    "integer": QVariant.LongLong,
+    "int": QVariant.LongLong,
+    "decimal": QVariant.Double,
+    "date": QVariant.Date,
+    "today": QVariant.Date,
+    "datetime": QVariant.DateTime,
+    "dateTime": QVariant.DateTime,
+    "start": QVariant.DateTime,
+    "end": QVariant.DateTime,
+    "boolean": QVariant.Bool,
+}
+# Question types that always hold text, even when the answers look numeric
+TEXT_TYPES = {
+    "text",
+    "string",
+    "select one",
+    "select_one",
+    "select1",
+    "select all that apply",
+    "select_multiple",
+    "select",
+    "barcode",
+    "geopoint",
+    "geotrace",
+    "geoshape",
+    "note",
+    "image",
+    "audio",
+    "video",
+    "file",
+    "binary",
+}
+
+INTEGER_RE = re.compile(r"^-?(0|[1-9]\d{0,17})$")
+DOUBLE_RE = re.compile(r"^-?\d+\.\d+([eE][-+]?\d+)?$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+FRACTION_RE = re.compile(r"(\.\d{3})\d+")
+# Text answers accepted in a boolean field, anything else does not fit it
+TRUE_VALUES = ("true", "1", "yes")
+FALSE_VALUES = ("false", "0", "no")
+
+
+def schema_field_types(question_types):
+    """Maps {field path: question type} to {field path: QVariant type}."""
+    field_types = dict()
+    for name, question_type in question_types.items():
+        if not name or not question_type:
+            continue
+        if question_type in SCHEMA_TYPES:
+            field_types[name] = SCHEMA_TYPES[question_type]
+        elif question_type in TEXT_TYPES:
+            field_types[name] = QVariant.String
+    return field_types
+
+
+def value_type(value):
+    """Returns the narrowest QVariant type able to hold a single value."""
+    if isinstance(value, bool):
+        return QVariant.Bool
+    if isinstance(value, int):
+        return QVariant.LongLong
+    if isinstance(value, float):
+        return QVariant.Double
+    if not isinstance(value, str):
+        return QVariant.String
+
+    value = value.strip()
+    if value.lower() in ("true", "false"):
+        return QVariant.Bool
+    if INTEGER_RE.match(value):
+        return QVariant.LongLong
+    if DOUBLE_RE.match(value):
+        return QVariant.Double
+    if DATE_RE.match(value):
+        return QVariant.Date
+    if DATETIME_RE.match(value):
+        return QVariant.DateTime
+    return QVariant.String
+
+
+def combine_types(types):
+    if not types:
+        return QVariant.String
+    if len(types) == 1:
+        return next(iter(types))
+    if types <= {QVariant.LongLong, QVariant.Double}:
+        return QVariant.Double
+    if types <= {QVariant.Date, QVariant.DateTime}:
+        return QVariant.DateTime
+    return QVariant.String
+
+
+def infer_field_types(records, schema=None, sample_size=INFERENCE_SAMPLE_SIZE):
+    """Returns an ordered {field name: QVariant type} for a list of records.
+
+    Fields described by the schema take its type; the others are inferred
+    from the values of the first sample_size records. Empty fields are text.
+    """
+    schema = schema or dict()
+    names = dict()
+    for record in records:
+        names.update(dict.fromkeys(record.keys()))
+
+    sampled_types = {name: set() for name in names if name not in schema}
+    if sampled_types:
+        for record in records[:sample_size]:
+            for name, value in record.items():
+                if name in sampled_types and value is not None and value != "":
+                    sampled_types[name].add(value_type(value))
+
+    return {
+        name: schema.get(name) or combine_types(sampled_types.get(name))
+        for name in names
+    }
+
+
+def parse_datetime(value):
+    value = FRACTION_RE.sub(r"\1", value.strip().replace(" ", "T", 1))
+    result = QDateTime.fromString(value, Qt.ISODateWithMs)
+    if not result.isValid():
+        result = QDateTime.fromString(value, Qt.ISODate)
+    return result if result.isValid() else None
+
+
+def convert_value(value, field_type):
+    """Converts a property to the python value stored in a typed field.
+
+    Returns None for empty values and for values that do not fit the field
+    type; see widen_type for the type a field needs to hold them.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, QVariant):
+        return None if value.isNull() else value.value()
+
+    try:
+        if field_type == QVariant.LongLong:
+            try:
+                return int(value)
+            except ValueError:
+                number = float(value)
+                return int(number) if number.is_integer() else None
+        if field_type == QVariant.Double:
+            return float(value)
+        if field_type == QVariant.Bool:
+            if isinstance(value, str):
+                value = value.strip().lower()
+                if value in TRUE_VALUES or value in FALSE_VALUES:
+                    return value in TRUE_VALUES
+                return None
+            return bool(value)
+        if field_type == QVariant.Date:
+            if isinstance(value, QDate):
+                return value
+            result = QDate.fromString(str(value)[:10], Qt.ISODate)
+            return result if result.isValid() else None
+        if field_type == QVariant.DateTime:
+            if isinstance(value, QDateTime):
+                return value
+            if isinstance(value, QDate):
+                return QDateTime(value)
+            return parse_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+
+    if isinstance(value, (QDate, QDateTime)):
+        return value.toString(Qt.ISODate)
+    return str(value)
+
+
+def fits_type(value, field_type):
+    """Whether a value can be stored in a field of field_type. Empty values
+    fit every type.
+    """
+    if value is None or value == "" or field_type == QVariant.String:
+        return True
+    return convert_value(value, field_type) is not None
+
+
+def widen_type(field_type, values):
+    """Returns the type a field of field_type needs to hold all of values.
+
+    field_type when they all fit, otherwise the narrowest type holding both
+    (LongLong and Double make Double, Date and DateTime make DateTime) and
+    text when there is none.
+    """
+    widened = field_type
+    for value in values:
+        if fits_type(value, widened):
+            continue
+        widened = combine_types({widened, value_type(value)})
+        if widened == QVariant.String or not fits_type(value, widened):
+            return QVariant.String
+    return widened
@@ -0,0 +1,117 @@
+import warnings
+
+import numpy as np
+
+# Parses ODK / Ona / Kobo geo answers ("lat lon alt acc" geopoints and
+# "lat lon alt acc;lat lon alt acc;..." geotraces / geoshapes) a page at a
+# time: every number of the page is converted by a single np.fromstring call
+# and the [lon, lat] pairs are gathered with array indexing, instead of
+# splitting and converting each vertex in Python.
+
+
+def clean_geo_string(value):
+    if not isinstance(value, str):
+        return ""
+    return value.strip().strip(";").strip()
+
+
+def parse_geo_strings(values):
+    """Parses a batch of geopoint / geotrace / geoshape strings.
+
+    Returns (coordinates, offsets) where coordinates is an (N, 2) float array
+    of [lon, lat] pairs for all the vertices of all the values, and the
+    vertices of values[i] are coordinates[offsets[i]:offsets[i + 1]]. Empty
+    or malformed values get no vertices.
+    """
+    cleaned = [clean_geo_string(value) for value in values]
+    texts = [value.replace(";", " ") for value in cleaned]
+
+    number_counts = np.array([len(text.split()) for text in texts], dtype=np.int64)
+    vertex_counts = np.array(
+        [value.count(";") + 1 if value else 0 for value in cleaned], dtype=np.int64
+    )
+
+    try:
+        with warnings.catch_warnings():
+            # numpy warns (newer versions raise) when a token is not a number
+            warnings.simplefilter("error", DeprecationWarning)
+            numbers = np.fromstring(" ".join(texts), dtype=np.float64, sep=" ")
+    except (DeprecationWarning, ValueError):
+        numbers = None
+    if numbers is None or len(numbers) != number_counts.sum():
+        # a token was not a number, fall back to parsing value by value
+        return parse_geo_strings_one_by_one(texts, vertex_counts)
+
+    strides = np.floor_divide(
+        number_counts,
+        vertex_counts,
+        out=np.zeros_like(number_counts),
+        where=vertex_counts > 0,
+    )
+    valid = (
+        (vertex_counts > 0)
+        & (strides >= 2)
+        & (strides * vertex_counts == number_counts)
+    )
+    vertex_counts = np.where(valid, vertex_counts, 0)
+
+    number_offsets = np.concatenate(([0], np.cumsum(number_counts)))
+    offsets = np.concatenate(([0], np.cumsum(vertex_counts)))
+
+    value_index = np.repeat(np.arange(len(values)), vertex_counts)
+    local_vertex = np.arange(offsets[-1]) - np.repeat(offsets[:-1], vertex_counts)
+    starts = number_offsets[value_index] + local_vertex * strides[value_index]
+
+    coordinates = np.empty((len(starts), 2), dtype=np.float64)
+    coordinates[:, 0] = numbers[starts + 1]  # lon
+    coordinates[:, 1] = numbers[starts]  # lat
+    return coordinates, offsets
+
+
+def parse_geo_strings_one_by_one(texts, vertex_counts):
+    chunks = []
+    counts = []
+    for text, vertex_count in zip(texts, vertex_counts):
+        try:
+            numbers = np.array(text.split(), dtype=np.float64)
+        except ValueError:
+            numbers = np.empty(0)
+        if vertex_count and len(numbers) % vertex_count == 0:
+            stride = len(numbers) // vertex_count
+            if stride >= 2:
+                pairs = numbers.reshape(vertex_count, stride)[:, [1, 0]]
+                chunks.append(pairs)
+                counts.append(vertex_count)
+                continue
+        counts.append(0)
+
+    coordinates = np.concatenate(chunks) if chunks else np.empty((0, 2))
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return coordinates, offsets
+
+
+def geojson_geometries(coordinates, offsets):
+    """Turns parsed coordinates into GeoJSON geometry dicts, one per value.
+
+    A single vertex is a Point and several vertices a Polygon, as before;
+    values without vertices yield None. The coordinates are kept as views
+    of the parsed array so geometry_builder can use them without converting
+    every vertex to a python list; they are serialised on demand.
+    """
+    geometries = []
+    for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        if end - start == 1:
+            geometries.append({"type": "Point", "coordinates": coordinates[start]})
+        elif end - start > 1:
+            geometries.append(
+                {"type": "Polygon", "coordinates": [coordinates[start:end]]}
+            )
+        else:
+            geometries.append(None)
+    return geometries
+
+
+def parse_geo_geometries(values):
+    """Parses a batch of geo strings straight into GeoJSON geometries."""
+    coordinates, offsets = parse_geo_strings(values)
+    return geojson_geometries(coordinates, offsets)
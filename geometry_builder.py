@@ -0,0 +1,93 @@
+import numpy as np
+
+from qgis.core import (
+    QgsGeometry,
+    QgsLineString,
+    QgsMultiLineString,
+    QgsMultiPoint,
+    QgsMultiPolygon,
+    QgsPoint,
+    QgsPolygon,
+)
+
+# Builds QGIS geometries straight from numeric GeoJSON coordinates, without
+# formatting them into WKT and having QgsGeometry.fromWkt parse them back.
+# Every connector ends up with GeoJSON style coordinate arrays (Ona / Kobo
+# geopoint strings, ODK WKT, DHIS2 geoFeatures, GTS X/Y, ES GeoJSON), so the
+# same builder serves all of them. Only X/Y are kept, like the WKT path did.
+# Coordinates may be python lists or NumPy arrays (see geo_parser).
+
+
+def point(coordinates):
+    return QgsPoint(float(coordinates[0]), float(coordinates[1]))
+
+
+def line_string(coordinates):
+    try:
+        array = np.asarray(coordinates, dtype=np.float64)
+    except ValueError:
+        # ragged input, e.g. vertices with and without Z
+        array = None
+    if array is None or array.ndim != 2 or array.shape[1] < 2:
+        xs = [float(coordinate[0]) for coordinate in coordinates]
+        ys = [float(coordinate[1]) for coordinate in coordinates]
+        return QgsLineString(xs, ys)
+    return QgsLineString(array[:, 0].tolist(), array[:, 1].tolist())
+
+
+def polygon(rings):
+    result = QgsPolygon()
+    for i, ring in enumerate(rings):
+        if i == 0:
+            result.setExteriorRing(line_string(ring))
+        else:
+            result.addInteriorRing(line_string(ring))
+    return result
+
+
+def multi_point(points):
+    result = QgsMultiPoint()
+    for coordinates in points:
+        result.addGeometry(point(coordinates))
+    return result
+
+
+def multi_line_string(lines):
+    result = QgsMultiLineString()
+    for coordinates in lines:
+        result.addGeometry(line_string(coordinates))
+    return result
+
+
+def multi_polygon(polygons):
+    result = QgsMultiPolygon()
+    for rings in polygons:
+        result.addGeometry(polygon(rings))
+    return result
+
+
+GEOMETRY_BUILDERS = {
+    "Point": point,
+    "LineString": line_string,
+    "Polygon": polygon,
+    "MultiPoint": multi_point,
+    "MultiLineString": multi_line_string,
+    "MultiPolygon": multi_polygon,
+}
+
+
+def build_geometry(geometry):
+    """Returns the QgsGeometry for a GeoJSON geometry dict.
+
+    A missing geometry yields an empty QgsGeometry; unsupported types raise
+    ValueError.
+    """
+    if not geometry:
+        return QgsGeometry()
+
+    geom_type = geometry.get("type")
+    builder = GEOMETRY_BUILDERS.get(geom_type)
+    if builder is None:
+        raise ValueError(f"Unsupported geometry type: {geom_type}")
+
+    return QgsGeometry(builder(geometry.get("coordinates")))
@@ -0,0 +1,319 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Connection pool settings shared by every connector.
+# POOL_CONNECTIONS - number of per-host pools a session keeps around
+# POOL_MAXSIZE - keep-alive connections kept open per host. With a non
+# blocking pool this caps the idle connections kept for reuse, not the
+# connections open at once: extra ones are opened and then discarded.
+# POOL_BLOCK - when True, never open more than POOL_MAXSIZE connections per
+# host. Off, since a streamed response that is never read nor closed keeps
+# its connection checked out, and a blocking pool would then hang every
+# later request to the host; concurrency is bounded by the callers instead
+# (MAX_CONCURRENT_PAGES, the DHIS2 concurrency settings, ...).
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+POOL_BLOCK = False
+
+# On-disk HTTP cache for metadata requests (form lists, schemas, ...)
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+HTTP_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".afpolgis", "http_cache.sqlite")
+
+_pool_settings = {
+    "pool_connections": POOL_CONNECTIONS,
+    "pool_maxsize": POOL_MAXSIZE,
+    "pool_block": POOL_BLOCK,
+}
+_host_keepalive_limits = dict()
+_sessions = dict()
+_sessions_lock = threading.Lock()
+
+
+def credentials_key(auth):
+    """Returns a hashable, non reversible identity for the given auth."""
+    if auth is None:
+        return None
+
+    if isinstance(auth, tuple):
+        username, password = auth
+    elif hasattr(auth, "username") and hasattr(auth, "password"):
+        username, password = auth.username, auth.password
+    else:
+        return f"{type(auth).__name__}:{id(auth)}"
+
+    digest = hashlib.sha256(f"{username}:{password}".encode("utf-8")).hexdigest()
+    return f"{username}:{digest}"
+
+
+def session_key(url, auth=None):
+    parts = urlsplit(url)
+    return (parts.scheme.lower(), parts.netloc.lower(), credentials_key(auth))
+
+
+def configure_pool(pool_connections=None, pool_maxsize=None, pool_block=None):
+    """Updates the pool sizes and drops open sessions so they pick them up."""
+    if pool_connections is not None:
+        _pool_settings["pool_connections"] = int(pool_connections)
+    if pool_maxsize is not None:
+        _pool_settings["pool_maxsize"] = int(pool_maxsize)
+    if pool_block is not None:
+        _pool_settings["pool_block"] = bool(pool_block)
+    close_sessions()
+
+
+def set_host_keepalive_limit(host, max_connections):
+    """Caps the keep-alive connections kept open to a single host.
+
+    Like POOL_MAXSIZE this bounds the idle connections reused for the host,
+    not the number of requests in flight to it.
+    """
+    if max_connections:
+        _host_keepalive_limits[host.lower()] = int(max_connections)
+    else:
+        _host_keepalive_limits.pop(host.lower(), None)
+    close_sessions()
+
+
+def build_session(host, auth=None):
+    pool_maxsize = _host_keepalive_limits.get(host, _pool_settings["pool_maxsize"])
+    adapter = HTTPAdapter(
+        pool_connections=_pool_settings["pool_connections"],
+        pool_maxsize=pool_maxsize,
+        pool_block=_pool_settings["pool_block"],
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if auth:
+        session.auth = auth
+    return session
+
+
+def get_session(url, auth=None):
+    """Returns the pooled session for the url's host and the given credentials.
+
+    Sessions are shared process wide, so headers must be passed per request
+    rather than set on the session.
+    """
+    key = session_key(url, auth)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = build_session(key[1], auth)
+            _sessions[key] = session
+    return session
+
+
+def pooled_get(url, auth=None, params=None, headers=None, timeout=60, stream=True):
+    session = get_session(url, auth)
+    if params:
+        return session.get(
+            url, params=params, headers=headers, stream=stream, timeout=timeout
+        )
+    return session.get(url, headers=headers, stream=stream, timeout=timeout)
+
+
+def close_sessions():
+    """Closes every pooled session and its keep-alive connections."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+class HttpCache:
+    """Size bounded, LRU evicted on-disk cache of GET responses.
+
+    Responses are stored with their ETag / Last-Modified validators so they
+    can be revalidated with a conditional request; a 304 is then served from
+    disk without transferring the body again.
+    """
+
+    def __init__(self, path=HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers TEXT,
+                    body BLOB,
+                    size INTEGER,
+                    last_access REAL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access "
+                "ON responses (last_access)"
+            )
+
+    @contextlib.contextmanager
+    def connect(self):
+        """Opens a connection that commits (or rolls back) and is closed on exit."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def cache_key(url, auth=None, params=None, headers=None):
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        query = urlencode(params or [], doseq=True)
+        varying = sorted((headers or {}).items())
+        return hashlib.sha256(
+            json.dumps([url, query, varying, credentials_key(auth)]).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key):
+        with self.lock, self.connect() as conn:
+            row = conn.execute(
+                "SELECT url, etag, last_modified, headers, body FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+        if not row:
+            return None
+        url, etag, last_modified, headers, body = row
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": json.loads(headers),
+            "body": body,
+        }
+
+    def put(self, key, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        headers = {
+            name: response.headers.get(name)
+            for name in ("Content-Type", "ETag", "Last-Modified")
+            if response.headers.get(name)
+        }
+        with self.lock, self.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, etag, last_modified, headers, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    etag,
+                    last_modified,
+                    json.dumps(headers),
+                    sqlite3.Binary(body),
+                    len(body),
+                    time.time(),
+                ),
+            )
+            self.evict(conn)
+
+    def evict(self, conn):
+        """Drops least recently used entries until the cache fits max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[
+            0
+        ]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access"
+        ).fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self.lock, self.connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_http_cache = None
+
+
+def configure_cache(path=None, max_bytes=None):
+    """Points the HTTP cache at a new file and/or size limit."""
+    global _http_cache
+    _http_cache = HttpCache(
+        path or HTTP_CACHE_PATH, max_bytes or HTTP_CACHE_MAX_BYTES
+    )
+    return _http_cache
+
+
+def get_cache():
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
+
+
+def cached_response(entry):
+    """Builds a 200 response from a cache entry."""
+    response = requests.models.Response()
+    response.status_code = 200
+    response.url = entry.get("url")
+    response.headers = CaseInsensitiveDict(entry.get("headers"))
+    response._content = bytes(entry.get("body"))
+    response._content_consumed = True
+    response.from_cache = True
+    return response
+
+
+def cached_get(url, auth=None, params=None, headers=None, timeout=60):
+    """GET with on-disk caching and ETag / Last-Modified revalidation."""
+    cache = get_cache()
+    key = cache.cache_key(url, auth, params, headers)
+    entry = cache.get(key)
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry.get("etag")
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry.get("last_modified")
+
+    response = pooled_get(
+        url, auth, params=params, headers=request_headers, timeout=timeout, stream=False
+    )
+
+    if response.status_code == 304 and entry:
+        return cached_response(entry)
+
+    if response.status_code == 200:
+        cache.put(key, response)
+
+    return response
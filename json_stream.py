@@ -0,0 +1,221 @@
+import codecs
+import json
+import re
+
+# Size of the byte chunks read from the network
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = " \t\n\r"
+
+# Characters that matter when looking for the end of a value: brackets and
+# quotes outside strings, quotes and backslashes inside them, and the
+# delimiters that end a number / true / false / null
+STRUCTURE_RE = re.compile(r'[\[\]{}"]')
+STRING_RE = re.compile(r'["\\]')
+SCALAR_END_RE = re.compile(r"[\s,\]}:]")
+
+
+class JsonRecordStream:
+    """Incrementally parses the records of a JSON array out of a response.
+
+    The array is either the top level document (key=None) or the value of a
+    top level object key such as "value", "results" or "features". Records
+    are yielded as soon as their bytes have arrived, so peak memory is
+    bounded by one record rather than one page. Other top level values seen
+    before and after the array (e.g. "count", "next", "@odata.count") are
+    collected in self.meta.
+
+    The end of each value is found by tracking the nesting depth and string
+    state chunk by chunk, and the value is then decoded once, so a record
+    spanning many chunks costs time linear in its size.
+    """
+
+    def __init__(self, response, key=None, chunk_size=CHUNK_SIZE):
+        self.response = response
+        self.key = key
+        self.chunk_size = chunk_size
+        self.meta = dict()
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.chunks = self.iter_chunks()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # scan state of the value being looked at, see scan_value
+        self.scalar = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def iter_chunks(self):
+        if hasattr(self.response, "iter_content"):
+            return self.response.iter_content(chunk_size=self.chunk_size)
+        return self.response.iter_bytes(chunk_size=self.chunk_size)
+
+    def next_text(self):
+        """Returns the text of the next chunk, None at the end."""
+        if self.eof:
+            return None
+        for chunk in self.chunks:
+            if chunk:
+                text = self.text_decoder.decode(chunk)
+                if text:
+                    return text
+        self.eof = True
+        return self.text_decoder.decode(b"", final=True) or None
+
+    def read_more(self):
+        """Replaces the consumed buffer with the next chunk, returns False at
+        the end.
+        """
+        text = self.next_text()
+        if text is None:
+            return False
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skips whitespace and returns the next character ("" at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at position {self.pos}")
+        self.pos += 1
+
+    def scan_value(self, text, pos):
+        """Continues looking for the end of the current value in text from
+        pos; returns the index just past it, or -1 when text ends first.
+        """
+        if self.scalar:
+            match = SCALAR_END_RE.search(text, pos)
+            return match.start() if match else -1
+
+        while True:
+            if self.escaped:
+                if pos >= len(text):
+                    return -1
+                pos += 1
+                self.escaped = False
+            if self.in_string:
+                match = STRING_RE.search(text, pos)
+                if not match:
+                    return -1
+                pos = match.end()
+                if match.group() == "\\":
+                    self.escaped = True
+                    continue
+                self.in_string = False
+                if not self.depth:
+                    return pos
+                continue
+
+            match = STRUCTURE_RE.search(text, pos)
+            if not match:
+                return -1
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self.in_string = True
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if not self.depth:
+                    return pos
+
+    def decode_value(self):
+        """Decodes the JSON value at the current position."""
+        first = self.peek()
+        if not first:
+            raise ValueError("Unexpected end of JSON document")
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            # a number is complete only once a delimiter follows it
+            if first in '[{"' or self.eof or SCALAR_END_RE.match(self.buffer, end):
+                self.pos = end
+                return value
+        except json.JSONDecodeError:
+            if self.eof:
+                raise
+
+        # the value is cut by the end of the buffer: find where it ends in
+        # the next chunks, then join them and decode it once
+        self.scalar = first not in '[{"'
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+        end = self.scan_value(self.buffer, self.pos)
+        if end >= 0:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            self.pos = end
+            return value
+
+        parts = [self.buffer[self.pos :]]
+        while True:
+            text = self.next_text()
+            if text is None:
+                if not self.scalar:
+                    raise ValueError("Unexpected end of JSON document")
+                # a number / literal closing the document
+                self.buffer, self.pos = "", 0
+                return self.decoder.decode("".join(parts))
+            end = self.scan_value(text, 0)
+            if end >= 0:
+                parts.append(text[:end])
+                self.buffer, self.pos = text, end
+                return self.decoder.decode("".join(parts))
+            parts.append(text)
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.decode_value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at position {self.pos - 1}")
+
+    def __iter__(self):
+        if self.key is None:
+            yield from self.iter_array()
+            return
+
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            name = self.decode_value()
+            self.expect(":")
+            if name == self.key and self.peek() == "[":
+                yield from self.iter_array()
+            else:
+                self.meta[name] = self.decode_value()
+
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' at position {self.pos - 1}")
+
+
+def iter_json_records(response, key=None, chunk_size=CHUNK_SIZE):
+    """Yields the records of a JSON array as the response bytes arrive."""
+    return iter(JsonRecordStream(response, key, chunk_size))
@@ -0,0 +1,104 @@
+import json
+
+# Geometry types of the geoFeatures API ("ty")
+GEO_FEATURE_POINT = 1
+GEO_FEATURE_POLYGON = 2
+
+
+def parse_path(path):
+    """Returns the ids of a DHIS2 org unit path ("/root/.../id"), root first."""
+    return [part for part in (path or "").split("/") if part]
+
+
+class OrgUnitHierarchy:
+    """Index of the org unit tree of a DHIS2 server.
+
+    Every org unit is kept as {"id", "name", "level", "parent", "path",
+    "geometry"} where geometry tells whether it has one; the geometries
+    themselves are the geoFeatures cached per level in the DhisStore. The
+    levels of the server and the units of a level are answered from the
+    index, without a request.
+    """
+
+    def __init__(self, units=()):
+        self.units = dict()
+        self.by_level = dict()
+        for unit in units:
+            self.add(unit)
+
+    def __len__(self):
+        return len(self.units)
+
+    def add(self, unit):
+        key = unit["id"]
+        self.units[key] = unit
+        self.by_level.setdefault(unit.get("level"), []).append(key)
+
+    @classmethod
+    def from_org_units(cls, records):
+        """Builds the index from /api/organisationUnits records."""
+        hierarchy = cls()
+        for record in records:
+            if record.get("id"):
+                hierarchy.add(org_unit(record))
+        return hierarchy
+
+    def levels(self):
+        return sorted(level for level in self.by_level if level)
+
+    def at_level(self, level):
+        """Returns the ids of the org units of a level."""
+        return list(self.by_level.get(int(level), []))
+
+
+def org_unit(record):
+    """Returns an /api/organisationUnits record as an index entry."""
+    path = record.get("path")
+    parent = record.get("parent") or dict()
+    return {
+        "id": record.get("id"),
+        "name": record.get("name"),
+        "level": record.get("level") or len(parse_path(path)),
+        "parent": parent.get("id"),
+        "path": path,
+        "geometry": bool(record.get("geometry")),
+    }
+
+
+def geo_feature(record):
+    """Returns an /api/organisationUnits record as a geoFeatures entry, the
+    shape cached per level in the DhisStore; None without a geometry.
+    """
+    geometry = record.get("geometry")
+    if not geometry or not geometry.get("coordinates"):
+        return None
+    parent = record.get("parent") or dict()
+    return {
+        "id": record.get("id"),
+        "na": record.get("name"),
+        "le": record.get("level"),
+        "pi": parent.get("id"),
+        "ty": GEO_FEATURE_POINT
+        if geometry.get("type") == "Point"
+        else GEO_FEATURE_POLYGON,
+        "co": json.dumps(geometry.get("coordinates")),
+    }
+
+
+def geo_feature_geometry(feature):
+    """Returns the GeoJSON geometry of a geoFeatures entry, or None."""
+    coordinates = json.loads(feature.get("co") or "null")
+    if not coordinates:
+        return None
+    if feature.get("ty") == GEO_FEATURE_POINT:
+        return {"type": "Point", "coordinates": coordinates}
+    # polygons come as rings, multipolygons as lists of them
+    depth = 0
+    item = coordinates
+    while isinstance(item, list) and item:
+        depth += 1
+        item = item[0]
+    return {
+        "type": "MultiPolygon" if depth > 3 else "Polygon",
+        "coordinates": coordinates,
+    }
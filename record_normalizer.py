@@ -0,0 +1,56 @@
+import math
+
+# Flattens submissions into string valued records sharing one schema, the
+# shape pd.json_normalize(...).fillna("").astype(str).to_dict("records") gave
+# for Ona data, without building a DataFrame in between. Nested groups become
+# "group/question" keys and repeats "repeat[1]/question" keys, like
+# flatten_dict.
+
+
+def to_text(value):
+    """Formats a value like astype(str) after fillna("")."""
+    if value is None:
+        return ""
+    if value.__class__ is str:
+        return value
+    if value.__class__ is float and math.isnan(value):
+        return ""
+    return str(value)
+
+
+def flatten_record(data, flattened, parent_key="", sep="/"):
+    """Flattens data into flattened, converting the leaves to text."""
+    for key, value in data.items():
+        new_key = f"{parent_key}{sep}{key}" if parent_key else key
+
+        if isinstance(value, dict):
+            flatten_record(value, flattened, new_key, sep)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, dict):
+                    flatten_record(item, flattened, f"{new_key}[{i + 1}]", sep)
+                else:
+                    flattened[f"{new_key}[{i + 1}]"] = to_text(item)
+        else:
+            flattened[new_key] = to_text(value)
+    return flattened
+
+
+def normalize_records(records, sep="/"):
+    """Returns the records flattened, with text values and the union schema.
+
+    Every returned record has every key seen in any record, in order of
+    first appearance, with "" where a record has no value.
+    """
+    schema = dict()
+    rows = []
+    for record in records:
+        row = flatten_record(record, dict(), sep=sep)
+        schema.update(row)
+        rows.append(row)
+
+    template = dict.fromkeys(schema, "")
+    for i, row in enumerate(rows):
+        # rebuilt in place so only one extra record is alive at a time
+        rows[i] = {**template, **row}
+    return rows
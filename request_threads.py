@@ -3,36 +3,21 @@ import time
 import json
 import typing
 import xml.etree.ElementTree as ET
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt5 import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
-geo_types = ["geopoint", "geoshape", "geotrace"]
-
-
-def flatten_dict(data, parent_key="", sep="/"):
-    flattened = {}
-
-    for key, value in data.items():
-        new_key = f"{parent_key}{sep}{key}" if parent_key else key
-
-        if isinstance(value, dict):
-            # Recursively flatten the dictionary
-            flattened.update(flatten_dict(value, new_key, sep=sep))
-        elif isinstance(value, list):
-            for i, item in enumerate(value):
-                if isinstance(item, dict):
-                    flattened.update(flatten_dict(item, f"{new_key}[{i + 1}]", sep=sep))
+from .http_client import cached_get, pooled_get
+from .json_stream import iter_json_records
+from .record_normalizer import normalize_records
 
-                else:
-                    flattened[f"{new_key}[{i + 1}]"] = item
-        else:
-            flattened[new_key] = value
+geo_types = ["geopoint", "geoshape", "geotrace"]
 
-    return flattened
+# Number of Ona data pages requested in parallel by OnaRequestThread
+MAX_CONCURRENT_PAGES = 4
 
 
 def retrieve_all_geofields(fields, geo_fields_set, geo_fields_dict):
@@ -58,6 +43,17 @@ def retrieve_all_geofields(fields, geo_fields_set, geo_fields_dict):
                     geo_fields_dict[cleaned_geo_field_name] = cleaned_geo_field_label
 
 
+def retrieve_field_types(fields, field_types, prefix=""):
+    """Collects {field path: question type} from a form.json children tree."""
+    for field in fields:
+        name = field.get("name", "").strip()
+        path = f"{prefix}/{name}" if prefix else name
+        if field.get("children") and field.get("type") in ("group", "repeat"):
+            retrieve_field_types(field.get("children"), field_types, path)
+        elif name and field.get("type"):
+            field_types.setdefault(path, field.get("type"))
+
+
 def fetch_data(
     url,
     auth=None,
@@ -66,44 +62,43 @@ def fetch_data(
     max_retries=5,
     backoff_factor=0.2,
     callback=None,
+    use_cache=False,
 ):
-    """Fetches data with retries and backoff logic."""
-    with requests.Session() as session:  # Use a session
-        if auth:
-            session.auth = auth  # Set Basic Auth for the session
-
-        # set headers
-        if headers:
-            session.headers.update(headers)
-
-        for attempt in range(max_retries):
-            try:
-                if params:
-                    response = session.get(url, params=params, stream=True, timeout=60)
-                else:
-                    response = session.get(url, stream=True, timeout=60)
-                return response
-            except (
-                requests.RequestException,
-                requests.ConnectionError,
-                requests.ConnectTimeout,
-                requests.ReadTimeout,
-            ) as e:
-                print(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(backoff_factor * (2**attempt))  # Exponential backoff
+    """Fetches data with retries and backoff logic.
+
+    With use_cache=True the response is served through the on-disk HTTP
+    cache and revalidated with ETag / Last-Modified; use it for metadata
+    (schemas, form versions, ...) and not for paged submission data.
+    """
+    get = cached_get if use_cache else pooled_get
+    for attempt in range(max_retries):
+        try:
+            response = get(url, auth, params=params, headers=headers)
+            return response
+        except (
+            requests.RequestException,
+            requests.ConnectionError,
+            requests.ConnectTimeout,
+            requests.ReadTimeout,
+        ) as e:
+            print(f"Attempt {attempt + 1} failed: {e}")
+            if attempt < max_retries - 1:
+                time.sleep(backoff_factor * (2**attempt))  # Exponential backoff
+            else:
+                if callback:
+                    callback.emit(str(e))
                 else:
-                    if callback:
-                        callback.emit(str(e))
-                    else:
-                        raise
+                    raise
 
 
 class OnaRequestThread(QThread):
-    data_fetched = pyqtSignal(object)  # Signal to emit the response
+    page_fetched = pyqtSignal(object)  # Signal to emit each page of records
+    data_fetched = pyqtSignal(object)  # Signal to emit the end of a full fetch
     progress_updated = pyqtSignal(object)
     error_occurred = pyqtSignal(object)  # Signal to emit errors
     no_data = pyqtSignal(object)
+    page_failed = pyqtSignal(object)  # Signal to emit per page failures
+    delta_fetched = pyqtSignal(object)  # Signal to emit incremental sync results
 
     count_and_date_fields_fetched = pyqtSignal(object)
     count_and_date_fields_error_occurred = pyqtSignal(str)
@@ -117,6 +112,8 @@ class OnaRequestThread(QThread):
         total_records=None,
         records_per_page=None,
         formID=None,
+        max_concurrent_pages=MAX_CONCURRENT_PAGES,
+        incremental=False,
     ):
         super().__init__()
         self.url = url
@@ -128,6 +125,61 @@ class OnaRequestThread(QThread):
         self.total_records = total_records
         self.records_per_page = records_per_page
         self.formID = formID
+        self.max_concurrent_pages = max(1, int(max_concurrent_pages or 1))
+        # when set, params only match new/edited records (see fetch_delta)
+        self.incremental = incremental
+
+    def fetch_page(self, page):
+        """Fetches a single page, returns a (page, data, error) tuple."""
+        params = dict(self.params or {})
+        params.update({"page": page, "page_size": self.records_per_page})
+        try:
+            res = fetch_data(
+                self.url,
+                self.auth,
+                params,
+                headers=self.headers,
+                max_retries=self.max_retries,
+                backoff_factor=self.backoff_factor,
+            )
+        except requests.RequestException as e:
+            return page, None, str(e)
+
+        if res.status_code != 200:
+            res.close()  # hand the streamed connection back to the pool
+            return page, None, f"Request Failed, status code - {res.status_code}"
+
+        try:
+            return page, list(iter_json_records(res)), None
+        except ValueError as e:
+            return page, None, f"Invalid response - {e}"
+
+    def fetch_pages(self, total_pages):
+        """Fetches pages 1..total_pages with at most max_concurrent_pages in
+        flight and emits each one with page_fetched, in page order, as soon
+        as it is in. Returns the number of records emitted.
+
+        Pages are normalized and handed over one at a time, so only the
+        pages fetched ahead of the one being emitted are held here.
+        """
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_pages) as executor:
+            results = executor.map(self.fetch_page, range(1, total_pages + 1))
+            for page, data, error in results:
+                self.progress_updated.emit(
+                    {"curr_page": page, "total_pages": total_pages}
+                )
+                if error:
+                    self.page_failed.emit({"page": page, "error": error})
+                elif data:
+                    fetched += len(data)
+                    self.page_fetched.emit(
+                        {"page": page, "records": normalize_records(data)}
+                    )
+                else:
+                    self.no_data.emit(f"No Data Available on page {page}")
+
+        return fetched
 
     def fetch_form_details(self):
         domain = self.url.split("/")[2]
@@ -154,9 +206,35 @@ class OnaRequestThread(QThread):
                 self.count_and_date_fields_error_occurred.emit("No Data Found")
         return
 
+    def fetch_delta(self):
+        """Pages through the records matched by an incremental query.
+
+        The form's total count says nothing about the size of the delta, so
+        pages are requested one after the other until a short page. A failed
+        page drops the whole delta: a partial one would still be stored and
+        advance the watermark past the records that were never fetched.
+        """
+        records = []
+        page = 1
+        while True:
+            _, data, error = self.fetch_page(page)
+            if error:
+                self.page_failed.emit({"page": page, "error": error})
+                return
+            records.extend(data or [])
+            if not data or len(data) < self.records_per_page:
+                break
+            page += 1
+
+        self.delta_fetched.emit(normalize_records(records))
+
     def run(self):
-        combined_results = []
         try:
+            if self.incremental and self.records_per_page:
+                self.fetch_form_details()
+                self.fetch_delta()
+                return
+
             # fetch data count and date fields
             data_dict = self.fetch_form_details()
             total_records = None
@@ -168,34 +246,9 @@ class OnaRequestThread(QThread):
                 total_pages = (
                     total_records + self.records_per_page - 1
                 ) // self.records_per_page
-                for page in range(1, total_pages + 1):
-                    self.progress_updated.emit(
-                        {"curr_page": page, "total_pages": total_pages}
-                    )
-                    self.params.update(
-                        {"page": page, "page_size": self.records_per_page}
-                    )
-                    res = fetch_data(
-                        self.url, self.auth, self.params, callback=self.error_occurred
-                    )
-                    if res.status_code == 200:
-                        data = res.json()
-                        if data:
-                            combined_results.extend(data)
-                        else:
-                            self.no_data.emit("No Data Available for selected Form")
-
-                if combined_results:
-                    # flattten data
-                    flattened_data = [
-                        flatten_dict(_datum) for _datum in combined_results
-                    ]
-
-                    df = pd.json_normalize(flattened_data).fillna("").astype(str)
-
-                    normalized_data = df.to_dict(orient="records")
-
-                    self.data_fetched.emit(normalized_data)
+                fetched = self.fetch_pages(total_pages)
+                if fetched:
+                    self.data_fetched.emit({"records": fetched})
                 else:
                     self.no_data.emit("No Data Available for selected Form")
             else:  # Handle unpaginated requests
@@ -205,14 +258,11 @@ class OnaRequestThread(QThread):
                 )
                 data = res.json()
                 if data:
-                    # flattten data
-                    flattened_data = [flatten_dict(_datum) for _datum in data]
-
-                    df = pd.json_normalize(flattened_data).fillna("").astype(str)
-
-                    normalized_data = df.to_dict(orient="records")
-
-                    self.data_fetched.emit(normalized_data)
+                    # flatten the data to string valued records
+                    self.page_fetched.emit(
+                        {"page": 1, "records": normalize_records(data)}
+                    )
+                    self.data_fetched.emit({"records": len(data)})
                 else:
                     self.no_data.emit("No Data Available for selected Form")
 
@@ -221,36 +271,25 @@ class OnaRequestThread(QThread):
 
     def fetch_data(self):
         """Fetches data with retries and backoff logic."""
-        with requests.Session() as session:  # Use a session
-            if self.auth:
-                session.auth = self.auth  # Set Basic Auth for the session
-
-            # set headers
-            if self.headers:
-                session.headers.update(self.headers)
-
-            for attempt in range(self.max_retries):
-                try:
-                    if self.params:
-                        response = session.get(
-                            self.url, params=self.params, stream=True, timeout=60
-                        )
-                    else:
-                        response = session.get(self.url, stream=True, timeout=60)
-                    return response
-                except (
-                    requests.RequestException,
-                    requests.ConnectionError,
-                    requests.ConnectTimeout,
-                    requests.ReadTimeout,
-                ) as e:
-                    print(f"Attempt {attempt + 1} failed: {e}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(
-                            self.backoff_factor * (2**attempt)
-                        )  # Exponential backoff
-                    else:
-                        self.error_occurred.emit(str(e))
+        for attempt in range(self.max_retries):
+            try:
+                response = pooled_get(
+                    self.url, self.auth, params=self.params, headers=self.headers
+                )
+                return response
+            except (
+                requests.RequestException,
+                requests.ConnectionError,
+                requests.ConnectTimeout,
+                requests.ReadTimeout,
+            ) as e:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(
+                        self.backoff_factor * (2**attempt)
+                    )  # Exponential backoff
+                else:
+                    self.error_occurred.emit(str(e))
 
 
 class FetchOnaFormsThread(QThread):
@@ -373,6 +412,7 @@ class FetchOnaGeoFieldsThread(QThread):
     def run(self):
         geofields_set = set()
         geofields_dict = dict()
+        field_types = dict()
 
         # fetch versions
         domain = self.url.split("/")[2]
@@ -381,7 +421,9 @@ class FetchOnaGeoFieldsThread(QThread):
         if form_id:
             _ = self.fetch_form_details()
 
-        response = fetch_data(self.url, self.auth, callback=self.error_occurred)
+        response = fetch_data(
+            self.url, self.auth, callback=self.error_occurred, use_cache=True
+        )
         if response.status_code == 200:
             versions = response.json()
             if versions:
@@ -398,7 +440,10 @@ class FetchOnaGeoFieldsThread(QThread):
                         {"curr_page": i + 1, "total_pages": total_versions}
                     )
                     res = fetch_data(
-                        version_url, self.auth, callback=self.error_occurred
+                        version_url,
+                        self.auth,
+                        callback=self.error_occurred,
+                        use_cache=True,
                     )
                     if res.status_code == 200:
                         self.progress_updated.emit(f"Done \n")
@@ -408,6 +453,7 @@ class FetchOnaGeoFieldsThread(QThread):
                             retrieve_all_geofields(
                                 fields, geofields_set, geofields_dict
                             )
+                            retrieve_field_types(fields or [], field_types)
                     else:
                         version_url = (
                             f"https://{domain}/api/v1/forms/{form_id}/form.json"
@@ -416,7 +462,10 @@ class FetchOnaGeoFieldsThread(QThread):
                             f"Unable to fetch older Form Versions, Falling back to default..."
                         )
                         res = fetch_data(
-                            version_url, self.auth, callback=self.error_occurred
+                            version_url,
+                            self.auth,
+                            callback=self.error_occurred,
+                            use_cache=True,
                         )
                         if res.status_code == 200:
                             self.progress_updated.emit(f"Done \n")
@@ -426,6 +475,7 @@ class FetchOnaGeoFieldsThread(QThread):
                                 retrieve_all_geofields(
                                     fields, geofields_set, geofields_dict
                                 )
+                                retrieve_field_types(fields, field_types)
                         else:
                             self.error_occurred.emit(
                                 f"Request Failed, status code - {res.status_code}"
@@ -436,6 +486,7 @@ class FetchOnaGeoFieldsThread(QThread):
                         {
                             "geo_fields_set": geofields_set,
                             "geo_fields_dict": geofields_dict,
+                            "field_types": field_types,
                         }
                     )
                 else:
@@ -449,17 +500,21 @@ class FetchOnaGeoFieldsThread(QThread):
                 self.progress_updated.emit(
                     f"Unable to fetch older Form Versions, Falling back to default..."
                 )
-                res = fetch_data(version_url, self.auth, callback=self.error_occurred)
+                res = fetch_data(
+                    version_url, self.auth, callback=self.error_occurred, use_cache=True
+                )
                 if res.status_code == 200:
                     self.progress_updated.emit(f"Done \n")
                     the_v = json.dumps(res.json())
                     fields = json.loads(the_v).get("children")
                     retrieve_all_geofields(fields, geofields_set, geofields_dict)
+                    retrieve_field_types(fields or [], field_types)
                     if geofields_set and geofields_dict:
                         self.data_fetched.emit(
                             {
                                 "geo_fields_set": geofields_set,
                                 "geo_fields_dict": geofields_dict,
+                                "field_types": field_types,
                             }
                         )
                     else:
@@ -0,0 +1,91 @@
+"""Benchmark of the aggregation of DHIS2 analytics rows.
+
+Compares the previous per row loop of build_dhis_feature_collection (which
+concatenated the period names of every duplicate org unit) and a plain dict
+sum with dhis_aggregation.aggregate_rows, on synthetic weekly rows, i.e. a
+yearly pull of weekly periods at facility level.
+
+Usage: python scripts/benchmark_aggregation.py [org units] [indicators] [weeks]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dhis_aggregation import aggregate_rows  # noqa: E402
+
+
+def legacy_cleaned_data(rows, meta_items):
+    # the loop of build_dhis_feature_collection before the NumPy stage
+    cleaned_data = dict()
+    for row in rows:
+        if not cleaned_data.get(row[1]):
+            cleaned_data[row[1]] = {
+                "Org ID": row[1],
+                "Org Unit": meta_items.get(row[1]).get("name"),
+                "Indicator": meta_items.get(row[0]).get("name"),
+                "Period": meta_items.get(row[2]).get("name"),
+                "Value": float(row[3]),
+            }
+        else:
+            cleaned_data[row[1]]["Value"] += float(row[3])
+            cleaned_data[row[1]]["Period"] = (
+                cleaned_data[row[1]]["Period"]
+                + ","
+                + meta_items.get(row[2]).get("name")
+            )
+    return cleaned_data
+
+
+def dict_sum(rows):
+    cleaned_data = dict()
+    for row in rows:
+        key = (row[1], row[0], row[4])
+        cleaned_data[key] = cleaned_data.get(key, 0.0) + float(row[3])
+    return [(*key, value) for key, value in cleaned_data.items()]
+
+
+def sample_rows(org_units, indicators, weeks, seed=0):
+    rng = random.Random(seed)
+    return [
+        [f"dx{dx}", f"ou{ou}", f"2024W{week}", str(rng.randint(0, 500)), "THIS_YEAR"]
+        for ou in range(org_units)
+        for dx in range(indicators)
+        for week in range(1, weeks + 1)
+    ]
+
+
+def main():
+    org_units = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    indicators = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    weeks = int(sys.argv[3]) if len(sys.argv) > 3 else 52
+
+    rows = sample_rows(org_units, indicators, weeks)
+    meta_items = {
+        key: {"name": f"name of {key}"}
+        for row in rows
+        for key in (row[0], row[1], row[2])
+    }
+    print(f"{len(rows)} rows, {org_units * indicators} groups")
+
+    if sorted(aggregate_rows(rows, "sum")) != sorted(dict_sum(rows)):
+        print("  aggregate_rows differs from the dict sum")
+
+    candidates = {
+        "previous loop": lambda: legacy_cleaned_data(rows, meta_items),
+        "dict sum": lambda: dict_sum(rows),
+    }
+    for method in ("sum", "mean", "last", "min", "max"):
+        candidates[f"aggregate_rows ({method})"] = (
+            lambda method=method: aggregate_rows(rows, method)
+        )
+    for name, function in candidates.items():
+        best = min(timeit.repeat(function, number=1, repeat=3))
+        print(f"  {name:<25} {best * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark of the normalization of Ona submissions.
+
+Compares the previous flatten_dict + pd.json_normalize(...).fillna("")
+.astype(str).to_dict("records") round trip (when pandas is installed) with
+record_normalizer.normalize_records, reporting the wall time and the peak
+memory traced while normalizing.
+
+Usage: python scripts/benchmark_normalize.py [records] [repeat instances]
+"""
+
+import gc
+import importlib.util
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_normalizer import normalize_records  # noqa: E402
+
+
+def legacy_flatten_dict(data, parent_key="", sep="/"):
+    flattened = {}
+    for key, value in data.items():
+        new_key = f"{parent_key}{sep}{key}" if parent_key else key
+        if isinstance(value, dict):
+            flattened.update(legacy_flatten_dict(value, new_key, sep=sep))
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, dict):
+                    flattened.update(
+                        legacy_flatten_dict(item, f"{new_key}[{i + 1}]", sep=sep)
+                    )
+                else:
+                    flattened[f"{new_key}[{i + 1}]"] = item
+        else:
+            flattened[new_key] = value
+    return flattened
+
+
+def legacy_normalize(records):
+    import pandas as pd
+
+    flattened_data = [legacy_flatten_dict(_datum) for _datum in records]
+    df = pd.json_normalize(flattened_data).fillna("").astype(str)
+    return df.to_dict(orient="records")
+
+
+def sample_records(count, repeats, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {
+            "_id": i,
+            "_uuid": f"{rng.getrandbits(128):032x}",
+            "_submission_time": f"2024-01-{i % 28 + 1:02d}T10:{i % 60:02d}:00",
+            "_status": "submitted_via_web",
+            "start": f"2024-01-{i % 28 + 1:02d}T09:00:00.000+03:00",
+            "location": f"{rng.uniform(-5, 5):.6f} {rng.uniform(30, 40):.6f} 0 0",
+            "household": {
+                "size": rng.randint(1, 12),
+                "head": rng.choice(["male", "female"]),
+                "income": rng.uniform(0, 1000),
+            },
+            "_attachments": [],
+            "_tags": ["a", "b"] if i % 7 == 0 else [],
+        }
+        if i % 3 == 0:
+            record["members"] = [
+                {"members/age": rng.randint(0, 90), "members/vaccinated": "yes"}
+                for _ in range(rng.randint(1, repeats))
+            ]
+        if i % 10 == 0:
+            record["comment"] = None
+        records.append(record)
+    return records
+
+
+def measure(function, records):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function(records)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    records = sample_records(count, repeats)
+    candidates = {"record_normalizer.normalize_records": normalize_records}
+    if importlib.util.find_spec("pandas"):
+        candidates["pandas json_normalize round trip"] = legacy_normalize
+    else:
+        print("pandas is not installed, skipping the previous implementation")
+
+    print(f"{count} records, up to {repeats} repeat instances")
+    results = dict()
+    for name, function in candidates.items():
+        result, elapsed, peak = measure(function, records)
+        results[name] = result
+        print(f"  {name:<40} {elapsed:8.2f} s {peak / 1024 / 1024:9.1f} MB peak")
+        del result
+
+    if len(results) > 1:
+        new, old = results.values()
+        differing = {
+            key
+            for new_row, old_row in zip(new, old)
+            for key in old_row
+            if new_row.get(key) != old_row[key]
+        }
+        # pandas turns integer columns with gaps into floats ("61.0")
+        print(f"  columns with differing values: {sorted(differing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Microbenchmark of the WKT parsing used for ODK Central submissions.
+
+Compares the previous regex based is_valid_wkt / wkt_to_geometry_obj pair
+(copied below, as it was in AfpolGIS) with wkt_parser.parse_wkt and
+wkt_parser.parse_wkt_batch on a synthetic page of geopoints, geotraces and
+geoshapes.
+
+Usage: python scripts/benchmark_wkt.py [records] [vertices] [repeats]
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wkt_parser import parse_wkt, parse_wkt_batch  # noqa: E402
+
+
+def legacy_is_valid_wkt(wkt_string):
+    valid_geometries = [
+        "POINT",
+        "LINESTRING",
+        "POLYGON",
+        "MULTIPOINT",
+        "MULTILINESTRING",
+        "MULTIPOLYGON",
+    ]
+    match = re.match(r"^\s*(\w+)\s*\((.*)\)\s*$", wkt_string, re.IGNORECASE)
+    if not match:
+        return False
+    geometry_type, coordinates_part = match.groups()
+    return geometry_type.upper() in valid_geometries
+
+
+def legacy_wkt_to_geometry_obj(wkt_string):
+    wkt = wkt_string.strip()
+    geometry_type, coords = wkt.split("(", 1)
+    geometry_type = geometry_type.strip().upper()
+    coords = coords.strip().rstrip(")").lstrip("(")
+
+    if geometry_type == "POINT":
+        coordinate_values = coords.split()
+        coordinates = [float(coordinate_values[0]), float(coordinate_values[1])]
+        return {"type": "Point", "coordinates": coordinates}
+
+    if geometry_type == "LINESTRING":
+        coordinate_values = re.findall(r"-?\d+\.?\d*", coords)
+        coordinates = [
+            [float(coordinate_values[i]), float(coordinate_values[i + 1])]
+            for i in range(
+                0,
+                len(coordinate_values),
+                2 if len(coordinate_values) % 3 != 0 else 3,
+            )
+        ]
+        return {"type": "LineString", "coordinates": coordinates}
+
+    if geometry_type == "POLYGON":
+        rings = coords.split("), (")
+        rings = [ring.replace("(", "").replace(")", "").strip() for ring in rings]
+        coordinates = [
+            [[float(pair.split()[0]), float(pair.split()[1])] for pair in ring.split(",")]
+            for ring in rings
+        ]
+        return {"type": "Polygon", "coordinates": coordinates}
+
+    raise ValueError(f"Unsupported geometry type: {geometry_type}")
+
+
+def legacy_parse(values):
+    return [
+        legacy_wkt_to_geometry_obj(value) if legacy_is_valid_wkt(value) else None
+        for value in values
+    ]
+
+
+def coordinate_text(rng):
+    lon = rng.uniform(-180, 180)
+    lat = rng.uniform(-90, 90)
+    return f"{lon:.7f} {lat:.7f} {rng.uniform(0, 3000):.1f}"
+
+
+def sample_page(records, vertices, seed=0):
+    rng = random.Random(seed)
+    page = []
+    for i in range(records):
+        kind = i % 3
+        if kind == 0:
+            page.append(f"POINT ({coordinate_text(rng)})")
+        elif kind == 1:
+            line = ", ".join(coordinate_text(rng) for _ in range(max(vertices, 2)))
+            page.append(f"LINESTRING ({line})")
+        else:
+            ring = [coordinate_text(rng) for _ in range(max(vertices - 1, 3))]
+            ring.append(ring[0])
+            page.append(f"POLYGON (({', '.join(ring)}))")
+    return page
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    vertices = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    page = sample_page(records, vertices)
+    candidates = {
+        "legacy is_valid_wkt + wkt_to_geometry_obj": lambda: legacy_parse(page),
+        "wkt_parser.parse_wkt": lambda: [parse_wkt(value) for value in page],
+        "wkt_parser.parse_wkt_batch": lambda: parse_wkt_batch(page),
+    }
+
+    expected = legacy_parse(page)
+    print(f"{records} records, {vertices} vertices per trace / shape")
+    for name, function in candidates.items():
+        if function() != expected:
+            print(f"  {name}: results differ from the legacy parser")
+        best = min(timeit.repeat(function, number=1, repeat=repeats))
+        print(f"  {name:<45} {best * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
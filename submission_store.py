@@ -0,0 +1,238 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Keys identifying a submission, in order of preference
+SUBMISSION_ID_KEYS = ("_id", "__id", "_uuid", "meta/instanceID", "id", "Org ID")
+# Keys holding the submission / last edit timestamps (nested or flattened)
+SUBMITTED_AT_KEYS = ("__system/submissionDate", "_submission_time")
+MODIFIED_AT_KEYS = ("__system/updatedAt", "_date_modified", "_last_edited")
+
+SUBMISSION_STORE_FILE = "submissions.sqlite"
+
+
+def record_value(record, path):
+    """Looks up a "a/b" path in a record, nested or already flattened."""
+    if path in record:
+        return record.get(path)
+
+    value = record
+    for key in path.split("/"):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def submission_id(record):
+    """Returns the stable id of a submission.
+
+    Records without any of SUBMISSION_ID_KEYS (e.g. GTS rows) fall back to a
+    hash of their content.
+    """
+    for key in SUBMISSION_ID_KEYS:
+        value = record_value(record, key)
+        if value not in (None, ""):
+            return str(value)
+    content = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def submission_keys(records):
+    """Returns a unique key per record, numbering repeated submission ids.
+
+    A submission with geo data inside a repeat yields several features, the
+    n-th of which is keyed "<submission id>#<n>".
+    """
+    seen = dict()
+    keys = []
+    for record in records:
+        key = submission_id(record)
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        keys.append(f"{key}#{count}" if count else key)
+    return keys
+
+
+def json_default(value):
+    """Serialises NumPy coordinate arrays (see geo_parser) and other values."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def first_value(record, keys):
+    for key in keys:
+        value = record_value(record, key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def numeric_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SubmissionStore:
+    """Persists fetched submissions and their geometries in SQLite.
+
+    Rows are keyed by (server, form, geo_field, submission id) so a fetch
+    upserts into what was stored by previous fetches, and survive QGIS
+    restarts. The submission and last edit timestamps and the numeric _id
+    are kept in their own columns to serve as sync watermarks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS submissions (
+                    server TEXT NOT NULL,
+                    form TEXT NOT NULL,
+                    geo_field TEXT NOT NULL,
+                    submission_id TEXT NOT NULL,
+                    numeric_id INTEGER,
+                    submitted_at TEXT,
+                    modified_at TEXT,
+                    record TEXT NOT NULL,
+                    features TEXT NOT NULL,
+                    stored_at REAL,
+                    PRIMARY KEY (server, form, geo_field, submission_id)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS submissions_modified_at "
+                "ON submissions (server, form, geo_field, modified_at)"
+            )
+
+    @contextlib.contextmanager
+    def connect(self):
+        """Opens a connection that commits (or rolls back) and is closed on exit."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, server, form, geo_field, records=None, features=None):
+        """Inserts or replaces submissions and their features.
+
+        Features are matched to their submission through the id in their
+        properties. When records is None (connectors that only produce
+        features) the feature properties are stored as the records.
+        Returns the number of submissions written.
+        """
+        features = features or []
+        features_by_id = dict()
+        for feature in features:
+            key = submission_id(feature.get("properties") or {})
+            features_by_id.setdefault(key, []).append(feature)
+
+        if records is None:
+            records = [feature.get("properties") or {} for feature in features]
+
+        rows = dict()
+        stored_at = time.time()
+        for record in records:
+            key = submission_id(record)
+            submitted_at = first_value(record, SUBMITTED_AT_KEYS)
+            rows[key] = (
+                server,
+                form,
+                geo_field,
+                key,
+                numeric_id(record_value(record, "_id")),
+                submitted_at,
+                first_value(record, MODIFIED_AT_KEYS) or submitted_at,
+                json.dumps(record, default=str),
+                json.dumps(features_by_id.get(key, []), default=json_default),
+                stored_at,
+            )
+
+        if not rows:
+            return 0
+
+        with self.lock, self.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO submissions "
+                "(server, form, geo_field, submission_id, numeric_id, submitted_at, "
+                "modified_at, record, features, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                list(rows.values()),
+            )
+        return len(rows)
+
+    def delete(self, server, form, geo_field, submission_ids):
+        with self.lock, self.connect() as conn:
+            conn.executemany(
+                "DELETE FROM submissions WHERE server = ? AND form = ? "
+                "AND geo_field = ? AND submission_id = ?",
+                [(server, form, geo_field, str(key)) for key in submission_ids],
+            )
+
+    def clear(self, server, form, geo_field):
+        with self.lock, self.connect() as conn:
+            conn.execute(
+                "DELETE FROM submissions WHERE server = ? AND form = ? "
+                "AND geo_field = ?",
+                (server, form, geo_field),
+            )
+
+    def count(self, server, form, geo_field):
+        with self.connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM submissions WHERE server = ? AND form = ? "
+                "AND geo_field = ?",
+                (server, form, geo_field),
+            ).fetchone()[0]
+
+    def iter_rows(self, server, form, geo_field):
+        with self.connect() as conn:
+            cursor = conn.execute(
+                "SELECT submission_id, record, features FROM submissions "
+                "WHERE server = ? AND form = ? AND geo_field = ? "
+                "ORDER BY numeric_id, submitted_at, submission_id",
+                (server, form, geo_field),
+            )
+            for key, record, features in cursor:
+                yield key, json.loads(record), json.loads(features)
+
+    def records(self, server, form, geo_field):
+        return [record for _, record, _ in self.iter_rows(server, form, geo_field)]
+
+    def feature_collection(self, server, form, geo_field):
+        """Rebuilds the GeoJSON FeatureCollection of everything stored."""
+        feature_collection = {"type": "FeatureCollection", "features": []}
+        for _, _, features in self.iter_rows(server, form, geo_field):
+            feature_collection["features"].extend(features)
+        return feature_collection
+
+    def watermark(self, server, form, geo_field):
+        """Returns the highest _id and timestamps stored for a form."""
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(numeric_id), MAX(submitted_at), MAX(modified_at), "
+                "COUNT(*) FROM submissions WHERE server = ? AND form = ? "
+                "AND geo_field = ?",
+                (server, form, geo_field),
+            ).fetchone()
+        max_id, submitted_at, modified_at, count = row
+        return {
+            "max_id": max_id,
+            "submitted_at": submitted_at,
+            "modified_at": modified_at,
+            "count": count,
+        }
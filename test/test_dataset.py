@@ -0,0 +1,198 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from .utilities import has_module, plugin_module
+
+if has_module("PyQt5") and has_module("numpy"):
+    from PyQt5.QtCore import QVariant
+
+    dataset = plugin_module("dataset")
+    submission_store = plugin_module("submission_store")
+else:
+    dataset = None
+
+GEOMETRIES = [
+    {"type": "Point", "coordinates": [36.8, -1.3]},
+    {"type": "LineString", "coordinates": [[0.0, 0.0], [1.0, 1.0], [2.0, 0.5]]},
+    {
+        "type": "Polygon",
+        "coordinates": [
+            [[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 0.0]],
+            [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 1.0]],
+        ],
+    },
+    {"type": "MultiPoint", "coordinates": [[1.0, 2.0], [3.0, 4.0]]},
+    {
+        "type": "MultiLineString",
+        "coordinates": [[[0.0, 0.0], [1.0, 1.0]], [[2.0, 2.0], [3.0, 3.0]]],
+    },
+    {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+            [[[5.0, 5.0], [6.0, 5.0], [6.0, 6.0], [5.0, 5.0]]],
+        ],
+    },
+]
+
+
+def to_lists(value):
+    """Converts the NumPy coordinates of a rebuilt geometry to lists."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return [to_lists(item) for item in value]
+
+
+def point(x, y):
+    return {"type": "Point", "coordinates": [x, y]}
+
+
+@unittest.skipUnless(dataset, "PyQt5 or NumPy is not installed")
+class ColumnarDatasetTest(unittest.TestCase):
+    def test_geometries_round_trip(self):
+        data = dataset.ColumnarDataset()
+        for index, geometry in enumerate(GEOMETRIES):
+            data.append({"_id": index}, [geometry])
+
+        self.assertEqual(data.feature_count(), len(GEOMETRIES))
+        for geometry, rebuilt in zip(GEOMETRIES, data.iter_features()):
+            self.assertEqual(rebuilt["geometry"]["type"], geometry["type"])
+            self.assertEqual(
+                to_lists(rebuilt["geometry"]["coordinates"]), geometry["coordinates"]
+            )
+        self.assertEqual(data.geometry_type(2), "Polygon")
+
+    def test_z_values_are_dropped(self):
+        data = dataset.ColumnarDataset()
+        data.append(
+            {},
+            [{"type": "LineString", "coordinates": [[1.0, 2.0, 3.0], [4.0, 5.0]]}],
+        )
+        geometry = next(data.iter_features())["geometry"]
+        self.assertEqual(to_lists(geometry["coordinates"]), [[1.0, 2.0], [4.0, 5.0]])
+
+    def test_unsupported_geometry(self):
+        data = dataset.ColumnarDataset()
+        with self.assertRaises(ValueError):
+            data.append({}, [{"type": "GeometryCollection", "geometries": []}])
+
+    def test_records_keep_their_values(self):
+        records = [
+            {"_id": 1, "name": "a", "flag": True, "count": 1, "tags": ["x"]},
+            {"_id": 2, "name": "a", "extra": None},
+            {"_id": 3, "flag": 1, "count": 1.0},
+        ]
+        data = dataset.ColumnarDataset()
+        for record in records:
+            data.append(record)
+
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data.feature_count(), 0)
+        self.assertEqual(
+            list(data.iter_records()),
+            [
+                {"_id": 1, "name": "a", "flag": True, "count": 1, "tags": ["x"]},
+                {"_id": 2, "name": "a"},
+                {"_id": 3, "flag": 1, "count": 1.0},
+            ],
+        )
+        # True / 1 / 1.0 are kept apart rather than merged by their hash
+        self.assertIs(data.record(0)["flag"], True)
+        self.assertIsInstance(data.record(2)["count"], float)
+
+    def test_features_without_the_geometry_field(self):
+        data = dataset.ColumnarDataset("location")
+        data.append({"_id": 1, "location": "1 2 0 0"}, [point(2, 1)])
+        data.append({"_id": 2, "location": ""}, [None])
+
+        self.assertEqual(data.feature_count(), 1)
+        self.assertEqual(list(data.feature_field_names()), ["_id"])
+        self.assertEqual(
+            [feature["properties"] for feature in data.iter_features()], [{"_id": 1}]
+        )
+        self.assertEqual(data.record(0)["location"], "1 2 0 0")
+
+    def test_feature_keys_match_submission_keys(self):
+        data = dataset.ColumnarDataset()
+        data.append({"_id": 7}, [point(0, 0), point(1, 1)])
+        data.append({"_id": 8}, [])
+        data.append({"__id": "uuid:9"}, [point(2, 2)])
+        data.append({"name": "no id"}, [point(3, 3)])
+
+        features = list(data.iter_features())
+        self.assertEqual(
+            data.feature_keys(),
+            submission_store.submission_keys(
+                [feature["properties"] for feature in features]
+            ),
+        )
+        self.assertEqual(data.feature_keys()[:3], ["7", "7#1", "uuid:9"])
+
+    def test_field_types(self):
+        data = dataset.ColumnarDataset()
+        data.append({"age": "12", "phone": "0712", "visit": "2024-01-31"})
+        data.append({"age": "13.5", "phone": "0713", "visit": ""})
+        self.assertEqual(
+            data.field_types({"visit": QVariant.String}),
+            {
+                "age": QVariant.Double,
+                "phone": QVariant.String,
+                "visit": QVariant.String,
+            },
+        )
+
+    def test_widened_field_types(self):
+        data = dataset.ColumnarDataset()
+        for value in ["1", "2", "3", "12a"]:
+            data.append({"count": value, "flag": "true", "size": value[0]})
+        field_types = data.field_types(sample_size=3)
+        self.assertEqual(field_types["count"], QVariant.LongLong)
+        self.assertEqual(
+            data.widened_field_types(field_types), {"count": QVariant.String}
+        )
+        self.assertEqual(
+            data.widened_field_types({"flag": QVariant.LongLong}),
+            {"flag": QVariant.String},
+        )
+
+    def test_from_store_rows(self):
+        rows = [
+            ("1", {"_id": 1}, [{"geometry": point(0, 0)}, {"geometry": point(1, 1)}]),
+            ("2", {"_id": 2}, []),
+        ]
+        data = dataset.ColumnarDataset.from_store_rows(rows)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data.feature_keys(), ["1", "1#1"])
+
+    def test_as_dataset(self):
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": point(1, 2), "properties": {"a": 1}}
+            ],
+        }
+        data = dataset.as_dataset(collection)
+        self.assertIsInstance(data, dataset.ColumnarDataset)
+        self.assertIs(dataset.as_dataset(data), data)
+        self.assertEqual(list(data.iter_records()), [{"a": 1}])
+
+    def test_write_csv(self):
+        data = dataset.ColumnarDataset()
+        data.append({"a": 1, "b": "x"})
+        data.append({"b": "y", "c": None})
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "data.csv")
+            data.write_csv(path)
+            with open(path, newline="", encoding="utf-8") as csvfile:
+                rows = list(csv.reader(csvfile))
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(rows, [["a", "b", "c"], ["1", "x", ""], ["", "y", ""]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from .utilities import has_module, plugin_module
+
+dhis_aggregation = plugin_module("dhis_aggregation") if has_module("numpy") else None
+
+# [dx, ou, pe, value, selected period] rows of a LAST_4_WEEKS pull
+ROWS = [
+    ["dx1", "ouA", "2024W3", "5", "LAST_4_WEEKS"],
+    ["dx1", "ouA", "2024W1", "1", "LAST_4_WEEKS"],
+    ["dx1", "ouB", "2024W1", "7", "LAST_4_WEEKS"],
+    ["dx2", "ouA", "2024W2", "2", "LAST_4_WEEKS"],
+    ["dx1", "ouA", "2024W2", "3", "LAST_4_WEEKS"],
+    ["dx1", "ouB", "2024W4", "n/a", "LAST_4_WEEKS"],
+]
+PERIOD_ORDER = ["2024W1", "2024W2", "2024W3", "2024W4"]
+
+
+def aggregate(method, rows=ROWS, period_order=None):
+    return {
+        (ou, dx, period): value
+        for ou, dx, period, value in dhis_aggregation.aggregate_rows(
+            rows, method, period_order
+        )
+    }
+
+
+@unittest.skipUnless(dhis_aggregation, "NumPy is not installed")
+class AggregateRowsTest(unittest.TestCase):
+    def test_sum(self):
+        self.assertEqual(
+            dhis_aggregation.aggregate_rows(ROWS),
+            [
+                ("ouA", "dx1", "LAST_4_WEEKS", 9.0),
+                ("ouB", "dx1", "LAST_4_WEEKS", 7.0),
+                ("ouA", "dx2", "LAST_4_WEEKS", 2.0),
+            ],
+        )
+
+    def test_mean_min_max(self):
+        self.assertEqual(aggregate("mean")[("ouA", "dx1", "LAST_4_WEEKS")], 3.0)
+        self.assertEqual(aggregate("min")[("ouA", "dx1", "LAST_4_WEEKS")], 1.0)
+        self.assertEqual(aggregate("max")[("ouA", "dx1", "LAST_4_WEEKS")], 5.0)
+        # the non numeric value of ouB is ignored rather than counted
+        self.assertEqual(aggregate("mean")[("ouB", "dx1", "LAST_4_WEEKS")], 7.0)
+
+    def test_last_follows_the_period_order(self):
+        # the rows are not in chronological order, W3 is the latest period
+        self.assertEqual(
+            aggregate("last", period_order=PERIOD_ORDER),
+            {
+                ("ouA", "dx1", "LAST_4_WEEKS"): 5.0,
+                ("ouB", "dx1", "LAST_4_WEEKS"): 7.0,
+                ("ouA", "dx2", "LAST_4_WEEKS"): 2.0,
+            },
+        )
+        reversed_order = list(reversed(PERIOD_ORDER))
+        self.assertEqual(
+            aggregate("last", period_order=reversed_order)[
+                ("ouA", "dx1", "LAST_4_WEEKS")
+            ],
+            1.0,
+        )
+
+    def test_last_without_period_order_takes_the_last_row(self):
+        self.assertEqual(aggregate("last")[("ouA", "dx1", "LAST_4_WEEKS")], 3.0)
+
+    def test_last_puts_unlisted_periods_after_the_listed_ones(self):
+        rows = [
+            ["dx1", "ouA", "2024W9", "8", "THIS_YEAR"],
+            ["dx1", "ouA", "2024W2", "2", "THIS_YEAR"],
+            ["dx1", "ouA", "2024W1", "1", "THIS_YEAR"],
+        ]
+        self.assertEqual(
+            aggregate("last", rows, ["2024W1", "2024W2"]),
+            {("ouA", "dx1", "THIS_YEAR"): 8.0},
+        )
+
+    def test_selected_periods_are_kept_apart(self):
+        rows = [
+            ["dx1", "ouA", "2024W1", "1", "LAST_4_WEEKS"],
+            ["dx1", "ouA", "2024W1", "1", "THIS_YEAR"],
+            ["dx1", "ouA", "2024W20", "4", "THIS_YEAR"],
+        ]
+        self.assertEqual(
+            aggregate("sum", rows),
+            {("ouA", "dx1", "LAST_4_WEEKS"): 1.0, ("ouA", "dx1", "THIS_YEAR"): 5.0},
+        )
+
+    def test_no_numeric_values(self):
+        self.assertEqual(dhis_aggregation.aggregate_rows([]), [])
+        self.assertEqual(
+            dhis_aggregation.aggregate_rows([["dx1", "ouA", "2024W1", "", "W"]]), []
+        )
+
+    def test_unsupported_method(self):
+        with self.assertRaises(ValueError):
+            dhis_aggregation.aggregate_rows(ROWS, "median")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from .utilities import has_module, plugin_module
+
+dhis_store = plugin_module("dhis_store")
+afpolgis = plugin_module("afpolgis") if has_module("qgis") else None
+
+SERVER = "play.example.org"
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+
+def data_set(key, name, last_updated):
+    return {
+        "id": key,
+        "name": name,
+        "lastUpdated": last_updated,
+        "dataSetElements": [{"id": f"{key}-de", "name": f"{name} element"}],
+    }
+
+
+class MetadataStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = dhis_store.DhisStore(
+            os.path.join(self.directory, dhis_store.DHIS_STORE_FILE)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_metadata_upsert_and_order(self):
+        self.store.save_metadata(
+            SERVER,
+            "dataSets",
+            [
+                {"id": "ds1", "name": "malaria", "lastUpdated": "2024-01-02T00:00:00"},
+                {"id": "ds2", "name": "ANC", "lastUpdated": "2024-03-01T00:00:00"},
+                {"name": "no id"},
+            ],
+        )
+        self.store.save_metadata(
+            SERVER,
+            "dataSets",
+            [{"id": "ds1", "name": "Malaria", "lastUpdated": "2024-04-01T00:00:00"}],
+        )
+        self.assertEqual(
+            [item["name"] for item in self.store.metadata_items(SERVER, "dataSets")],
+            ["ANC", "Malaria"],
+        )
+        self.assertEqual(
+            self.store.metadata_last_updated(SERVER, "dataSets"),
+            "2024-04-01T00:00:00",
+        )
+        self.assertEqual(
+            self.store.metadata_item(SERVER, "dataSets", "ds2")["name"], "ANC"
+        )
+        self.assertIsNone(self.store.metadata_item(SERVER, "dataSets", "missing"))
+
+    def test_metadata_kinds_are_kept_apart(self):
+        self.store.save_metadata(SERVER, "dataSets", [{"id": "x", "name": "a"}])
+        self.assertEqual(self.store.metadata_items(SERVER, "programs"), [])
+        self.assertIsNone(self.store.metadata_last_updated(SERVER, "programs"))
+
+    def test_prune_metadata(self):
+        items = [{"id": key, "name": key} for key in ("a", "b", "c")]
+        self.store.save_metadata(SERVER, "programs", items)
+        self.store.save_metadata(SERVER, "dataSets", items)
+        self.store.prune_metadata(SERVER, "programs", ["a", "c"])
+        self.assertEqual(
+            [item["id"] for item in self.store.metadata_items(SERVER, "programs")],
+            ["a", "c"],
+        )
+        self.assertEqual(len(self.store.metadata_items(SERVER, "dataSets")), 3)
+
+    def test_clear_metadata(self):
+        self.store.save_metadata(SERVER, "dataSets", [{"id": "a", "name": "a"}])
+        self.store.clear_metadata(SERVER)
+        self.assertEqual(self.store.metadata_items(SERVER, "dataSets"), [])
+
+
+@unittest.skipUnless(afpolgis, "QGIS is not available")
+class SyncDhisMetadataTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.plugin = afpolgis.AfpolGIS.__new__(afpolgis.AfpolGIS)
+        self.plugin.dhis_store = dhis_store.DhisStore(
+            os.path.join(self.directory, dhis_store.DHIS_STORE_FILE)
+        )
+        self.plugin.dlg = mock.MagicMock()
+        self.plugin.fetch_with_retries = mock.MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def sync(self, responses):
+        self.plugin.fetch_with_retries.side_effect = responses
+        return self.plugin.sync_dhis_metadata(
+            SERVER, None, "dataSets", "dataSetElements"
+        )
+
+    def request_params(self, call):
+        return dict(call.args[2])
+
+    def stored_names(self):
+        return [
+            item["name"]
+            for item in self.plugin.dhis_store.metadata_items(SERVER, "dataSets")
+        ]
+
+    def test_first_sync_fetches_every_page(self):
+        error = self.sync(
+            [
+                FakeResponse(
+                    {
+                        "pager": {"pageCount": 2, "nextPage": "page=2"},
+                        "dataSets": [data_set("a", "ANC", "2024-01-01T00:00:00")],
+                    }
+                ),
+                FakeResponse(
+                    {
+                        "pager": {"pageCount": 2},
+                        "dataSets": [data_set("b", "EPI", "2024-02-01T00:00:00")],
+                    }
+                ),
+            ]
+        )
+        self.assertIsNone(error)
+        calls = self.plugin.fetch_with_retries.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertNotIn("filter", self.request_params(calls[0]))
+        self.assertEqual(self.request_params(calls[1])["page"], 2)
+        self.assertEqual(self.stored_names(), ["ANC", "EPI"])
+
+    def test_incremental_sync_filters_and_prunes(self):
+        self.plugin.dhis_store.save_metadata(
+            SERVER,
+            "dataSets",
+            [
+                data_set("a", "ANC", "2024-01-01T00:00:00"),
+                data_set("b", "EPI", "2024-02-01T00:00:00"),
+                data_set("c", "Malaria", "2024-03-01T00:00:00"),
+            ],
+        )
+        error = self.sync(
+            [
+                # only what changed since the newest stored lastUpdated
+                FakeResponse(
+                    {
+                        "pager": {"pageCount": 1},
+                        "dataSets": [data_set("a", "ANC v2", "2024-04-01T00:00:00")],
+                    }
+                ),
+                # the ids still on the server, "b" was deleted
+                FakeResponse({"dataSets": [{"id": "a"}, {"id": "c"}]}),
+            ]
+        )
+        self.assertIsNone(error)
+        first, second = self.plugin.fetch_with_retries.call_args_list
+        self.assertEqual(
+            self.request_params(first)["filter"], "lastUpdated:gt:2024-03-01T00:00:00"
+        )
+        self.assertEqual(
+            self.request_params(second), {"fields": "id", "paging": "false"}
+        )
+        self.assertEqual(self.stored_names(), ["ANC v2", "Malaria"])
+        self.assertEqual(
+            self.plugin.dhis_store.metadata_last_updated(SERVER, "dataSets"),
+            "2024-04-01T00:00:00",
+        )
+
+    def test_failed_id_listing_keeps_the_stored_objects(self):
+        self.plugin.dhis_store.save_metadata(
+            SERVER, "dataSets", [data_set("a", "ANC", "2024-01-01T00:00:00")]
+        )
+        error = self.sync(
+            [
+                FakeResponse({"pager": {"pageCount": 1}, "dataSets": []}),
+                FakeResponse({}, status_code=500),
+            ]
+        )
+        self.assertIsNone(error)
+        self.assertEqual(self.stored_names(), ["ANC"])
+
+    def test_failed_page(self):
+        error = self.sync([FakeResponse({}, status_code=503)])
+        self.assertEqual(error, "Error fetching data: 503")
+        self.assertEqual(self.stored_names(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
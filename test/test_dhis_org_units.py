@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from .utilities import has_module, plugin_module
+
+afpolgis = plugin_module("afpolgis") if has_module("qgis") else None
+
+SERVER = "dhis.example.org"
+POLYGON = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [0, 0]]]}
+
+
+def org_unit_page(page, total):
+    return {
+        "pager": {"pageSize": 1, "total": total},
+        "organisationUnits": [
+            {
+                "id": f"ou{page}",
+                "name": f"Unit {page}",
+                "geometry": {"type": "Point", "coordinates": [page, 0]},
+            }
+        ],
+    }
+
+
+@unittest.skipUnless(afpolgis, "QGIS is not available")
+class FetchDhisOrgUnitsTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin = afpolgis.AfpolGIS.__new__(afpolgis.AfpolGIS)
+        self.plugin.dlg = mock.MagicMock()
+        self.plugin.dlg.ComboDhisAdminLevels.currentText.return_value = "Level 2"
+        self.plugin.dlg.dhis_api_url.text.return_value = SERVER
+        self.plugin.iface = mock.MagicMock()
+        self.plugin.load_data_to_qgis = mock.MagicMock()
+        self.directory = tempfile.mkdtemp()
+        self.plugin.dhis_store = afpolgis.DhisStore(
+            os.path.join(self.directory, afpolgis.DHIS_STORE_FILE)
+        )
+        self.plugin.dhis_hierarchies = dict()
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fetch(self, failures):
+        """Runs a three page fetch where page N fails failures[N] times."""
+        failures = dict(failures)
+
+        def fetch_page(url, auth, level, page):
+            self.calls.append(page)
+            if failures.get(page):
+                failures[page] -= 1
+                return page, None, "Error fetching data: 503"
+            return page, org_unit_page(page, 3), None
+
+        self.plugin.fetch_dhis_org_unit_page = fetch_page
+        with mock.patch.object(afpolgis.time, "sleep"):
+            self.plugin.fetch_dhis_org_units(SERVER, "user", "pass")
+        return self.org_unit_names()
+
+    def org_unit_names(self):
+        model = self.plugin.dlg.comboDhisOrgUnits.setModel.call_args[0][0]
+        return [model.item(row).text() for row in range(model.rowCount())]
+
+    def load_hierarchy(self):
+        """Stores a hierarchy of 1 root and 2 level 2 units, as if fetched
+        by the org unit index, and loads it in memory.
+        """
+        units = [
+            {"id": "R", "name": "Root", "level": 1, "path": "/R"},
+            {"id": "B", "name": "Beta", "level": 2, "path": "/R/B", "parent": "R"},
+            {"id": "A", "name": "Alpha", "level": 2, "path": "/R/A", "parent": "R"},
+        ]
+        self.plugin.dhis_store.save_org_units(SERVER, units)
+        self.plugin.dhis_store.save_geo_features(
+            SERVER,
+            2,
+            [afpolgis.geo_feature({"id": "A", "geometry": POLYGON})],
+        )
+        return self.plugin.dhis_org_unit_hierarchy(mock.MagicMock(), SERVER, None)
+
+    def test_failed_pages_are_retried(self):
+        names = self.fetch({2: 2})
+        self.assertEqual(names, ["Unit 1", "Unit 2", "Unit 3"])
+        self.assertEqual(self.calls.count(2), 3)
+        self.plugin.iface.messageBar().pushMessage.assert_not_called()
+
+    def test_missing_pages_are_reported(self):
+        names = self.fetch({3: afpolgis.DHIS_ORG_UNIT_PAGE_RETRIES + 1})
+        self.assertEqual(names, ["Unit 1", "Unit 2"])
+        self.assertEqual(self.calls.count(3), afpolgis.DHIS_ORG_UNIT_PAGE_RETRIES + 1)
+        message = self.plugin.iface.messageBar().pushMessage.call_args
+        self.assertEqual(message.kwargs["level"], afpolgis.Qgis.Warning)
+        self.assertIn("1 of 3 org unit pages", message.args[1])
+
+    def test_org_units_are_served_from_the_hierarchy(self):
+        self.load_hierarchy()
+        self.plugin.fetch_dhis_org_unit_page = mock.MagicMock()
+
+        self.plugin.fetch_dhis_org_units(SERVER, "user", "pass")
+
+        self.plugin.fetch_dhis_org_unit_page.assert_not_called()
+        self.assertEqual(self.org_unit_names(), ["Alpha", "Beta"])
+        collection = self.plugin.load_data_to_qgis.call_args[0][0]
+        self.assertEqual(
+            [feature["geometry"] for feature in collection["features"]], [POLYGON]
+        )
+
+    def test_level_change_lists_the_level_from_the_hierarchy(self):
+        self.plugin.on_dhis_combo_admin_level_change()
+        self.assertEqual(self.org_unit_names(), [])
+
+        self.load_hierarchy()
+        self.plugin.dlg.ComboDhisAdminLevels.currentText.return_value = "Level 1"
+        self.plugin.on_dhis_combo_admin_level_change()
+        self.assertEqual(self.org_unit_names(), ["Root"])
+
+    def test_hierarchy_expires(self):
+        hierarchy = self.load_hierarchy()
+        self.assertIs(self.plugin.cached_dhis_org_unit_hierarchy(SERVER), hierarchy)
+
+        fetched_at = time.time() - afpolgis.ORG_UNITS_TTL - 1
+        self.plugin.dhis_hierarchies[SERVER] = (fetched_at, hierarchy)
+        self.assertIsNone(self.plugin.cached_dhis_org_unit_hierarchy(SERVER))
+        self.assertNotIn(SERVER, self.plugin.dhis_hierarchies)
+
+
+if __name__ == "__main__":
+    unittest.main()
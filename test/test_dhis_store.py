@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from .utilities import is_closed, plugin_module, tracked_connections
+
+dhis_store = plugin_module("dhis_store")
+
+SERVER = "play.example.org"
+
+
+def geo_feature(key, level="2"):
+    return {"id": key, "na": f"Unit {key}", "le": level, "ty": 1, "co": "[1, 2]"}
+
+
+class DhisStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = dhis_store.DhisStore(
+            os.path.join(self.directory, "store", dhis_store.DHIS_STORE_FILE)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_geo_features_per_level(self):
+        self.assertIsNone(self.store.geo_features(SERVER, 2))
+
+        self.store.save_geo_features(SERVER, 2, [geo_feature("a"), geo_feature("b")])
+        self.store.save_geo_features(SERVER, 3, [geo_feature("c", "3")])
+        self.assertEqual(
+            self.store.geo_features(SERVER, "2"),
+            {"a": geo_feature("a"), "b": geo_feature("b")},
+        )
+        self.assertEqual(list(self.store.geo_features(SERVER, 3)), ["c"])
+        self.assertIsNone(self.store.geo_features("other.example.org", 2))
+
+    def test_geo_features_are_replaced(self):
+        self.store.save_geo_features(SERVER, 2, [geo_feature("a"), geo_feature("b")])
+        self.store.save_geo_features(SERVER, 2, [geo_feature("b"), {"na": "no id"}])
+        self.assertEqual(list(self.store.geo_features(SERVER, 2)), ["b"])
+
+    def test_a_level_without_features_is_cached(self):
+        self.store.save_geo_features(SERVER, 5, [])
+        self.assertEqual(self.store.geo_features(SERVER, 5), {})
+
+    def test_geo_features_expire(self):
+        self.store.save_geo_features(SERVER, 2, [geo_feature("a")])
+        self.assertIsNone(self.store.geo_features(SERVER, 2, max_age=-1))
+        self.assertIsNotNone(self.store.geo_features(SERVER, 2))
+
+    def test_clear_geo_features(self):
+        self.store.save_geo_features(SERVER, 2, [geo_feature("a")])
+        self.store.save_geo_features("other.example.org", 2, [geo_feature("a")])
+        self.store.clear_geo_features(SERVER)
+        self.assertIsNone(self.store.geo_features(SERVER, 2))
+        self.assertIsNotNone(self.store.geo_features("other.example.org", 2))
+        self.store.clear_geo_features()
+        self.assertIsNone(self.store.geo_features("other.example.org", 2))
+
+    def test_connections_are_closed(self):
+        with tracked_connections() as opened:
+            self.store.save_geo_features(SERVER, 2, [geo_feature("a")])
+            self.store.geo_features(SERVER, 2)
+        self.assertEqual(len(opened), 2)
+        self.assertTrue(all(is_closed(conn) for conn in opened))
+
+    def test_index_geo_features(self):
+        self.assertEqual(
+            dhis_store.index_geo_features([geo_feature("a"), {"na": "no id"}]),
+            {"a": geo_feature("a")},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
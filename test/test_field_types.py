@@ -0,0 +1,159 @@
+import unittest
+
+from .utilities import has_module, plugin_module
+
+if has_module("PyQt5"):
+    from PyQt5.QtCore import QDate, QDateTime, QVariant
+
+    field_types = plugin_module("field_types")
+else:
+    field_types = None
+
+
+@unittest.skipUnless(field_types, "PyQt5 is not installed")
+class InferFieldTypesTest(unittest.TestCase):
+    def infer(self, values, schema=None):
+        records = [{"field": value} for value in values]
+        return field_types.infer_field_types(records, schema)["field"]
+
+    def test_numbers(self):
+        self.assertEqual(self.infer(["1", "-2", 3]), QVariant.LongLong)
+        self.assertEqual(self.infer(["1.5", "-2.25", 0.5]), QVariant.Double)
+        self.assertEqual(self.infer(["1", "2.5"]), QVariant.Double)
+        self.assertEqual(self.infer(["1.5e-3"]), QVariant.Double)
+
+    def test_leading_zeros_stay_text(self):
+        # phone numbers, codes and ids lose their zeros as numbers
+        self.assertEqual(self.infer(["0712345678"]), QVariant.String)
+        self.assertEqual(self.infer(["007", "12"]), QVariant.String)
+        self.assertEqual(self.infer(["0", "10"]), QVariant.LongLong)
+
+    def test_oversized_integers_stay_text(self):
+        self.assertEqual(self.infer(["1234567890123456789012"]), QVariant.String)
+
+    def test_iso_dates(self):
+        self.assertEqual(self.infer(["2024-01-31", "2023-12-01"]), QVariant.Date)
+        self.assertEqual(
+            self.infer(["2024-01-31T08:15:00.123+03:00", "2024-02-01 10:00"]),
+            QVariant.DateTime,
+        )
+        self.assertEqual(
+            self.infer(["2024-01-31", "2024-02-01T10:00:00Z"]), QVariant.DateTime
+        )
+        self.assertEqual(self.infer(["31/01/2024"]), QVariant.String)
+
+    def test_booleans(self):
+        self.assertEqual(self.infer([True, False]), QVariant.Bool)
+        self.assertEqual(self.infer(["true", "False"]), QVariant.Bool)
+
+    def test_mixed_and_empty_values(self):
+        self.assertEqual(self.infer(["1", "yes"]), QVariant.String)
+        self.assertEqual(self.infer([None, ""]), QVariant.String)
+        self.assertEqual(self.infer([None, "", "4"]), QVariant.LongLong)
+
+    def test_schema_takes_precedence(self):
+        self.assertEqual(
+            self.infer(["1", "2"], {"field": QVariant.String}), QVariant.String
+        )
+
+    def test_field_order_and_sample_size(self):
+        records = [{"b": "1", "a": "x"}, {"c": "2024-01-01"}, {"b": "text"}]
+        result = field_types.infer_field_types(records, sample_size=2)
+        self.assertEqual(list(result), ["b", "a", "c"])
+        # only the first two records are sampled
+        self.assertEqual(result["b"], QVariant.LongLong)
+        self.assertEqual(result["c"], QVariant.Date)
+
+    def test_schema_field_types(self):
+        self.assertEqual(
+            field_types.schema_field_types(
+                {
+                    "age": "integer",
+                    "weight": "decimal",
+                    "visit": "date",
+                    "phone": "text",
+                    "gps": "geopoint",
+                    "group": "begin_group",
+                    "": "integer",
+                }
+            ),
+            {
+                "age": QVariant.LongLong,
+                "weight": QVariant.Double,
+                "visit": QVariant.Date,
+                "phone": QVariant.String,
+                "gps": QVariant.String,
+            },
+        )
+
+
+@unittest.skipUnless(field_types, "PyQt5 is not installed")
+class ConvertValueTest(unittest.TestCase):
+    def test_numbers(self):
+        convert = field_types.convert_value
+        self.assertEqual(convert("42", QVariant.LongLong), 42)
+        self.assertEqual(convert("42.0", QVariant.LongLong), 42)
+        self.assertIsNone(convert("42.5", QVariant.LongLong))
+        self.assertEqual(convert("2.5", QVariant.Double), 2.5)
+        self.assertIsNone(convert("n/a", QVariant.Double))
+
+    def test_empty_values(self):
+        self.assertIsNone(field_types.convert_value("", QVariant.String))
+        self.assertIsNone(field_types.convert_value(None, QVariant.LongLong))
+
+    def test_booleans(self):
+        self.assertTrue(field_types.convert_value("Yes", QVariant.Bool))
+        self.assertFalse(field_types.convert_value("false", QVariant.Bool))
+        self.assertFalse(field_types.convert_value("0", QVariant.Bool))
+        self.assertIsNone(field_types.convert_value("N/A", QVariant.Bool))
+
+    def test_dates(self):
+        self.assertEqual(
+            field_types.convert_value("2024-01-31T10:00:00", QVariant.Date),
+            QDate(2024, 1, 31),
+        )
+        value = field_types.convert_value(
+            "2024-01-31T10:00:00.123456+03:00", QVariant.DateTime
+        )
+        self.assertIsInstance(value, QDateTime)
+        self.assertTrue(value.isValid())
+        self.assertEqual(value.time().msec(), 123)
+        self.assertIsNone(field_types.convert_value("not a date", QVariant.Date))
+
+    def test_text(self):
+        self.assertEqual(field_types.convert_value(7, QVariant.String), "7")
+        self.assertEqual(
+            field_types.convert_value(QDate(2024, 1, 31), QVariant.String),
+            "2024-01-31",
+        )
+
+
+@unittest.skipUnless(field_types, "PyQt5 is not installed")
+class WidenTypeTest(unittest.TestCase):
+    def test_fits_type(self):
+        self.assertTrue(field_types.fits_type("12", QVariant.LongLong))
+        self.assertTrue(field_types.fits_type("", QVariant.LongLong))
+        self.assertTrue(field_types.fits_type("12a", QVariant.String))
+        self.assertFalse(field_types.fits_type("12a", QVariant.LongLong))
+        self.assertFalse(field_types.fits_type("N/A", QVariant.Bool))
+
+    def test_value_past_the_sample(self):
+        records = [{"count": "1"}, {"count": "2"}, {"count": "12a"}]
+        inferred = field_types.infer_field_types(records, sample_size=2)["count"]
+        self.assertEqual(inferred, QVariant.LongLong)
+        values = [record["count"] for record in records]
+        self.assertEqual(field_types.widen_type(inferred, values), QVariant.String)
+
+    def test_widen_type(self):
+        widen = field_types.widen_type
+        self.assertEqual(widen(QVariant.LongLong, ["1", "", None]), QVariant.LongLong)
+        self.assertEqual(widen(QVariant.LongLong, ["1", "2.5"]), QVariant.Double)
+        self.assertEqual(
+            widen(QVariant.Date, ["2024-01-31", "2024-02-01T10:00"]), QVariant.Date
+        )
+        self.assertEqual(widen(QVariant.Bool, ["true", "N/A"]), QVariant.String)
+        self.assertEqual(widen(QVariant.Double, ["2.5", "n/a", "3"]), QVariant.String)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from .utilities import has_module, plugin_module
+
+geo_parser = plugin_module("geo_parser") if has_module("numpy") else None
+
+
+def as_lists(geometry):
+    if geometry is None:
+        return None
+    coordinates = geometry["coordinates"]
+    if geometry["type"] == "Polygon":
+        coordinates = [ring.tolist() for ring in coordinates]
+    else:
+        coordinates = coordinates.tolist()
+    return {"type": geometry["type"], "coordinates": coordinates}
+
+
+@unittest.skipUnless(geo_parser, "NumPy is not installed")
+class ParseGeoStringsTest(unittest.TestCase):
+    def test_geopoints_and_shapes(self):
+        values = [
+            "-1.3 36.8 1700 5",
+            "-1.3 36.8;-1.4 36.9;-1.5 36.7;-1.3 36.8",
+            "0.5 30.1 0 0;0.6 30.2 0 0;",
+        ]
+        coordinates, offsets = geo_parser.parse_geo_strings(values)
+        self.assertEqual(offsets.tolist(), [0, 1, 5, 7])
+        self.assertEqual(
+            coordinates.tolist(),
+            [
+                [36.8, -1.3],
+                [36.8, -1.3],
+                [36.9, -1.4],
+                [36.7, -1.5],
+                [36.8, -1.3],
+                [30.1, 0.5],
+                [30.2, 0.6],
+            ],
+        )
+
+    def test_empty_and_malformed_values_get_no_vertices(self):
+        values = [None, "", " ; ", "12", "1 2 3;4 5", "-1.3 36.8", 42]
+        coordinates, offsets = geo_parser.parse_geo_strings(values)
+        self.assertEqual(offsets.tolist(), [0, 0, 0, 0, 0, 0, 1, 1])
+        self.assertEqual(coordinates.tolist(), [[36.8, -1.3]])
+
+    def test_non_numeric_tokens_fall_back_to_value_by_value(self):
+        values = ["-1.3 36.8", "lat lon", "0.5 30.1 0 0;0.6 30.2 0 0"]
+        coordinates, offsets = geo_parser.parse_geo_strings(values)
+        self.assertEqual(offsets.tolist(), [0, 1, 1, 3])
+        self.assertEqual(coordinates.tolist(), [[36.8, -1.3], [30.1, 0.5], [30.2, 0.6]])
+
+    def test_fallback_matches_the_batch_parser(self):
+        values = ["-1.3 36.8 0 0", "", "1 2;3 4;5 6", "1 2 3;4 5"]
+        texts = [
+            geo_parser.clean_geo_string(value).replace(";", " ") for value in values
+        ]
+        vertex_counts = [
+            geo_parser.clean_geo_string(value).count(";") + 1 if value else 0
+            for value in values
+        ]
+        batch = geo_parser.parse_geo_strings(values)
+        one_by_one = geo_parser.parse_geo_strings_one_by_one(texts, vertex_counts)
+        self.assertEqual(batch[0].tolist(), one_by_one[0].tolist())
+        self.assertEqual(batch[1].tolist(), one_by_one[1].tolist())
+
+
+@unittest.skipUnless(geo_parser, "NumPy is not installed")
+class ParseGeoGeometriesTest(unittest.TestCase):
+    def test_geometries(self):
+        geometries = geo_parser.parse_geo_geometries(
+            ["-1.3 36.8 0 0", "", "0 0;0 1;1 1;0 0"]
+        )
+        self.assertEqual(
+            [as_lists(geometry) for geometry in geometries],
+            [
+                {"type": "Point", "coordinates": [36.8, -1.3]},
+                None,
+                {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+                },
+            ],
+        )
+
+    def test_empty_batch(self):
+        self.assertEqual(geo_parser.parse_geo_geometries([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
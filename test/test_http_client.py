@@ -0,0 +1,151 @@
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from .utilities import has_module, is_closed, plugin_module, tracked_connections
+
+http_client = plugin_module("http_client") if has_module("requests") else None
+
+
+def make_response(body, headers=None, url="https://example.org/api"):
+    response = http_client.requests.models.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = http_client.CaseInsensitiveDict(headers or {})
+    response._content = body
+    return response
+
+
+class ETagHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a fixed body with an ETag, answering 304 when it matches."""
+
+    body = b'{"count": 3}'
+    etag = '"v1"'
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(http_client, "requests is not installed")
+class HttpCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = http_client.HttpCache(
+            os.path.join(self.directory, "cache", "http_cache.sqlite"), max_bytes=100
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_cache_key(self):
+        key = http_client.HttpCache.cache_key
+        url = "https://example.org/api"
+        self.assertEqual(
+            key(url, params={"a": 1, "b": 2}), key(url, params={"b": 2, "a": 1})
+        )
+        self.assertNotEqual(key(url, params={"a": 1}), key(url, params={"a": 2}))
+        self.assertNotEqual(key(url, auth=("user", "secret")), key(url))
+        self.assertNotEqual(
+            key(url, auth=("user", "secret")), key(url, auth=("user", "other"))
+        )
+
+    def test_put_and_get(self):
+        self.cache.put(
+            "key",
+            make_response(
+                b"body", {"ETag": '"abc"', "Content-Type": "application/json"}
+            ),
+        )
+        entry = self.cache.get("key")
+        self.assertEqual(entry["etag"], '"abc"')
+        self.assertIsNone(entry["last_modified"])
+        self.assertEqual(bytes(entry["body"]), b"body")
+        self.assertEqual(entry["headers"]["Content-Type"], "application/json")
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_put_skips_unvalidated_and_oversized_responses(self):
+        self.cache.put("plain", make_response(b"body"))
+        self.cache.put("large", make_response(b"x" * 101, {"ETag": '"abc"'}))
+        self.assertIsNone(self.cache.get("plain"))
+        self.assertIsNone(self.cache.get("large"))
+
+    def test_evicts_least_recently_used(self):
+        headers = {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        self.cache.put("first", make_response(b"a" * 40, headers))
+        self.cache.put("second", make_response(b"b" * 40, headers))
+        # reading the first entry makes the second the least recently used
+        self.cache.get("first")
+        self.cache.put("third", make_response(b"c" * 40, headers))
+        self.assertIsNotNone(self.cache.get("first"))
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("third"))
+
+    def test_connections_are_closed(self):
+        with tracked_connections() as opened:
+            self.cache.put("key", make_response(b"body", {"ETag": '"abc"'}))
+            self.cache.get("key")
+            self.cache.clear()
+        self.assertEqual(len(opened), 3)
+        self.assertTrue(all(is_closed(conn) for conn in opened))
+
+    def test_clear(self):
+        self.cache.put("key", make_response(b"body", {"ETag": '"abc"'}))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("key"))
+
+
+@unittest.skipUnless(http_client, "requests is not installed")
+class CachedGetTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        http_client.configure_cache(os.path.join(self.directory, "http_cache.sqlite"))
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        http_client.close_sessions()
+        http_client._http_cache = None
+        shutil.rmtree(self.directory)
+
+    def test_revalidates_with_etag(self):
+        first = http_client.cached_get(self.url, params={"page": 1})
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(getattr(first, "from_cache", False))
+
+        second = http_client.cached_get(self.url, params={"page": 1})
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), {"count": 3})
+        self.assertEqual(second.headers["Content-Type"], "application/json")
+        self.assertEqual(self.server.requests, [None, '"v1"'])
+
+    def test_other_params_are_not_revalidated(self):
+        http_client.cached_get(self.url, params={"page": 1})
+        response = http_client.cached_get(self.url, params={"page": 2})
+        self.assertFalse(getattr(response, "from_cache", False))
+        self.assertEqual(self.server.requests, [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import unittest
+
+from .utilities import plugin_module
+
+json_stream = plugin_module("json_stream")
+
+
+class FakeResponse:
+    """Serves a body in fixed size byte chunks, like requests' iter_content."""
+
+    def __init__(self, body):
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start : start + chunk_size]
+
+
+def stream(body, key=None, chunk_size=json_stream.CHUNK_SIZE):
+    return json_stream.JsonRecordStream(FakeResponse(body), key, chunk_size)
+
+
+class JsonRecordStreamTest(unittest.TestCase):
+    records = [
+        {"_id": 1, "name": "Nairobi", "tags": ["a", "b"]},
+        {"_id": 2, "name": 'quote " and \\ backslash', "nested": {"x": [1, {}]}},
+        {"_id": 3, "name": "Zürich ✓", "value": -0.035, "flag": True},
+        {"_id": 4, "empty": [], "none": None, "exp": 1.5e-07},
+    ]
+
+    def test_top_level_array(self):
+        body = json.dumps(self.records)
+        for chunk_size in (1, 2, 3, 7, 64, 10**6):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    list(stream(body, chunk_size=chunk_size)), self.records
+                )
+
+    def test_keyed_array_and_meta(self):
+        body = json.dumps(
+            {"@odata.count": 4, "value": self.records, "next": None, "page": 2}
+        )
+        for chunk_size in (1, 5, 64):
+            with self.subTest(chunk_size=chunk_size):
+                records = stream(body, "value", chunk_size)
+                self.assertEqual(list(records), self.records)
+                self.assertEqual(
+                    records.meta, {"@odata.count": 4, "next": None, "page": 2}
+                )
+
+    def test_scalars_split_across_chunks(self):
+        # a number cut at its decimal point must not be taken as complete
+        body = "[-0.035, 12345, true, null, 6.02e23]"
+        for chunk_size in range(1, len(body) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    list(stream(body, chunk_size=chunk_size)),
+                    [-0.035, 12345, True, None, 6.02e23],
+                )
+
+    def test_record_spanning_many_chunks(self):
+        record = {
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[i / 7, -i / 3] for i in range(20000)],
+            },
+            "properties": {"text": '\\"}]' * 1000},
+        }
+        body = json.dumps({"features": [record, {"id": 2}]})
+        self.assertEqual(
+            list(stream(body, "features", chunk_size=100)), [record, {"id": 2}]
+        )
+
+    def test_multibyte_characters_split_across_chunks(self):
+        body = json.dumps([{"name": "Ωμέγα ✓ 日本"}], ensure_ascii=False)
+        self.assertEqual(list(stream(body, chunk_size=1)), [{"name": "Ωμέγα ✓ 日本"}])
+
+    def test_empty_arrays(self):
+        self.assertEqual(list(stream("[]")), [])
+        records = stream('{"count": 0, "results": []}', "results")
+        self.assertEqual(list(records), [])
+        self.assertEqual(records.meta, {"count": 0})
+
+    def test_missing_key(self):
+        records = stream('{"detail": "Not found."}', "results")
+        self.assertEqual(list(records), [])
+        self.assertEqual(records.meta, {"detail": "Not found."})
+
+    def test_malformed_body(self):
+        with self.assertRaises(ValueError):
+            list(stream('[{"a": 1} {"b": 2}]'))
+        with self.assertRaises(ValueError):
+            list(stream('[{"a": 1}, {"b": '))
+
+    def test_iter_json_records(self):
+        self.assertEqual(
+            list(json_stream.iter_json_records(FakeResponse("[1, 2, 3]"))), [1, 2, 3]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from .utilities import has_module, plugin_module
+
+afpolgis = plugin_module("afpolgis") if has_module("qgis") else None
+
+SERVER = "odk.example.org"
+FORM = "form_a"
+GEO_FIELD = "location"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = json.dumps(body or {}).encode("utf-8")
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+
+def submission(index, date):
+    return {
+        "__id": f"uuid:{index}",
+        "__system": {"submissionDate": date, "updatedAt": None},
+        GEO_FIELD: f"POINT ({index} 1)",
+    }
+
+
+def page(*submissions):
+    return FakeResponse(200, {"@odata.count": 3, "value": list(submissions)})
+
+
+@unittest.skipUnless(afpolgis, "QGIS is not available")
+class OdkIncrementalSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.plugin = afpolgis.AfpolGIS.__new__(afpolgis.AfpolGIS)
+        self.plugin.submission_store = afpolgis.SubmissionStore(
+            os.path.join(self.directory, afpolgis.SUBMISSION_STORE_FILE)
+        )
+        self.plugin.odk_forms_to_projects_map = {FORM: 1}
+        self.plugin.dlg = mock.MagicMock()
+        self.plugin.dlg.odkPageSize.value.return_value = 2
+        self.plugin.fetch_jobs = mock.MagicMock()
+
+        self.store_key = (SERVER, f"1/{FORM}", GEO_FIELD)
+        self.plugin.submission_store.upsert(
+            *self.store_key, [submission(0, "2024-01-01T00:00:00.000Z")]
+        )
+        self.watermark = self.plugin.submission_store.watermark(*self.store_key)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def sync(self, responses):
+        """Runs an incremental sync task against the given pages."""
+        self.plugin.fetch_and_save_odk_data(
+            SERVER,
+            "user",
+            "password",
+            FORM,
+            GEO_FIELD,
+            None,
+            None,
+            since=self.watermark["modified_at"],
+        )
+        task = self.plugin.fetch_jobs.start.call_args[0][1]
+        with mock.patch.object(afpolgis, "fetch_data", side_effect=responses):
+            completed = task.run()
+        return task, completed
+
+    def test_sync_failing_partway_stores_nothing(self):
+        task, completed = self.sync(
+            [
+                page(
+                    submission(1, "2024-02-01T00:00:00.000Z"),
+                    submission(2, "2024-03-01T00:00:00.000Z"),
+                ),
+                FakeResponse(500),
+            ]
+        )
+        self.assertFalse(completed)
+        self.assertEqual(task.error, "Error fetching data: 500")
+        # the watermark stays put, so the next sync asks for both pages again
+        self.assertEqual(
+            self.plugin.submission_store.watermark(*self.store_key), self.watermark
+        )
+
+    def test_complete_sync_is_stored_as_a_delta(self):
+        task, completed = self.sync(
+            [
+                page(
+                    submission(1, "2024-02-01T00:00:00.000Z"),
+                    submission(2, "2024-03-01T00:00:00.000Z"),
+                ),
+                page(submission(3, "2024-04-01T00:00:00.000Z")),
+                page(),
+            ]
+        )
+        self.assertTrue(completed)
+        self.assertEqual(task.result["new_records"], 3)
+        self.assertEqual(task.result["delta"], self.store_key)
+        self.assertEqual(len(task.result["dataset"]), 3)
+        watermark = self.plugin.submission_store.watermark(*self.store_key)
+        self.assertEqual(watermark["count"], 4)
+        self.assertEqual(watermark["modified_at"], "2024-04-01T00:00:00.000Z")
+
+
+if __name__ == "__main__":
+    unittest.main()
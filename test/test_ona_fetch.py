@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from .utilities import has_module, plugin_module
+
+if has_module("PyQt5") and has_module("requests"):
+    request_threads = plugin_module("request_threads")
+else:
+    request_threads = None
+afpolgis = plugin_module("afpolgis") if has_module("qgis") else None
+
+SERVER = "ona.example.org"
+FORM = 12
+GEO_FIELD = "location"
+
+
+def record(index):
+    return {"_id": index, "name": f"site {index}", GEO_FIELD: f"1 {index} 0 0"}
+
+
+@unittest.skipUnless(request_threads, "PyQt5 or requests is not installed")
+class OnaRequestThreadTest(unittest.TestCase):
+    def test_pages_are_emitted_one_at_a_time_in_order(self):
+        worker = request_threads.OnaRequestThread(
+            f"https://{SERVER}/api/v1/data/{FORM}.json",
+            records_per_page=2,
+            max_concurrent_pages=3,
+        )
+        pages = {1: [record(1), record(2)], 2: None, 3: [record(5)]}
+
+        def fetch_page(page):
+            if pages[page] is None:
+                return page, None, "Request Failed, status code - 500"
+            return page, pages[page], None
+
+        worker.fetch_page = fetch_page
+        emitted = []
+        failed = []
+        worker.page_fetched.connect(emitted.append)
+        worker.page_failed.connect(failed.append)
+
+        self.assertEqual(worker.fetch_pages(3), 3)
+        self.assertEqual([page["page"] for page in emitted], [1, 3])
+        self.assertEqual([row["_id"] for row in emitted[0]["records"]], ["1", "2"])
+        self.assertEqual(
+            failed, [{"page": 2, "error": "Request Failed, status code - 500"}]
+        )
+
+
+@unittest.skipUnless(afpolgis, "QGIS is not available")
+class OnaPageLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.plugin = afpolgis.AfpolGIS.__new__(afpolgis.AfpolGIS)
+        self.plugin.submission_store = afpolgis.SubmissionStore(
+            os.path.join(self.directory, afpolgis.SUBMISSION_STORE_FILE)
+        )
+        self.plugin.dlg = mock.MagicMock()
+        self.plugin.dlg.onadata_api_url.text.return_value = SERVER
+        self.plugin.dlg.comboOnaForms.currentData.return_value = FORM
+        self.plugin.dlg.comboOnaForms.currentText.return_value = "Site survey"
+        self.plugin.iface = mock.MagicMock()
+        self.plugin.ona_sync_timer = mock.MagicMock()
+        self.plugin.ona_sync_timer.isActive.return_value = False
+        self.plugin.curr_geo_field = GEO_FIELD
+        self.plugin.ona_field_types = dict()
+        self.plugin.ona_page_load = None
+        self.plugin.write_features_to_layer = mock.MagicMock(return_value="layer")
+        self.plugin.add_layer_to_map = mock.MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_each_page_is_written_as_it_arrives(self):
+        with mock.patch.object(afpolgis, "QgsProject") as project:
+            project.instance().mapLayersByName.return_value = []
+            self.plugin.handle_ona_page_fetched(
+                {"page": 1, "records": [record(1), record(2)]}
+            )
+            self.plugin.handle_ona_page_fetched({"page": 2, "records": [record(3)]})
+            self.plugin.handle_data_fetched({"records": 3})
+
+        writes = self.plugin.write_features_to_layer.call_args_list
+        # one ColumnarDataset per page
+        self.assertEqual([call.args[2].feature_count() for call in writes], [2, 1])
+        # the layer made from the first page is handed on to the next ones
+        self.assertIsNone(writes[0].args[0])
+        self.assertEqual(writes[1].args[0], "layer")
+        self.plugin.add_layer_to_map.assert_called_once_with(
+            "layer", "Site_survey_location"
+        )
+
+        stored = self.plugin.submission_store.records(SERVER, str(FORM), GEO_FIELD)
+        self.assertEqual(sorted(row["_id"] for row in stored), [1, 2, 3])
+        self.assertIsInstance(self.plugin.json_data, afpolgis.ColumnarDataset)
+        self.assertEqual(
+            [row["name"] for row in self.plugin.json_data.iter_records()],
+            ["site 1", "site 2", "site 3"],
+        )
+        self.assertIsNone(self.plugin.ona_page_load)
+
+    def test_delta_is_merged_as_a_dataset(self):
+        self.plugin.load_data_to_qgis = mock.MagicMock()
+        self.plugin.submission_store.upsert(SERVER, str(FORM), GEO_FIELD, [record(1)])
+
+        self.plugin.handle_ona_delta_fetched([record(2)])
+
+        dataset, form, geo_field = self.plugin.load_data_to_qgis.call_args.args
+        self.assertIsInstance(dataset, afpolgis.ColumnarDataset)
+        self.assertEqual(dataset.feature_count(), 1)
+        self.assertEqual((form, geo_field), ("Site_survey", GEO_FIELD))
+        self.assertIs(self.plugin.load_data_to_qgis.call_args.kwargs["replace"], False)
+
+        # the CSV holds every stored submission, not just the delta
+        download = self.plugin.ona_download_data()
+        self.assertIsInstance(download, afpolgis.ColumnarDataset)
+        self.assertEqual(len(download), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from .utilities import plugin_module
+
+org_unit_hierarchy = plugin_module("org_unit_hierarchy")
+dhis_store = plugin_module("dhis_store")
+
+# /api/organisationUnits records of a country > 2 regions > 3 districts
+RECORDS = [
+    {"id": "KE", "name": "Kenya", "level": 1, "path": "/KE"},
+    {
+        "id": "R1",
+        "name": "Coast",
+        "level": 2,
+        "path": "/KE/R1",
+        "parent": {"id": "KE"},
+        "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [0, 0]]]},
+    },
+    {"id": "R2", "name": "Rift", "path": "/KE/R2", "parent": {"id": "KE"}},
+    {
+        "id": "D1",
+        "name": "Mombasa",
+        "level": 3,
+        "path": "/KE/R1/D1",
+        "parent": {"id": "R1"},
+        "geometry": {"type": "Point", "coordinates": [39.6, -4.0]},
+    },
+    {
+        "id": "D2",
+        "name": "Kilifi",
+        "level": 3,
+        "path": "/KE/R1/D2",
+        "parent": {"id": "R1"},
+    },
+    {
+        "id": "D3",
+        "name": "Nakuru",
+        "level": 3,
+        "path": "/KE/R2/D3",
+        "parent": {"id": "R2"},
+    },
+    {"name": "no id", "level": 3},
+]
+
+
+class OrgUnitHierarchyTest(unittest.TestCase):
+    def setUp(self):
+        self.hierarchy = org_unit_hierarchy.OrgUnitHierarchy.from_org_units(RECORDS)
+
+    def test_index(self):
+        self.assertEqual(len(self.hierarchy), 6)
+        self.assertEqual(self.hierarchy.levels(), [1, 2, 3])
+        # the level is taken from the path when the record has none
+        self.assertEqual(self.hierarchy.units["R2"]["level"], 2)
+        self.assertTrue(self.hierarchy.units["R1"]["geometry"])
+        self.assertFalse(self.hierarchy.units["R2"]["geometry"])
+
+    def test_parse_path(self):
+        self.assertEqual(org_unit_hierarchy.parse_path("/KE/R1/D1"), ["KE", "R1", "D1"])
+        self.assertEqual(org_unit_hierarchy.parse_path(None), [])
+
+    def test_at_level(self):
+        self.assertEqual(self.hierarchy.at_level(3), ["D1", "D2", "D3"])
+        self.assertEqual(self.hierarchy.at_level("2"), ["R1", "R2"])
+        self.assertEqual(self.hierarchy.at_level(4), [])
+
+    def test_geo_feature(self):
+        self.assertEqual(
+            org_unit_hierarchy.geo_feature(RECORDS[3]),
+            {
+                "id": "D1",
+                "na": "Mombasa",
+                "le": 3,
+                "pi": "R1",
+                "ty": org_unit_hierarchy.GEO_FEATURE_POINT,
+                "co": "[39.6, -4.0]",
+            },
+        )
+        self.assertEqual(
+            org_unit_hierarchy.geo_feature(RECORDS[1])["ty"],
+            org_unit_hierarchy.GEO_FEATURE_POLYGON,
+        )
+        self.assertIsNone(org_unit_hierarchy.geo_feature(RECORDS[2]))
+
+    def test_geo_feature_geometry(self):
+        multipolygon = {
+            "type": "MultiPolygon",
+            "coordinates": [[[[0, 0], [1, 0], [0, 0]]], [[[2, 2], [3, 2], [2, 2]]]],
+        }
+        for geometry in (RECORDS[1]["geometry"], RECORDS[3]["geometry"], multipolygon):
+            feature = org_unit_hierarchy.geo_feature({"id": "X", "geometry": geometry})
+            self.assertEqual(org_unit_hierarchy.geo_feature_geometry(feature), geometry)
+        self.assertIsNone(org_unit_hierarchy.geo_feature_geometry({"co": "[]"}))
+
+
+class StoredOrgUnitsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = dhis_store.DhisStore(
+            os.path.join(self.directory, dhis_store.DHIS_STORE_FILE)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        hierarchy = org_unit_hierarchy.OrgUnitHierarchy.from_org_units(RECORDS)
+        self.store.save_org_units("server", hierarchy.units.values())
+
+        units = self.store.org_units("server")
+        self.assertEqual(
+            sorted(units, key=lambda unit: unit["id"]),
+            sorted(hierarchy.units.values(), key=lambda unit: unit["id"]),
+        )
+        reloaded = org_unit_hierarchy.OrgUnitHierarchy(units)
+        self.assertEqual(sorted(reloaded.at_level(3)), ["D1", "D2", "D3"])
+
+    def test_expiry_and_clear(self):
+        self.assertIsNone(self.store.org_units("server"))
+        self.assertIsNone(self.store.org_units_fetched_at("server"))
+        self.store.save_org_units("server", [])
+        self.assertEqual(self.store.org_units("server"), [])
+        self.assertIsNotNone(self.store.org_units_fetched_at("server"))
+        self.assertIsNone(self.store.org_units("server", max_age=-1))
+        self.store.clear_org_units("server")
+        self.assertIsNone(self.store.org_units("server"))
+        self.assertIsNone(self.store.org_units_fetched_at("server"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from .utilities import plugin_module
+
+record_normalizer = plugin_module("record_normalizer")
+
+
+class ToTextTest(unittest.TestCase):
+    def test_values(self):
+        to_text = record_normalizer.to_text
+        self.assertEqual(to_text(None), "")
+        self.assertEqual(to_text(float("nan")), "")
+        self.assertEqual(to_text("text"), "text")
+        self.assertEqual(to_text(5), "5")
+        self.assertEqual(to_text(2.5), "2.5")
+        self.assertEqual(to_text(True), "True")
+
+
+class NormalizeRecordsTest(unittest.TestCase):
+    def test_groups_and_repeats(self):
+        record = {
+            "_id": 1,
+            "household": {"size": 4, "head": {"name": "A"}},
+            "members": [
+                {"members/age": 30, "members/name": "B"},
+                {"members/age": 2},
+            ],
+            "_tags": ["x", "y"],
+            "_attachments": [],
+        }
+        self.assertEqual(
+            record_normalizer.normalize_records([record]),
+            [
+                {
+                    "_id": "1",
+                    "household/size": "4",
+                    "household/head/name": "A",
+                    "members[1]/members/age": "30",
+                    "members[1]/members/name": "B",
+                    "members[2]/members/age": "2",
+                    "_tags[1]": "x",
+                    "_tags[2]": "y",
+                }
+            ],
+        )
+
+    def test_union_schema_in_order_of_first_appearance(self):
+        rows = record_normalizer.normalize_records(
+            [{"a": 1, "b": None}, {"c": "x", "a": 2}, {}]
+        )
+        self.assertEqual(
+            rows,
+            [
+                {"a": "1", "b": "", "c": ""},
+                {"a": "2", "b": "", "c": "x"},
+                {"a": "", "b": "", "c": ""},
+            ],
+        )
+        for row in rows:
+            self.assertEqual(list(row), ["a", "b", "c"])
+
+    def test_separator(self):
+        self.assertEqual(
+            record_normalizer.normalize_records([{"g": {"q": 1}}], sep="."),
+            [{"g.q": "1"}],
+        )
+
+    def test_input_records_are_left_alone(self):
+        record = {"g": {"q": 1}}
+        record_normalizer.normalize_records([record])
+        self.assertEqual(record, {"g": {"q": 1}})
+
+    def test_no_records(self):
+        self.assertEqual(record_normalizer.normalize_records([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from .utilities import is_closed, plugin_module, tracked_connections
+
+submission_store = plugin_module("submission_store")
+
+SERVER = "api.example.org"
+FORM = "42"
+GEO_FIELD = "location"
+
+
+def point_feature(properties, x=36.8, y=-1.3):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [x, y]},
+        "properties": properties,
+    }
+
+
+class SubmissionKeysTest(unittest.TestCase):
+    def test_submission_id_prefers_the_first_key(self):
+        self.assertEqual(
+            submission_store.submission_id({"_id": 7, "_uuid": "abc"}), "7"
+        )
+        self.assertEqual(submission_store.submission_id({"__id": "uuid:1"}), "uuid:1")
+        self.assertEqual(
+            submission_store.submission_id({"meta": {"instanceID": "uuid:2"}}),
+            "uuid:2",
+        )
+        self.assertEqual(
+            submission_store.submission_id({"_id": "", "Org ID": "ou1"}), "ou1"
+        )
+
+    def test_submission_id_falls_back_to_a_content_hash(self):
+        first = submission_store.submission_id({"b": 1, "a": 2})
+        self.assertEqual(first, submission_store.submission_id({"a": 2, "b": 1}))
+        self.assertNotEqual(first, submission_store.submission_id({"a": 3, "b": 1}))
+
+    def test_submission_keys_number_repeats(self):
+        records = [{"_id": 1}, {"_id": 2}, {"_id": 1}, {"_id": 1}]
+        self.assertEqual(
+            submission_store.submission_keys(records), ["1", "2", "1#1", "1#2"]
+        )
+
+
+class SubmissionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = submission_store.SubmissionStore(
+            os.path.join(
+                self.directory, "store", submission_store.SUBMISSION_STORE_FILE
+            )
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_upsert_replaces_by_submission_id(self):
+        records = [
+            {"_id": 1, "name": "a", "_submission_time": "2024-01-01T08:00:00"},
+            {"_id": 2, "name": "b", "_submission_time": "2024-01-02T08:00:00"},
+        ]
+        features = [point_feature(record) for record in records]
+        self.assertEqual(
+            self.store.upsert(SERVER, FORM, GEO_FIELD, records, features), 2
+        )
+
+        edited = dict(records[0], name="a2", _date_modified="2024-02-01T08:00:00")
+        self.store.upsert(SERVER, FORM, GEO_FIELD, [edited], [point_feature(edited)])
+
+        self.assertEqual(self.store.count(SERVER, FORM, GEO_FIELD), 2)
+        self.assertEqual(
+            [record["name"] for record in self.store.records(SERVER, FORM, GEO_FIELD)],
+            ["a2", "b"],
+        )
+        collection = self.store.feature_collection(SERVER, FORM, GEO_FIELD)
+        self.assertEqual(len(collection["features"]), 2)
+        self.assertEqual(collection["features"][0]["properties"]["name"], "a2")
+
+    def test_features_only(self):
+        features = [point_feature({"Org ID": "ou1"}), point_feature({"Org ID": "ou2"})]
+        self.store.upsert(SERVER, FORM, GEO_FIELD, features=features)
+        self.assertEqual(
+            self.store.records(SERVER, FORM, GEO_FIELD),
+            [{"Org ID": "ou1"}, {"Org ID": "ou2"}],
+        )
+
+    def test_repeat_features_stay_with_their_submission(self):
+        record = {"_id": 1}
+        features = [point_feature(record, x) for x in (1.0, 2.0, 3.0)]
+        self.store.upsert(SERVER, FORM, GEO_FIELD, [record], features)
+        rows = list(self.store.iter_rows(SERVER, FORM, GEO_FIELD))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(rows[0][2]), 3)
+
+    def test_forms_are_kept_apart(self):
+        self.store.upsert(SERVER, FORM, GEO_FIELD, [{"_id": 1}])
+        self.store.upsert(SERVER, "43", GEO_FIELD, [{"_id": 1}])
+        self.store.clear(SERVER, "43", GEO_FIELD)
+        self.assertEqual(self.store.count(SERVER, FORM, GEO_FIELD), 1)
+        self.assertEqual(self.store.count(SERVER, "43", GEO_FIELD), 0)
+
+    def test_delete(self):
+        self.store.upsert(SERVER, FORM, GEO_FIELD, [{"_id": 1}, {"_id": 2}])
+        self.store.delete(SERVER, FORM, GEO_FIELD, [1])
+        self.assertEqual(self.store.records(SERVER, FORM, GEO_FIELD), [{"_id": 2}])
+
+    def test_watermark_of_an_empty_form(self):
+        self.assertEqual(
+            self.store.watermark(SERVER, FORM, GEO_FIELD),
+            {"max_id": None, "submitted_at": None, "modified_at": None, "count": 0},
+        )
+
+    def test_watermark_compares_ids_as_numbers(self):
+        # the ids are TEXT keys, "9" > "10" as strings
+        self.store.upsert(SERVER, FORM, GEO_FIELD, [{"_id": 9}, {"_id": 10}])
+        self.assertEqual(self.store.watermark(SERVER, FORM, GEO_FIELD)["max_id"], 10)
+
+    def test_watermark_timestamps(self):
+        records = [
+            {
+                "_id": 1,
+                "_submission_time": "2024-03-01T10:00:00",
+                "_date_modified": "2024-05-01T09:30:00",
+            },
+            {"_id": 2, "_submission_time": "2024-04-01T10:00:00"},
+            {
+                "__id": "uuid:3",
+                "__system": {
+                    "submissionDate": "2024-02-01T10:00:00.000Z",
+                    "updatedAt": None,
+                },
+            },
+        ]
+        self.store.upsert(SERVER, FORM, GEO_FIELD, records)
+        watermark = self.store.watermark(SERVER, FORM, GEO_FIELD)
+        self.assertEqual(watermark["submitted_at"], "2024-04-01T10:00:00")
+        # without an edit timestamp the submission time counts as modified
+        self.assertEqual(watermark["modified_at"], "2024-05-01T09:30:00")
+        self.assertEqual(watermark["count"], 3)
+
+        self.store.upsert(
+            SERVER, FORM, GEO_FIELD, [{"_id": 4, "_submission_time": "2024-06-01"}]
+        )
+        watermark = self.store.watermark(SERVER, FORM, GEO_FIELD)
+        self.assertEqual(watermark["modified_at"], "2024-06-01")
+        self.assertEqual(watermark["max_id"], 4)
+
+    def test_connections_are_closed(self):
+        with tracked_connections() as opened:
+            self.store.upsert(SERVER, FORM, GEO_FIELD, [{"_id": 1}])
+            self.store.records(SERVER, FORM, GEO_FIELD)
+            self.store.watermark(SERVER, FORM, GEO_FIELD)
+        self.assertEqual(len(opened), 3)
+        self.assertTrue(all(is_closed(conn) for conn in opened))
+
+    def test_survives_reopening(self):
+        self.store.upsert(SERVER, FORM, GEO_FIELD, [{"_id": 1}])
+        reopened = submission_store.SubmissionStore(self.store.path)
+        self.assertEqual(reopened.count(SERVER, FORM, GEO_FIELD), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+
+from .utilities import plugin_module
+
+wkt_parser = plugin_module("wkt_parser")
+parse_wkt = wkt_parser.parse_wkt
+
+
+class ParseWktTest(unittest.TestCase):
+    def test_simple_types(self):
+        self.assertEqual(
+            parse_wkt("POINT (36.8 -1.3)"),
+            {"type": "Point", "coordinates": [36.8, -1.3]},
+        )
+        self.assertEqual(
+            parse_wkt("LINESTRING (0 0, 1 1, 2 0.5)"),
+            {"type": "LineString", "coordinates": [[0, 0], [1, 1], [2, 0.5]]},
+        )
+        self.assertEqual(
+            parse_wkt("POLYGON ((0 0, 4 0, 4 4, 0 0), (1 1, 2 1, 2 2, 1 1))"),
+            {
+                "type": "Polygon",
+                "coordinates": [
+                    [[0, 0], [4, 0], [4, 4], [0, 0]],
+                    [[1, 1], [2, 1], [2, 2], [1, 1]],
+                ],
+            },
+        )
+
+    def test_multi_types(self):
+        for text in ("MULTIPOINT (1 2, 3 4)", "MULTIPOINT ((1 2), (3 4))"):
+            with self.subTest(text=text):
+                self.assertEqual(
+                    parse_wkt(text),
+                    {"type": "MultiPoint", "coordinates": [[1, 2], [3, 4]]},
+                )
+        self.assertEqual(
+            parse_wkt("MULTILINESTRING ((0 0, 1 1), (2 2, 3 3))")["coordinates"],
+            [[[0, 0], [1, 1]], [[2, 2], [3, 3]]],
+        )
+        self.assertEqual(
+            parse_wkt("MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5)))")[
+                "coordinates"
+            ],
+            [[[[0, 0], [1, 0], [1, 1], [0, 0]]], [[[5, 5], [6, 5], [6, 6], [5, 5]]]],
+        )
+
+    def test_case_and_whitespace(self):
+        self.assertEqual(
+            parse_wkt("  point(1   2)  "), {"type": "Point", "coordinates": [1, 2]}
+        )
+        self.assertEqual(
+            parse_wkt("LineString(1 2,3 4)")["coordinates"], [[1, 2], [3, 4]]
+        )
+
+    def test_empty_geometries(self):
+        self.assertIsNone(parse_wkt("POINT EMPTY"))
+        self.assertIsNone(parse_wkt("MULTIPOLYGON Z EMPTY"))
+
+    def test_dimensions_keep_x_and_y(self):
+        expected = {"type": "LineString", "coordinates": [[1, 2], [4, 5]]}
+        for text in (
+            "LINESTRING Z (1 2 3, 4 5 6)",
+            "LINESTRINGZ (1 2 3, 4 5 6)",
+            "LINESTRING M (1 2 3, 4 5 6)",
+            "LINESTRING ZM (1 2 3 9, 4 5 6 9)",
+            "LINESTRING (1 2 3, 4 5 6)",
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(parse_wkt(text), expected)
+
+    def test_dimension_checks(self):
+        for text in (
+            # fewer or more ordinates than the tag says
+            "POINT Z (1 2)",
+            "POINT ZM (1 2 3)",
+            "POINT (1 2 3 4 5)",
+            "POINT (1)",
+            # coordinates of differing dimensions
+            "LINESTRING (1 2, 3 4 5)",
+            "LINESTRING (1 2 3, 4 5)",
+            "POLYGON ((0 0, 1 0, 1 1, 0 0), (0 0 0, 1 0 0, 1 1 0, 0 0 0))",
+            "MULTIPOINT Z ((1 2 3), (4 5))",
+        ):
+            with self.subTest(text=text):
+                with self.assertRaises(wkt_parser.WktError):
+                    parse_wkt(text)
+
+    def test_dimensions_reset_per_geometry(self):
+        self.assertEqual(
+            wkt_parser.parse_wkt_batch(["POINT Z (1 2 3)", "POINT (4 5)"]),
+            [
+                {"type": "Point", "coordinates": [1, 2]},
+                {"type": "Point", "coordinates": [4, 5]},
+            ],
+        )
+
+    def test_malformed(self):
+        for text in (
+            "",
+            "POINT",
+            "POINT (1 2",
+            "POINT 1 2)",
+            "POINT (1 2, 3 4)",
+            "POINT (a b)",
+            "CIRCLE (1 2)",
+            "POINT FOO (1 2)",
+            "POINT (1 2) POINT (3 4)",
+            "POLYGON ((0 0, 1 0, 1 1, 0 0) (1 1, 2 2, 1 1))",
+            "GEOMETRYCOLLECTION (POINT (1 2))",
+        ):
+            with self.subTest(text=text):
+                with self.assertRaises(wkt_parser.WktError):
+                    parse_wkt(text)
+                self.assertFalse(wkt_parser.is_valid_wkt(text))
+
+    def test_not_a_string(self):
+        with self.assertRaises(wkt_parser.WktError):
+            parse_wkt(None)
+
+    def test_wkt_error_is_a_value_error(self):
+        self.assertTrue(issubclass(wkt_parser.WktError, ValueError))
+
+
+class ParseWktBatchTest(unittest.TestCase):
+    def test_matches_parse_wkt(self):
+        values = [
+            "POINT (1 2)",
+            "LINESTRING Z (1 2 3, 4 5 6)",
+            "POLYGON ((0 0, 1 0, 1 1, 0 0))",
+            "MULTIPOINT ((1 2), (3 4))",
+            "POINT EMPTY",
+        ]
+        self.assertEqual(
+            wkt_parser.parse_wkt_batch(values), [parse_wkt(value) for value in values]
+        )
+
+    def test_recovers_after_bad_values(self):
+        values = [
+            "POINT (1 2",
+            "POINT (3 4)",
+            "LINESTRING (1 2, 3 4 5)",
+            None,
+            "",
+            "POINT (5 6); POINT (7 8)",
+            12,
+            "POINT (1 2) trailing",
+            "POLYGON ((0 0, 1 0, 1 1, 0 0)",
+            "POINT (9 10)",
+            "POINT (",
+        ]
+        self.assertEqual(
+            wkt_parser.parse_wkt_batch(values),
+            [
+                None,
+                {"type": "Point", "coordinates": [3, 4]},
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                {"type": "Point", "coordinates": [9, 10]},
+                None,
+            ],
+        )
+
+    def test_empty_batch(self):
+        self.assertEqual(wkt_parser.parse_wkt_batch([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
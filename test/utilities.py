@@ -0,0 +1,56 @@
+"""Common functionality used by the unit tests."""
+
+import contextlib
+import importlib
+import importlib.util
+import os
+import sqlite3
+import sys
+from unittest import mock
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Name the plugin directory is imported under, so that the relative imports
+# between its modules resolve as they do when QGIS loads the plugin
+PLUGIN_PACKAGE = "afpolgis_plugin"
+
+
+def has_module(name):
+    """Returns whether an optional dependency can be imported."""
+    return importlib.util.find_spec(name) is not None
+
+
+def plugin_module(name):
+    """Imports a module of the plugin, e.g. plugin_module("json_stream")."""
+    if PLUGIN_PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PLUGIN_PACKAGE,
+            os.path.join(PLUGIN_DIR, "__init__.py"),
+            submodule_search_locations=[PLUGIN_DIR],
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PLUGIN_PACKAGE] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+
+@contextlib.contextmanager
+def tracked_connections():
+    """Collects the SQLite connections opened inside the block."""
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    with mock.patch.object(sqlite3, "connect", tracking_connect):
+        yield opened
+
+
+def is_closed(conn):
+    try:
+        conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
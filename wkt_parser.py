@@ -0,0 +1,257 @@
+import functools
+import re
+
+# Parses the WKT ODK Central returns for geo fields ($wkt=true) into GeoJSON
+# geometry dicts. The text is split into tokens by a single regex pass and a
+# small recursive descent parser validates and builds the coordinates at the
+# same time, so there is no separate validation regex and no re-splitting of
+# rings. All the simple and Multi* types are supported, with 2D, Z, M and ZM
+# coordinates; like geometry_builder, only X/Y are kept.
+
+GEOMETRY_TYPES = {
+    "POINT": "Point",
+    "LINESTRING": "LineString",
+    "POLYGON": "Polygon",
+    "MULTIPOINT": "MultiPoint",
+    "MULTILINESTRING": "MultiLineString",
+    "MULTIPOLYGON": "MultiPolygon",
+}
+# Number of ordinates per coordinate for each dimension tag
+DIMENSION_TAGS = {"Z": 3, "M": 3, "ZM": 4}
+
+# Separates the values of a batch, it never appears in valid WKT
+SEPARATOR = ";"
+PUNCTUATION = frozenset(("(", ")", ",", SEPARATOR))
+
+# Tokens are parentheses, separators or the trimmed text in between: a
+# geometry header ("POINT Z", "POLYGON EMPTY"), a whole coordinate list
+# ("1 2 3, 4 5 6") or the "," between two rings / parts
+TOKEN_RE = re.compile(r"[();]|[^();\s](?:[^();]*[^();\s])?")
+
+
+class WktError(ValueError):
+    """Raised for malformed or unsupported WKT."""
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text)
+
+
+@functools.lru_cache(maxsize=64)
+def geometry_header(token):
+    """Parses "POINT", "POINT Z", "POINTZM", "POLYGON EMPTY", ... once.
+
+    Returns (parser method, GeoJSON type, ordinates per coordinate or None,
+    whether the geometry is EMPTY).
+    """
+    words = token.upper().split()
+    word = words[0]
+    tag = None
+    if word not in GEOMETRY_TYPES:
+        # tag written without a space, e.g. POINTZ
+        for suffix in ("ZM", "Z", "M"):
+            if word.endswith(suffix) and word[: -len(suffix)] in GEOMETRY_TYPES:
+                word, tag = word[: -len(suffix)], suffix
+                break
+        else:
+            raise WktError(f"Unsupported geometry type: {word}")
+
+    words = words[1:]
+    if tag is None and words and words[0] in DIMENSION_TAGS:
+        tag = words.pop(0)
+    if words and words != ["EMPTY"]:
+        raise WktError(f"Unexpected '{' '.join(words)}' in geometry type")
+
+    return word.lower(), GEOMETRY_TYPES[word], DIMENSION_TAGS.get(tag), bool(words)
+
+
+class WktParser:
+    """Recursive descent parser over the tokens of one or more WKT strings."""
+
+    def __init__(self, tokens):
+        # the trailing separator saves bounds checks on every lookup
+        self.tokens = tokens + [SEPARATOR]
+        self.position = 0
+        self.dimensions = None
+
+    def peek(self):
+        return self.tokens[self.position]
+
+    def next_token(self):
+        token = self.tokens[self.position]
+        if token == SEPARATOR:
+            raise WktError("Unexpected end of WKT")
+        self.position += 1
+        return token
+
+    def expect(self, expected):
+        token = self.next_token()
+        if token != expected:
+            raise WktError(f"Expected '{expected}' but found '{token}'")
+
+    def next_separator(self):
+        """Consumes a ',' (more items follow) or a ')' (end of the list)."""
+        token = self.next_token()
+        if token == ",":
+            return True
+        if token == ")":
+            return False
+        raise WktError(f"Expected ',' or ')' but found '{token}'")
+
+    def geometry(self):
+        name, geometry_type, self.dimensions, empty = geometry_header(
+            self.next_token()
+        )
+        if empty:
+            return None
+        return {"type": geometry_type, "coordinates": getattr(self, name)()}
+
+    def check_dimensions(self, dimensions, token):
+        if self.dimensions is None:
+            if not 2 <= dimensions <= 4:
+                raise WktError(f"Invalid coordinates: {token}")
+            self.dimensions = dimensions
+        elif dimensions != self.dimensions:
+            raise WktError(
+                f"Expected {self.dimensions} values per coordinate, found {dimensions}"
+            )
+
+    def coordinates(self, token):
+        """Parses a "x y, x y, ..." token into a list of [x, y]."""
+        if token in PUNCTUATION:
+            raise WktError(f"Expected coordinates but found '{token}'")
+
+        if "," not in token:
+            parts = token.split()
+            self.check_dimensions(len(parts), token)
+            try:
+                values = list(map(float, parts))
+            except ValueError:
+                raise WktError(f"Invalid coordinates: {token}")
+            return [values[:2]]
+
+        # "1 2 3, 4 5 6" -> ["1", "2", "3", ",", "4", "5", "6"]; with uniform
+        # dimensions every (dimensions + 1)-th part is a comma
+        parts = token.replace(",", " , ").split()
+        count = token.count(",") + 1
+        dimensions, remainder = divmod(len(parts) - count + 1, count)
+        if remainder:
+            raise WktError(f"Invalid coordinates: {token}")
+        self.check_dimensions(dimensions, token)
+        if parts[dimensions :: dimensions + 1].count(",") != count - 1:
+            raise WktError(f"Mixed coordinate dimensions: {token}")
+        del parts[dimensions :: dimensions + 1]
+
+        try:
+            values = list(map(float, parts))
+        except ValueError:
+            raise WktError(f"Invalid coordinates: {token}")
+        return list(map(list, zip(values[::dimensions], values[1::dimensions])))
+
+    def coordinate_list(self):
+        # "(", "x y, x y, ...", ")" - the hot path, looked up in place
+        tokens = self.tokens
+        position = self.position
+        if tokens[position] != "(" or tokens[position + 1] == SEPARATOR:
+            raise WktError(f"Expected '(' but found '{tokens[position]}'")
+        if tokens[position + 2] != ")":
+            raise WktError(f"Expected ')' but found '{tokens[position + 2]}'")
+        self.position = position + 3
+        return self.coordinates(tokens[position + 1])
+
+    def ring_list(self):
+        self.expect("(")
+        rings = [self.coordinate_list()]
+        while self.next_separator():
+            rings.append(self.coordinate_list())
+        return rings
+
+    def point(self):
+        coordinates = self.coordinate_list()
+        if len(coordinates) != 1:
+            raise WktError("A point has a single coordinate")
+        return coordinates[0]
+
+    def linestring(self):
+        return self.coordinate_list()
+
+    def polygon(self):
+        return self.ring_list()
+
+    def multipoint(self):
+        # both MULTIPOINT (1 2, 3 4) and MULTIPOINT ((1 2), (3 4)) are valid
+        if self.tokens[self.position + 1 : self.position + 2] != ["("]:
+            return self.coordinate_list()
+        self.expect("(")
+        points = [self.point()]
+        while self.next_separator():
+            points.append(self.point())
+        return points
+
+    def multilinestring(self):
+        return self.ring_list()
+
+    def multipolygon(self):
+        self.expect("(")
+        polygons = [self.ring_list()]
+        while self.next_separator():
+            polygons.append(self.ring_list())
+        return polygons
+
+    def at_value_end(self):
+        return self.tokens[self.position] == SEPARATOR
+
+
+def parse_wkt(text):
+    """Parses a WKT string into a GeoJSON geometry dict.
+
+    EMPTY geometries yield None; malformed or unsupported WKT raises
+    WktError.
+    """
+    if not isinstance(text, str):
+        raise WktError(f"WKT must be a string, not {type(text).__name__}")
+
+    parser = WktParser(tokenize(text))
+    geometry = parser.geometry()
+    if not parser.at_value_end():
+        raise WktError(f"Unexpected '{parser.peek()}' after the geometry")
+    return geometry
+
+
+def is_valid_wkt(text):
+    try:
+        parse_wkt(text)
+    except WktError:
+        return False
+    return True
+
+
+def parse_wkt_batch(values):
+    """Parses a page of WKT strings, tokenizing them all in one regex pass.
+
+    Returns one GeoJSON geometry dict per value, None for empty, missing or
+    malformed values.
+    """
+    texts = [
+        value if isinstance(value, str) and SEPARATOR not in value else ""
+        for value in values
+    ]
+    parser = WktParser(tokenize(f" {SEPARATOR} ".join(texts)))
+
+    geometries = []
+    tokens = parser.tokens
+    for _ in texts:
+        geometry = None
+        if tokens[parser.position] != SEPARATOR:
+            try:
+                geometry = parser.geometry()
+                if tokens[parser.position] != SEPARATOR:
+                    raise WktError("Unexpected trailing tokens")
+            except WktError:
+                geometry = None
+                while tokens[parser.position] != SEPARATOR:
+                    parser.position += 1
+        geometries.append(geometry)
+        # step over the separator of the next value
+        parser.position += 1
+    return geometries